@@ -0,0 +1,221 @@
+# path: uin_ngin/api/jobs.py
+import asyncio
+import shutil
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from core.utils import extraction_cache
+from metrics.registry import REGISTRY
+
+TERMINAL = ("done", "failed")
+
+JOBS = REGISTRY.counter("uin_extract_jobs_total", "Extraction jobs by final status", ("status",))
+REJECTED = REGISTRY.counter("uin_extract_jobs_rejected_total", "Extraction jobs rejected because the queue was full")
+QUEUE_DEPTH = REGISTRY.gauge("uin_extract_queue_depth", "Extraction jobs waiting for a worker")
+JOB_SECONDS = REGISTRY.histogram("uin_extract_job_seconds", "Extraction run time per job")
+
+
+class QueueFull(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"Extraction queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class Job:
+    def __init__(self, job_id, image_path, output_dir, options):
+        self.id = job_id
+        self.image_path = image_path
+        self.output_dir = output_dir
+        self.options = options
+        self.status = "queued"
+        self.error = None
+        self.stats = None
+        self.artifacts = {}
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.changed = asyncio.Event()
+
+    def _set(self, status, **fields):
+        self.status = status
+        for key, value in fields.items():
+            setattr(self, key, value)
+        # Wake everyone waiting for a change, then arm a fresh event
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "stats": self.stats,
+            "artifacts": sorted(self.artifacts),
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+def _run_extraction(image_path, output_dir, options):
+    # Runs in a pool process; only paths and plain dicts cross the boundary
+    from core.utils.edge_extraction import create_uin_package
+    result = create_uin_package(image_path, output_dir, cache=extraction_cache.worker_cache, **options)
+    artifacts = {Path(v).name: v for k, v in result.items() if k not in ("stats", "cache")}
+    return result["stats"], artifacts
+
+
+def _write_upload(image_path, image_bytes):
+    image_path.parent.mkdir()
+    image_path.write_bytes(image_bytes)
+
+
+class JobQueue:
+    # Bounded async front for a process pool: at most max_queue jobs wait,
+    # `workers` consumer tasks each keep one job running in the pool. submit()
+    # never waits for a slot; when the queue is full it raises QueueFull with a
+    # retry hint derived from the recent average job duration. Implements the
+    # Service interface (name, async start/stop, health) for the ServiceRuntime.
+    name = "extract_jobs"
+
+    def __init__(self, work_dir=None, workers=2, max_queue=16, job_ttl=3600, cache_dir=None, cache_size_mb=1024):
+        self.work_dir = Path(work_dir or tempfile.mkdtemp(prefix="uin-jobs-"))
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.workers = workers
+        self.max_queue = max_queue
+        self.job_ttl = job_ttl
+        self.cache_dir = cache_dir
+        self.cache_size_mb = cache_size_mb
+        self.jobs = {}
+        self.queue = None
+        self.pool = None
+        self._tasks = []
+        self._avg_seconds = 1.0
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            work_dir=config.get("extract_work_dir"),
+            workers=int(config.get("extract_workers", 2)),
+            max_queue=int(config.get("extract_queue_size", 16)),
+            job_ttl=float(config.get("extract_job_ttl", 3600)),
+            cache_dir=config.get("extract_cache_dir"),
+            cache_size_mb=float(config.get("extract_cache_size_mb", 1024)),
+        )
+
+    async def start(self):
+        self.queue = asyncio.Queue(maxsize=self.max_queue)
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=extraction_cache.init_worker_cache,
+            initargs=(self.cache_dir, self.cache_size_mb),
+        )
+        self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    async def health(self):
+        # Runs on the event loop, which owns self.jobs and the queue. A full
+        # queue is reported as saturated but stays "ok": the instance is busy,
+        # not broken, and must not be pulled by load balancers.
+        if self.pool is None:
+            return {"status": "error", "service": self.name, "error": "not started"}
+        waiting = self.queue.qsize()
+        return {
+            "status": "ok",
+            "service": self.name,
+            "queued": waiting,
+            "running": sum(1 for job in self.jobs.values() if job.status == "running"),
+            "saturated": waiting >= self.max_queue,
+        }
+
+    def retry_after(self):
+        waiting = self.queue.qsize() if self.queue is not None else 0
+        return max(1, round(self._avg_seconds * (waiting + 1) / self.workers))
+
+    def check_capacity(self):
+        # Cheap enough to run before the upload is read, so a rejected
+        # request never costs a buffered body
+        if self.queue is None or self.queue.full():
+            REJECTED.inc()
+            raise QueueFull(self.retry_after())
+
+    async def submit(self, image_bytes, filename="image.png", options=None):
+        name = Path(filename).name
+        if name in ("", ".", ".."):
+            raise ValueError(f"Invalid filename: {filename!r}")
+        self._reap()
+        self.check_capacity()
+        job_id = uuid.uuid4().hex
+        job_dir = self.work_dir / job_id
+        image_path = job_dir / name
+        await asyncio.to_thread(_write_upload, image_path, image_bytes)
+        # Other requests may have filled the queue while the file was written
+        try:
+            self.check_capacity()
+        except QueueFull:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+        job = Job(job_id, image_path, job_dir / "package", options or {})
+        self.jobs[job_id] = job
+        self.queue.put_nowait(job)
+        QUEUE_DEPTH.set(self.queue.qsize())
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def artifact_path(self, job, name):
+        # Only names produced by the extraction are served
+        path = job.artifacts.get(name)
+        return Path(path) if path else None
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            QUEUE_DEPTH.set(self.queue.qsize())
+            job._set("running", started=time.time())
+            try:
+                stats, artifacts = await loop.run_in_executor(
+                    self.pool, _run_extraction, str(job.image_path), str(job.output_dir), job.options
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job._set("failed", error=f"{type(e).__name__}: {e}", finished=time.time())
+                JOBS.inc(status="failed")
+            else:
+                job._set("done", stats=stats, artifacts=artifacts, finished=time.time())
+                JOBS.inc(status="done")
+                duration = job.finished - job.started
+                JOB_SECONDS.observe(duration)
+                self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * duration
+            finally:
+                self.queue.task_done()
+
+    def _reap(self):
+        cutoff = time.time() - self.job_ttl
+        for job_id, job in list(self.jobs.items()):
+            if job.status in TERMINAL and job.finished < cutoff:
+                del self.jobs[job_id]
+                shutil.rmtree(self.work_dir / job_id, ignore_errors=True)
+
+    async def events(self, job):
+        # Yields the job state on every change until it is finished
+        while True:
+            changed = job.changed
+            yield job.to_dict()
+            if job.status in TERMINAL:
+                return
+            await changed.wait()
@@ -1,9 +1,224 @@
 # api/mcp_server.py
-from mcp.server import Server
-from core.utils.edge_extraction import create_uin_package  # statt subprocess
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from core.utils import extraction_cache
+from core.utils.edge_extraction import EDGE_FORMATS, UIN_PACKAGE_VERSION, create_uin_package  # statt subprocess
+
+# Abstand der Fortschrittsmeldungen während einer laufenden Extraktion
+PROGRESS_INTERVAL = 1.0
+
+def _extract(image_path, output_dir, options):
+    return create_uin_package(image_path, output_dir, cache=extraction_cache.worker_cache, **options)
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+class ExtractionExecutor:
+    """
+    Führt Extraktionen außerhalb der Event-Loop aus.
+
+    - Prozess-Pool mit max_workers Prozessen, höchstens max_concurrent
+      Aufträge gleichzeitig (weitere warten auf das Semaphor, nicht im Pool)
+    - Ergebnis-Cache (LRU) über Bildinhalt, Parameter und Zielverzeichnis;
+      gleichzeitige identische Aufrufe teilen sich einen Lauf
+    - optionaler Plattencache (ExtractionCache) in den Worker-Prozessen
+    """
+
+    def __init__(self, max_workers=None, max_concurrent=None, result_cache_size=256, cache_dir=None, cache_size_mb=1024):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_concurrent = max_concurrent or self.max_workers
+        self.result_cache_size = result_cache_size
+        self.cache_dir = cache_dir
+        self.cache_size_mb = cache_size_mb
+        self._results = OrderedDict()
+        self._in_flight = {}
+        self._semaphore = None
+        self._pool = None
+        self.stats = {"runs": 0, "cache_hits": 0, "joined": 0}
+
+    def _ensure_started(self):
+        if self._pool is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=extraction_cache.init_worker_cache,
+                initargs=(self.cache_dir, self.cache_size_mb),
+            )
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _key(self, image_path, output_dir, options):
+        digest = await asyncio.to_thread(_file_digest, image_path)
+        params = json.dumps(options, sort_keys=True)
+        return f"{digest}|{params}|{Path(output_dir).resolve()}|{UIN_PACKAGE_VERSION}"
+
+    @staticmethod
+    def _artifact_state(result):
+        # Änderungszeiten der Artefakte; None, sobald eines fehlt
+        try:
+            return {k: os.stat(v).st_mtime_ns for k, v in result.items() if k not in ("stats", "cache")}
+        except OSError:
+            return None
+
+    def _cached(self, key):
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        result, state = entry
+        # Nur gültig, solange die Artefakte unverändert existieren (ein anderer
+        # Aufruf mit gleichem Zielverzeichnis überschreibt sie)
+        if self._artifact_state(result) != state:
+            del self._results[key]
+            return None
+        self._results.move_to_end(key)
+        return result
+
+    async def extract(self, image_path, output_dir, progress=None, **options):
+        """
+        Extrahiert ein UIN-Paket (Argumente wie create_uin_package).
+
+        Args:
+            progress: optionale async Funktion progress(fortschritt, gesamt, meldung),
+                wird bei Warteschlange, Start, periodisch während des Laufs und
+                am Ende aufgerufen
+
+        Returns:
+            Ergebnis von create_uin_package, ergänzt um "source" ("cache"/"run")
+        """
+        self._ensure_started()
+        key = await self._key(image_path, output_dir, options)
+        cached = self._cached(key)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            if progress:
+                await progress(1, 1, "cache")
+            return dict(cached, source="cache")
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats["joined"] += 1
+            result = await self._wait(asyncio.shield(future), progress)
+            return dict(result, source="cache")
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            if progress:
+                await progress(0, 1, "queued")
+            async with self._semaphore:
+                if progress:
+                    await progress(0, 1, "running")
+                run = asyncio.get_running_loop().run_in_executor(
+                    self._pool, _extract, str(image_path), str(output_dir), options
+                )
+                self.stats["runs"] += 1
+                result = await self._wait(run, progress)
+            self._results[key] = (result, self._artifact_state(result))
+            while len(self._results) > self.result_cache_size:
+                self._results.popitem(last=False)
+            future.set_result(result)
+            return dict(result, source="run")
+        except BaseException as e:
+            future.set_exception(e)
+            # Fehler nicht als "never retrieved" melden, wenn niemand wartet
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def _wait(self, awaitable, progress):
+        # Wartet und meldet alle PROGRESS_INTERVAL Sekunden die verstrichene Zeit
+        task = asyncio.ensure_future(awaitable)
+        start = time.monotonic()
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=PROGRESS_INTERVAL if progress else None)
+            if done:
+                result = task.result()
+                if progress:
+                    await progress(1, 1, "done")
+                return result
+            await progress(0, 1, f"running {time.monotonic() - start:.0f}s")
 
 class UINMCPServer:
-    def __init__(self):
+    TOOLS = {
+        "extract_edges": {
+            "description": "Canny-Kantenextraktion und UIN-Paket für ein Bild",
+            "inputSchema": {
+                "type": "object",
+                "required": ["image_path"],
+                "properties": {
+                    "image_path": {"type": "string"},
+                    "output_dir": {"type": "string", "default": "./uin_output"},
+                    "low": {"type": "integer", "default": 100},
+                    "high": {"type": "integer", "default": 200},
+                    "auto": {"type": "boolean", "default": False},
+                    "edge_format": {"type": "string", "enum": EDGE_FORMATS, "default": "png"},
+                },
+            },
+        },
+    }
+
+    def __init__(self, max_workers=None, max_concurrent=None, cache_dir=None, result_cache_size=256):
+        # mcp wird erst hier importiert, damit der Executor ohne das Paket nutzbar bleibt
+        from mcp.server import Server
+        from mcp import types
+
+        self.types = types
+        self.executor = ExtractionExecutor(max_workers, max_concurrent, result_cache_size, cache_dir)
         self.server = Server("uin-tools")
-        # Tools registrieren...
-        # call_tool: direkt Funktionen aufrufen (nicht subprocess → sauberer!)
+        self.server.list_tools()(self.list_tools)
+        self.server.call_tool()(self.call_tool)
+
+    async def list_tools(self):
+        return [self.types.Tool(name=name, **spec) for name, spec in self.TOOLS.items()]
+
+    async def call_tool(self, name, arguments):
+        if name != "extract_edges":
+            raise ValueError(f"Unbekanntes Tool: {name}")
+        ctx = self.server.request_context
+        token = getattr(ctx.meta, "progressToken", None) if ctx.meta else None
+
+        async def progress(done, total, message):
+            if token is not None:
+                await ctx.session.send_progress_notification(token, done, total)
+
+        auto = arguments.get("auto", False)
+        result = await self.executor.extract(
+            arguments["image_path"],
+            arguments.get("output_dir", "./uin_output"),
+            progress=progress,
+            low_thresh=None if auto else arguments.get("low", 100),
+            high_thresh=None if auto else arguments.get("high", 200),
+            edge_format=arguments.get("edge_format", "png"),
+        )
+        return [self.types.TextContent(type="text", text=json.dumps(result, ensure_ascii=False))]
+
+    async def run_stdio(self):
+        from mcp.server.stdio import stdio_server
+
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self.server.run(read_stream, write_stream, self.server.create_initialization_options())
+        finally:
+            self.executor.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(UINMCPServer(
+        max_workers=int(os.environ.get("UIN_MCP_WORKERS", 0)) or None,
+        max_concurrent=int(os.environ.get("UIN_MCP_CONCURRENCY", 0)) or None,
+        cache_dir=os.environ.get("UIN_MCP_CACHE_DIR"),
+    ).run_stdio())
@@ -1,14 +1,130 @@
 # path: uin_ngin/api/server.py
-from fastapi import FastAPI
-from uin_ngin.metrics.registry import MetricsRegistry
+import json
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from core.utils.edge_extraction import EDGE_FORMATS
+from uin_ngin.api.jobs import JobQueue, QueueFull
+from uin_ngin.config.manager import ConfigManager
+from uin_ngin.core.lifecycle import LifecycleManager
+from metrics.registry import REGISTRY
+from metrics.prometheus import export_prometheus, CONTENT_TYPE
 
-app = FastAPI()
-metrics = MetricsRegistry()
+# Limits come from the ConfigManager (YAML file in UIN_CONFIG or env vars):
+# extract_workers, extract_queue_size, extract_max_upload_mb,
+# extract_job_ttl, extract_work_dir, extract_cache_dir, extract_cache_size_mb
+config = ConfigManager(os.environ.get("UIN_CONFIG"))
+jobs = JobQueue.from_config(config)
+max_upload_bytes = int(float(config.get("extract_max_upload_mb", 64)) * 1024 * 1024)
+
+# Further services register here before the app starts; /health answers
+# from the runtime's cached background checks (health_interval/_timeout)
+lifecycle = LifecycleManager()
+lifecycle.register(jobs)
+runtime = lifecycle.runtime(
+    health_interval=float(config.get("health_interval", 10)),
+    health_timeout=float(config.get("health_timeout", 2)),
+)
+
+@asynccontextmanager
+async def lifespan(app):
+    await runtime.start()
+    yield
+    await runtime.stop()
+
+app = FastAPI(lifespan=lifespan)
+metrics = REGISTRY
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    result = runtime.health()
+    return JSONResponse(result, status_code=200 if result["status"] == "ok" else 503)
 
 @app.get("/metrics")
 def get_metrics():
+    return Response(export_prometheus(metrics), media_type=CONTENT_TYPE)
+
+@app.get("/metrics/json")
+def get_metrics_json():
     return metrics.export()
+
+def _queue_full(e):
+    return JSONResponse({"detail": str(e)}, status_code=429, headers={"Retry-After": str(e.retry_after)})
+
+@app.post("/jobs/extract", status_code=202)
+async def submit_extraction(
+    request: Request,
+    filename: str = "image.png",
+    low: int | None = 100,
+    high: int | None = 200,
+    auto: bool = False,
+    edge_format: str = "png",
+    vectorize: float | None = None,
+):
+    # The image is the raw request body; options are query parameters
+    if edge_format not in EDGE_FORMATS:
+        raise HTTPException(422, f"edge_format must be one of {EDGE_FORMATS}")
+    # Reject before reading the body: under overload a refused upload must
+    # not be buffered first
+    try:
+        jobs.check_capacity()
+    except QueueFull as e:
+        return _queue_full(e)
+    length = request.headers.get("content-length")
+    if length is not None:
+        if not length.strip().isdigit():
+            raise HTTPException(400, "Invalid Content-Length")
+        if int(length) > max_upload_bytes:
+            raise HTTPException(413, "Image too large")
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_upload_bytes:
+            raise HTTPException(413, "Image too large")
+    if not body:
+        raise HTTPException(422, "Request body must contain the image")
+    options = {
+        "low_thresh": None if auto else low,
+        "high_thresh": None if auto else high,
+        "edge_format": edge_format,
+        "vectorize_tolerance": vectorize,
+    }
+    try:
+        job = await jobs.submit(bytes(body), filename, options)
+    except ValueError as e:
+        raise HTTPException(422, str(e))
+    except QueueFull as e:
+        return _queue_full(e)
+    return JSONResponse(job.to_dict(), status_code=202, headers={"Location": f"/jobs/{job.id}"})
+
+def _job_or_404(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(404, "Unknown job")
+    return job
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    return _job_or_404(job_id).to_dict()
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    # Server-sent events: one "status" event per change, closed when finished
+    job = _job_or_404(job_id)
+
+    async def stream():
+        async for state in jobs.events(job):
+            yield f"event: status\ndata: {json.dumps(state)}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.get("/jobs/{job_id}/artifacts/{name}")
+def job_artifact(job_id: str, name: str):
+    job = _job_or_404(job_id)
+    if job.status != "done":
+        raise HTTPException(409, f"Job is {job.status}")
+    path = jobs.artifact_path(job, name)
+    if path is None or not path.is_file():
+        raise HTTPException(404, "Unknown artifact")
+    return FileResponse(path, filename=name)
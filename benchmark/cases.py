@@ -0,0 +1,166 @@
+# path: uin_ngin/benchmark/cases.py
+"""
+Standard-Benchmarks für Release-Gates.
+
+Fälle (skaliert):
+    extract_canny_<N>px      extract_canny_edges auf synthetischen N×N-Bildern
+    serialize_<N>            uin.core.serialize.serialize mit N Shapes
+    normalize_<N>            uin.core.normalize.normalize mit N Shapes
+    schema_validate_batch    SchemaValidator über einen Stapel Dokumente
+
+    python -m benchmark.cases --save baseline.json
+    python -m benchmark.cases --baseline baseline.json --tolerance 0.15
+"""
+import argparse
+import functools
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmark.suite import BenchmarkSuite, compare, load_baseline, save_baseline
+
+IMAGE_SIZES = (512, 2048, 4096)
+SHAPE_COUNTS = (1_000, 100_000, 1_000_000)
+SCHEMA_BATCH = 200
+
+# Große Fälle dauern Sekunden pro Lauf: weniger Wiederholungen, kein Aufwärmen
+# und ab 1M kein zusätzlicher tracemalloc-Lauf
+def _options(n):
+    if n >= 1_000_000:
+        return {"warmup": 0, "repeat": 1, "track_memory": False}
+    if n >= 100_000:
+        return {"warmup": 0, "repeat": 3}
+    return {}
+
+UIN_SCHEMA = {
+    "type": "object",
+    "required": ["meta", "shapes"],
+    "properties": {
+        "meta": {"type": "object"},
+        "shapes": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["id", "type", "x", "y", "color"],
+                "properties": {
+                    "id": {"type": "string"},
+                    "type": {"enum": ["rect", "circle", "polygon"]},
+                    "x": {"type": "number"},
+                    "y": {"type": "number"},
+                    "color": {
+                        "type": "object",
+                        "required": ["r", "g", "b"],
+                        "properties": {c: {"type": "integer", "minimum": 0, "maximum": 255} for c in "rgb"},
+                    },
+                },
+            },
+        },
+    },
+}
+
+def make_image(path, size, seed=0):
+    import cv2
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 256, (size // 8, size // 8), dtype=np.uint8)
+    image = cv2.resize(noise, (size, size), interpolation=cv2.INTER_CUBIC)
+    cv2.imwrite(str(path), image)
+    return path
+
+def make_document(n):
+    from uin.core.schema import UINDocument, UINMeta, Shape, Color
+    shapes = [
+        Shape.model_construct(
+            id=f"s{i}", type="rect", x=float(i % 1000), y=float(i // 1000), width=1.0, height=1.0,
+            radius=None, points=None, color=Color.model_construct(r=i % 256, g=0, b=0, a=1.0),
+        )
+        for i in range(n)
+    ]
+    return UINDocument.model_construct(meta=UINMeta(), shapes=shapes)
+
+def _document_dict(i, n_shapes=50):
+    return {
+        "meta": {},
+        "shapes": [{"id": f"s{j}", "type": "rect", "x": j, "y": i, "width": 1, "height": 1,
+                    "color": {"r": j % 256, "g": 0, "b": 0, "a": 1.0}} for j in range(n_shapes)],
+    }
+
+def standard_suite(workdir, max_shapes=max(SHAPE_COUNTS), max_image=max(IMAGE_SIZES), track_memory=True):
+    """Baut die Standard-Suite; Eingabedateien landen in workdir."""
+    from core.utils.edge_extraction import extract_canny_edges
+    from core.validation.schema_validator import iter_documents, validate_many, summarize
+    from uin.core.normalize import normalize
+    from uin.core.serialize import serialize
+
+    workdir = Path(workdir)
+    suite = BenchmarkSuite(warmup=1, repeat=5, track_memory=track_memory)
+
+    for size in IMAGE_SIZES:
+        if size <= max_image:
+            suite.add(
+                f"extract_canny_{size}px",
+                lambda path: extract_canny_edges(path),
+                setup=lambda size=size: make_image(workdir / f"bench_{size}.png", size),
+                items=size * size,
+                **_options(size * size // 16),
+            )
+
+    for n in SHAPE_COUNTS:
+        if n > max_shapes:
+            continue
+        setup = functools.lru_cache(maxsize=1)(lambda n=n: make_document(n))
+        suite.add(f"serialize_{n}", serialize, setup=setup, items=n, **_options(n))
+        suite.add(f"normalize_{n}", normalize, setup=setup, items=n, **_options(n))
+
+    def schema_setup():
+        docs = workdir / "schema_batch"
+        docs.mkdir(exist_ok=True)
+        for i in range(SCHEMA_BATCH):
+            (docs / f"doc{i}_attributes.uin.json").write_text(json.dumps(_document_dict(i)))
+        schema = workdir / "uin.schema.json"
+        schema.write_text(json.dumps(UIN_SCHEMA))
+        return schema, list(iter_documents(docs, "*_attributes.uin.json"))
+
+    suite.add(
+        "schema_validate_batch",
+        lambda args: summarize(validate_many(args[0], args[1])),
+        setup=schema_setup,
+        items=SCHEMA_BATCH,
+    )
+    return suite
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmark.cases", description="UIN Standard-Benchmarks")
+    parser.add_argument("--only", nargs="*", default=None, help="Nur diese Fälle ausführen")
+    parser.add_argument("--max-shapes", type=int, default=max(SHAPE_COUNTS), help="Größte Shape-Anzahl (default: 1000000)")
+    parser.add_argument("--max-image", type=int, default=max(IMAGE_SIZES), help="Größte Bildkante in Pixeln (default: 4096)")
+    parser.add_argument("--no-memory", action="store_true", help="Peak-Speicher nicht messen")
+    parser.add_argument("--save", type=Path, default=None, help="Ergebnisse als Baseline speichern")
+    parser.add_argument("--baseline", type=Path, default=None, help="Gegen diese Baseline vergleichen")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Erlaubte relative Verschlechterung (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    def progress(name, r):
+        rate = f"  {r['items_per_s']:>14,.0f}/s" if "items_per_s" in r else ""
+        mem = f"  {r['peak_memory_bytes'] / 2**20:8.1f} MiB" if "peak_memory_bytes" in r else ""
+        print(f"{name:<24} median {r['median'] * 1000:10.2f} ms  p95 {r['p95'] * 1000:10.2f} ms"
+              f"  ±{r['stddev'] * 1000:8.2f} ms{rate}{mem}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        suite = standard_suite(tmp, args.max_shapes, args.max_image, not args.no_memory)
+        results = suite.run_all(args.only, progress=progress)
+
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"Baseline gespeichert: {args.save}")
+    if args.baseline:
+        regressions = compare(results, load_baseline(args.baseline), args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['name']} {r['metric']}: {r['baseline']:.6g} -> {r['current']:.6g} (x{r['ratio']:.2f})")
+        if regressions:
+            sys.exit(1)
+        print(f"Keine Regressionen (Toleranz {args.tolerance:.0%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# path: uin_ngin/benchmark/startup.py
+"""
+Startzeit-Benchmark für die CLI-Einstiegspunkte.
+
+Startet jedes Subkommando in einem frischen Interpreter mit
+``python -X importtime``, summiert die Importzeiten und prüft sie gegen ein
+Budget. Zusätzlich darf ein Subkommando bestimmte schwere Module gar nicht
+laden (z.B. OpenCV für ``uin validate``).
+
+    python -m benchmark.startup          # Tabelle, Exit-Code 1 bei Überschreitung
+"""
+import json
+import struct
+import subprocess
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+_DOC = {
+    "meta": {},
+    "shapes": [{"id": "x", "type": "rect", "x": 0, "y": 0, "width": 1, "height": 1,
+                "color": {"r": 0, "g": 0, "b": 0, "a": 1.0}}],
+}
+
+def _tiny_png():
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    raw = b"".join(b"\x00" + bytes(8) for _ in range(8))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", 8, 8, 8, 0, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b""))
+
+# name -> argv (relativ zu {tmp}), stdin, Budget in ms, verbotene Module
+STARTUP_CASES = {
+    "uin --help": (["-m", "uin.cli", "--help"], None, 100, ["pydantic"]),
+    "uin normalize": (["-m", "uin.cli", "normalize"], json.dumps(_DOC), 400, ["numpy", "cv2"]),
+    "uin validate (schema)": (["-m", "cli.main", "validate", "{tmp}/doc.json", "{tmp}/schema.json"], None, 300, ["cv2", "numpy", "PIL", "pydantic"]),
+    "uin extract": (["-m", "cli.main", "extract", "{tmp}/img.png", "-o", "{tmp}/out"], None, 800, ["jsonschema", "PIL"]),
+}
+
+def parse_importtime(stderr):
+    """Liefert (Gesamtzeit in µs, Menge der importierten Module) aus -X importtime."""
+    total = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        total += int(self_us)
+        modules.add(name.strip())
+    return total, modules
+
+def measure_startup(argv, stdin=None, cwd=REPO_ROOT):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        input=stdin,
+        text=True,
+        capture_output=True,
+        cwd=cwd,
+    )
+    total_us, modules = parse_importtime(proc.stderr)
+    return {"returncode": proc.returncode, "import_ms": total_us / 1000, "modules": modules}
+
+def run_startup_benchmark(cases=None, budget_scale=1.0):
+    """
+    Misst alle Fälle und liefert pro Fall Importzeit, Budget und Verstöße.
+
+    Args:
+        cases: Dictionary wie STARTUP_CASES (default: STARTUP_CASES)
+        budget_scale: Faktor für alle Budgets (z.B. für langsame CI-Runner)
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "doc.json").write_text(json.dumps(_DOC))
+        (Path(tmp) / "schema.json").write_text(json.dumps({"type": "object"}))
+        (Path(tmp) / "img.png").write_bytes(_tiny_png())
+        for name, (argv, stdin, budget_ms, forbidden) in (cases or STARTUP_CASES).items():
+            m = measure_startup([a.format(tmp=tmp) for a in argv], stdin)
+            loaded = sorted(f for f in forbidden if f in m["modules"])
+            results[name] = {
+                "import_ms": m["import_ms"],
+                "budget_ms": budget_ms * budget_scale,
+                "returncode": m["returncode"],
+                "forbidden_loaded": loaded,
+                "ok": m["returncode"] == 0 and m["import_ms"] <= budget_ms * budget_scale and not loaded,
+            }
+    return results
+
+def main():
+    results = run_startup_benchmark()
+    for name, r in results.items():
+        status = "OK " if r["ok"] else "FAIL"
+        extra = f"  verboten geladen: {', '.join(r['forbidden_loaded'])}" if r["forbidden_loaded"] else ""
+        print(f"{status} {name:<24} {r['import_ms']:8.1f} ms / {r['budget_ms']:.0f} ms{extra}")
+    sys.exit(0 if all(r["ok"] for r in results.values()) else 1)
+
+if __name__ == "__main__":
+    main()
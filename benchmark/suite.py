@@ -1,10 +1,145 @@
 # path: uin_ngin/benchmark/suite.py
+"""
+Benchmark-Suite mit Aufwärmläufen, Wiederholungen, Statistik und Baselines.
+
+    suite = BenchmarkSuite(warmup=1, repeat=7)
+    suite.add("serialize_1k", serialize, setup=lambda: doc, items=1000)
+    results = suite.run_all()
+    regressions = compare(results, load_baseline("baseline.json"), tolerance=0.1)
+"""
+import json
+import math
+import platform
+import statistics
+import sys
 import time
+import tracemalloc
+from pathlib import Path
+
+BASELINE_VERSION = 1
+
+# Kleinere Peak-Speicherwerte schwanken zu stark für einen relativen Vergleich
+MIN_COMPARED_MEMORY = 1 << 20
 
 class BenchmarkResult(dict): pass
 
+def _percentile(sorted_values, q):
+    # Nearest-rank-Perzentil
+    index = max(0, math.ceil(q * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+def summarize(durations, items=None):
+    """Statistik über die Laufzeiten (Sekunden) einer Messreihe."""
+    values = sorted(durations)
+    median = statistics.median(values)
+    result = BenchmarkResult(
+        runs=len(values),
+        min=values[0],
+        median=median,
+        mean=statistics.fmean(values),
+        p95=_percentile(values, 0.95),
+        stddev=statistics.stdev(values) if len(values) > 1 else 0.0,
+        # Kompatibel zur ursprünglichen Einzelmessung
+        duration=median,
+    )
+    if items is not None:
+        result["items"] = items
+        result["items_per_s"] = items / median if median > 0 else math.inf
+    return result
+
 class BenchmarkSuite:
-    def run(self, fn):
-        start = time.perf_counter()
-        fn()
-        return BenchmarkResult(duration=time.perf_counter()-start)
+    def __init__(self, warmup=1, repeat=5, track_memory=False):
+        """
+        Args:
+            warmup: Ungemessene Läufe vor der Messung (Caches, Lazy-Imports)
+            repeat: Gemessene Läufe
+            track_memory: Peak-Speicher in einem zusätzlichen Lauf mit
+                tracemalloc messen (nicht in den Laufzeiten enthalten)
+        """
+        self.warmup = warmup
+        self.repeat = repeat
+        self.track_memory = track_memory
+        self.cases = {}
+
+    def run(self, fn, items=None, warmup=None, repeat=None, track_memory=None, args=()):
+        """Misst fn(*args) und liefert ein BenchmarkResult."""
+        for _ in range(self.warmup if warmup is None else warmup):
+            fn(*args)
+        durations = []
+        for _ in range(max(1, self.repeat if repeat is None else repeat)):
+            start = time.perf_counter()
+            fn(*args)
+            durations.append(time.perf_counter() - start)
+        result = summarize(durations, items)
+        if self.track_memory if track_memory is None else track_memory:
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            fn(*args)
+            result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1] - base
+            if started:
+                tracemalloc.stop()
+        return result
+
+    def add(self, name, fn, setup=None, items=None, **options):
+        """
+        Registriert einen Fall. setup() wird einmal vor der Messung
+        aufgerufen, sein Ergebnis wird fn als Argument übergeben.
+        options überschreiben warmup/repeat/track_memory für diesen Fall.
+        """
+        self.cases[name] = (fn, setup, items, options)
+
+    def run_all(self, names=None, progress=None):
+        results = {}
+        for name, (fn, setup, items, options) in self.cases.items():
+            if names is not None and name not in names:
+                continue
+            args = (setup(),) if setup is not None else ()
+            results[name] = self.run(fn, items=items, args=args, **options)
+            if progress:
+                progress(name, results[name])
+        return results
+
+def save_baseline(path, results):
+    payload = {
+        "version": BASELINE_VERSION,
+        "python": sys.version.split()[0],
+        "machine": platform.machine(),
+        "results": results,
+    }
+    Path(path).write_text(json.dumps(payload, indent=2, sort_keys=True))
+
+def load_baseline(path):
+    payload = json.loads(Path(path).read_text())
+    if payload.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Unbekannte Baseline-Version: {payload.get('version')}")
+    return payload["results"]
+
+def compare(results, baseline, tolerance=0.10, metric="median"):
+    """
+    Vergleicht Ergebnisse mit einer Baseline.
+
+    Ein Fall gilt als Regression, wenn metric (bzw. der Peak-Speicher, sofern
+    in beiden gemessen und mindestens 1 MiB) mehr als tolerance (relativ)
+    über der Baseline liegt.
+    Fälle ohne Baseline werden ignoriert.
+
+    Returns:
+        Liste von {"name", "metric", "baseline", "current", "ratio"}
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for key in (metric, "peak_memory_bytes"):
+            if key not in result or key not in base or base[key] <= 0:
+                continue
+            if key == "peak_memory_bytes" and base[key] < MIN_COMPARED_MEMORY:
+                continue
+            ratio = result[key] / base[key]
+            if ratio > 1 + tolerance:
+                regressions.append({"name": name, "metric": key, "baseline": base[key], "current": result[key], "ratio": ratio})
+    return regressions
@@ -1,7 +1,32 @@
 import argparse
+import glob
+import json
+import sys
 from pathlib import Path
-from core.utils.edge_extraction import create_uin_package, batch_process_directory
-from core.validation.schema_validator import SchemaValidator
+
+# OpenCV, NumPy, Pydantic und jsonschema werden erst im jeweiligen Subkommando
+# importiert, damit kurze Aufrufe (z.B. "uin validate") nicht deren Importzeit zahlen.
+
+# Entspricht core.utils.edge_extraction.EDGE_FORMATS (hier ohne OpenCV-Import)
+EDGE_FORMATS = ['png', 'packbits', 'rle', 'auto']
+
+def _sweep_items(value):
+    """Parst '--sweep' ('50:150,100:200,auto') zu [(low, high), ..., 'auto']."""
+    items = []
+    for item in (p.strip() for p in value.split(",")):
+        if not item:
+            continue
+        if item == "auto":
+            items.append(item)
+            continue
+        try:
+            low, high = (int(v) for v in item.split(":"))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"ungültiges Threshold-Paar {item!r}, erwartet LOW:HIGH oder 'auto'")
+        if not 0 <= low <= high:
+            raise argparse.ArgumentTypeError(f"ungültiges Threshold-Paar {item!r}, erwartet 0 <= LOW <= HIGH")
+        items.append((low, high))
+    return items
 
 def main():
     parser = argparse.ArgumentParser(prog="uin", description="UIN-NGIN CLI")
@@ -13,6 +38,14 @@ def main():
     extract.add_argument("-o", "--output", type=Path, default=Path("./uin_output"), help="Ausgabeverzeichnis (default: ./uin_output)")
     extract.add_argument("-l", "--low", type=int, default=100, help="Unterer Canny-Threshold (default: 100)")
     extract.add_argument("-H", "--high", type=int, default=200, help="Oberer Canny-Threshold (default: 200)")
+    extract.add_argument("--edge-format", choices=EDGE_FORMATS, default="png", help="Speicherformat des Kantenbilds (default: png)")
+    extract.add_argument("--vectorize", type=float, default=None, metavar="TOL", help="Kanten zusätzlich als UIN-Polygone ausgeben (Toleranz in Pixeln)")
+    extract.add_argument("--auto", action="store_true", help="Thresholds automatisch aus dem Median der Graustufen bestimmen")
+    extract.add_argument("--sweep", type=_sweep_items, default=None, help="Threshold-Paare auswerten, z.B. '50:150,100:200,auto' (Gradienten werden wiederverwendet)")
+    extract.add_argument("--cache-dir", type=Path, default=None, help="Verzeichnis des Extraktions-Caches (default: kein Cache)")
+    extract.add_argument("--cache-size-mb", type=float, default=1024, help="Größenlimit des Caches in MB (default: 1024)")
+    extract.add_argument("--tile-size", type=int, default=None, help="Gekachelte Extraktion für sehr große Bilder; schreibt <name>_edges.npy (default: aus)")
+    extract.add_argument("--overlap", type=int, default=16, help="Überlappung der Kacheln in Pixeln (default: 16)")
 
     # Batch (Verzeichnis)
     batch = subparsers.add_parser("batch", help="Batch-Verarbeitung eines Verzeichnisses")
@@ -20,28 +53,96 @@ def main():
     batch.add_argument("-o", "--output", type=Path, default=Path("./uin_output"), help="Basis-Ausgabeverzeichnis (default: ./uin_output)")
     batch.add_argument("-l", "--low", type=int, default=100, help="Unterer Canny-Threshold (default: 100)")
     batch.add_argument("-H", "--high", type=int, default=200, help="Oberer Canny-Threshold (default: 200)")
+    batch.add_argument("--edge-format", choices=EDGE_FORMATS, default="png", help="Speicherformat der Kantenbilder (default: png)")
+    batch.add_argument("--vectorize", type=float, default=None, metavar="TOL", help="Kanten zusätzlich als UIN-Polygone ausgeben (Toleranz in Pixeln)")
+    batch.add_argument("--auto", action="store_true", help="Thresholds pro Bild automatisch aus dem Median bestimmen")
+    batch.add_argument("-w", "--workers", type=int, default=None, help="Anzahl paralleler Worker-Prozesse (default: sequentiell)")
+    batch.add_argument("--max-in-flight", type=int, default=None, help="Maximal gleichzeitig eingereichte Bilder (default: 2 * workers)")
+    batch.add_argument("--cache-dir", type=Path, default=None, help="Verzeichnis des Extraktions-Caches (default: kein Cache)")
+    batch.add_argument("--cache-size-mb", type=float, default=1024, help="Größenlimit des Caches in MB (default: 1024)")
 
     # Validate
     validate = subparsers.add_parser("validate", help="Schema-Validierung")
-    validate.add_argument("doc", type=Path, help="UIN-Dokument (JSON)")
+    validate.add_argument("doc", type=str, help="UIN-Dokument (JSON), Verzeichnis oder Glob-Muster (z.B. 'out/**/*_attributes.uin.json')")
     validate.add_argument("schema", type=Path, help="Schema-Datei (JSON)")
+    validate.add_argument("--pattern", type=str, default="*.json", help="Dateimuster bei Verzeichnissen (default: *.json)")
+    validate.add_argument("-w", "--workers", type=int, default=None, help="Parallele Validierungsprozesse (default: 1)")
+    validate.add_argument("--first-error", action="store_true", help="Pro Dokument nach dem ersten Fehler abbrechen")
+    validate.add_argument("--jsonl", type=Path, default=None, help="Ergebnisse als JSONL schreiben ('-' für stdout)")
 
     args = parser.parse_args()
+    if args.command == "extract" and args.tile_size:
+        # Die gekachelte Extraktion schreibt nur das Kantenraster mit festen Thresholds
+        unsupported = [
+            flag for flag, used in (
+                ("--auto", args.auto),
+                ("--sweep", args.sweep),
+                ("--edge-format", args.edge_format != "png"),
+                ("--vectorize", args.vectorize is not None),
+                ("--cache-dir", args.cache_dir is not None),
+            ) if used
+        ]
+        if unsupported:
+            parser.error(f"--tile-size lässt sich nicht mit {', '.join(unsupported)} kombinieren")
+    if getattr(args, "auto", False):
+        args.low, args.high = None, None
+    cache = None
+    if getattr(args, "cache_dir", None) is not None:
+        from core.utils.extraction_cache import ExtractionCache
+        cache = ExtractionCache(args.cache_dir, args.cache_size_mb)
 
-    if args.command == "extract":
+    if args.command == "extract" and args.tile_size:
+        from core.utils.edge_extraction import extract_canny_edges_tiled
+        print(f"Gekachelte Verarbeitung: {args.image} (Kacheln: {args.tile_size}px)")
+        edge_raster = args.output / f"{args.image.stem}_edges.npy"
+        _, stats = extract_canny_edges_tiled(args.image, edge_raster, args.low, args.high, args.tile_size, args.overlap)
+        print(f"   Kantenraster: {edge_raster}")
+        print(f"   Kantendichte: {stats['edge_percentage']:.2f}%")
+    elif args.command == "extract" and args.sweep:
+        import cv2
+        from core.utils.edge_extraction import sweep_canny_thresholds
+        print(f"Threshold-Sweep: {args.image}")
+        pairs = [p for p in args.sweep if p != "auto"]
+        results = sweep_canny_thresholds(args.image, pairs, include_auto="auto" in args.sweep)
+        args.output.mkdir(parents=True, exist_ok=True)
+        for r in results:
+            low, high = r["thresholds"]["low"], r["thresholds"]["high"]
+            edge_path = args.output / f"{args.image.stem}_edges_{low}_{high}.png"
+            cv2.imwrite(str(edge_path), r["edges"])
+            print(f"   {low:>3}/{high:<3}  Kantendichte: {r['stats']['edge_percentage']:6.2f}%  Detail: {r['detail_level']}  -> {edge_path.name}")
+        sweep_path = args.output / f"{args.image.stem}_sweep.json"
+        with open(sweep_path, 'w', encoding='utf-8') as f:
+            json.dump([{k: v for k, v in r.items() if k != "edges"} for r in results], f, indent=2, ensure_ascii=False)
+        print(f"   Zusammenfassung: {sweep_path}")
+    elif args.command == "extract":
+        from core.utils.edge_extraction import create_uin_package
         print(f"Einzelbild-Verarbeitung: {args.image}")
-        result = create_uin_package(args.image, args.output, args.low, args.high)
+        result = create_uin_package(args.image, args.output, args.low, args.high, cache=cache, edge_format=args.edge_format, vectorize_tolerance=args.vectorize)
         print(f"\nUIN-Paket erstellt:")
         print(f"   Kantenbild: {result['edge_image']}")
         print(f"   UIN-JSON: {result['uin_json']}")
         print(f"   Vorschau: {result['preview']}")
+        if "shapes" in result:
+            print(f"   Polygone: {result['shapes']}")
         print(f"   Kantendichte: {result['stats']['edge_percentage']:.2f}%")
     elif args.command == "batch":
+        from core.utils.edge_extraction import batch_process_directory
         print(f"Batch-Verarbeitung: {args.input_dir} -> {args.output}")
-        batch_process_directory(args.input_dir, args.output, args.low, args.high)
+        batch_process_directory(args.input_dir, args.output, args.low, args.high, workers=args.workers, max_in_flight=args.max_in_flight, cache=cache, edge_format=args.edge_format, vectorize_tolerance=args.vectorize)
+    elif args.command == "validate" and (Path(args.doc).is_dir() or glob.has_magic(args.doc) or args.jsonl or args.workers):
+        from core.validation.schema_validator import iter_documents, validate_many, summarize
+        results = validate_many(args.schema, iter_documents(args.doc, args.pattern), args.workers, args.first_error)
+        if args.jsonl is None or str(args.jsonl) == "-":
+            totals = summarize(results, sys.stdout)
+        else:
+            with open(args.jsonl, 'w', encoding='utf-8') as f:
+                totals = summarize(results, f)
+            print(f"[SCHEMA] {totals['valid']}/{totals['total']} Dokumente konform, {totals['invalid']} fehlerhaft -> {args.jsonl}")
+        exit(0 if totals["invalid"] == 0 else 1)
     elif args.command == "validate":
+        from core.validation.schema_validator import SchemaValidator
         validator = SchemaValidator(args.schema)
-        success = validator.validate(args.doc)
+        success = validator.validate(Path(args.doc))
         exit(0 if success else 1)
 
 if __name__ == "__main__":
@@ -16,3 +16,9 @@ class LifecycleManager:
 
     def health(self):
         return {s.name: s.health() for s in self.services}
+
+    def runtime(self, **options):
+        # Async runtime over the registered services: dependency-ordered
+        # concurrent start/stop, run loops, periodic tasks, cached health
+        from uin_ngin.core.runtime import ServiceRuntime
+        return ServiceRuntime(self.services, **options)
@@ -0,0 +1,188 @@
+# path: uin_ngin/core/runtime.py
+import asyncio
+import inspect
+import time
+
+
+async def _call(fn, *args):
+    # Coroutine functions are awaited, plain callables run in a thread so a
+    # blocking service never stalls the event loop
+    if inspect.iscoroutinefunction(fn):
+        return await fn(*args)
+    return await asyncio.to_thread(fn, *args)
+
+
+def dependency_layers(services):
+    # Groups services into layers; every dependency of a service lies in an
+    # earlier layer, so each layer can be started concurrently
+    by_name = {s.name: s for s in services}
+    if len(by_name) != len(services):
+        raise ValueError("Service names must be unique")
+    pending = {}
+    for s in services:
+        missing = [d for d in getattr(s, "depends_on", ()) if d not in by_name]
+        if missing:
+            raise ValueError(f"{s.name} depends on unknown services: {', '.join(missing)}")
+        pending[s.name] = set(getattr(s, "depends_on", ()))
+    layers = []
+    while pending:
+        ready = [name for name, deps in pending.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle between: {', '.join(sorted(pending))}")
+        layers.append([by_name[name] for name in ready])
+        for name in ready:
+            del pending[name]
+        for deps in pending.values():
+            deps.difference_update(ready)
+    return layers
+
+
+class ServiceRuntime:
+    # Runs services on the current event loop. start() brings up each
+    # dependency layer concurrently, then launches run loops, periodic tasks
+    # and the background health checker. health() only reads cached results.
+    def __init__(self, services=(), health_interval=10.0, health_timeout=2.0, start_timeout=None):
+        self.services = list(services)
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.start_timeout = start_timeout
+        self.state = "stopped"
+        self._started = []
+        self._tasks = {}
+        self._health = {}
+        self._faults = {}
+        self._checks = {}
+        self._health_task = None
+
+    def register(self, service):
+        if self.state != "stopped":
+            raise RuntimeError("Services must be registered before start()")
+        self.services.append(service)
+
+    async def start(self):
+        layers = dependency_layers(self.services)
+        self.state = "starting"
+        self._started = []
+        try:
+            for layer in layers:
+                results = await asyncio.gather(*(self._start(s) for s in layer), return_exceptions=True)
+                failed = [(s, r) for s, r in zip(layer, results) if isinstance(r, BaseException)]
+                self._started.extend(s for s, r in zip(layer, results) if not isinstance(r, BaseException))
+                if failed:
+                    service, error = failed[0]
+                    raise RuntimeError(f"Service {service.name} failed to start: {error!r}") from error
+        except BaseException:
+            await self.stop()
+            raise
+        await self.check_health()
+        self._health_task = asyncio.create_task(self._health_loop())
+        self.state = "running"
+
+    async def _start(self, service):
+        self._health[service.name] = {"status": "starting", "service": service.name}
+        if self.start_timeout:
+            await asyncio.wait_for(_call(service.start), self.start_timeout)
+        else:
+            await _call(service.start)
+        tasks = []
+        run = getattr(service, "run", None)
+        if run is not None:
+            tasks.append(asyncio.create_task(self._run(service, run)))
+        for _, method in inspect.getmembers(service, lambda m: hasattr(m, "_periodic_interval")):
+            tasks.append(asyncio.create_task(self._every(service, method)))
+        self._tasks[service.name] = tasks
+
+    async def _run(self, service, run):
+        try:
+            await _call(run)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._fault(service, "run", "error", f"run loop crashed: {type(e).__name__}: {e}")
+
+    async def _every(self, service, method):
+        interval = method._periodic_interval
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await _call(method)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._fault(service, method.__name__, "degraded", f"{method.__name__} failed: {type(e).__name__}: {e}")
+            else:
+                self._faults.get(service.name, {}).pop(method.__name__, None)
+
+    async def stop(self):
+        self.state = "stopping"
+        if self._health_task is not None:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+        for task in self._checks.values():
+            task.cancel()
+        self._checks = {}
+        started = set(id(s) for s in self._started)
+        errors = []
+        for layer in reversed(dependency_layers(self.services)):
+            layer = [s for s in layer if id(s) in started]
+            tasks = [t for s in layer for t in self._tasks.pop(s.name, ())]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            results = await asyncio.gather(*(_call(s.stop) for s in layer), return_exceptions=True)
+            for s, r in zip(layer, results):
+                self._health[s.name] = {"status": "stopped", "service": s.name}
+                if isinstance(r, Exception):
+                    errors.append(f"{s.name}: {r!r}")
+        self._started = []
+        self._faults = {}
+        self.state = "stopped"
+        if errors:
+            raise RuntimeError("Services failed to stop cleanly: " + "; ".join(errors))
+
+    def _fault(self, service, source, status, error):
+        # Failures of run loops and periodic tasks override the service's own
+        # health answer until the periodic task succeeds again
+        self._faults.setdefault(service.name, {})[source] = (status, error)
+        self._health[service.name] = dict(self._health.get(service.name, {}), status=status, error=error)
+
+    async def _check(self, service):
+        # A check still running from the previous round is awaited again
+        # instead of piling up another thread behind a hung service
+        task = self._checks.get(service.name)
+        if task is None or task.done():
+            task = self._checks[service.name] = asyncio.ensure_future(_call(service.health))
+        start = time.monotonic()
+        try:
+            result = dict(await asyncio.wait_for(asyncio.shield(task), self.health_timeout))
+        except asyncio.TimeoutError:
+            result = {"status": "timeout", "service": service.name, "error": f"no answer within {self.health_timeout}s"}
+        except Exception as e:
+            result = {"status": "error", "service": service.name, "error": f"{type(e).__name__}: {e}"}
+        result.setdefault("status", "ok")
+        for status, error in self._faults.get(service.name, {}).values():
+            if result["status"] != "error":
+                result["status"], result["error"] = status, error
+        result["checked_at"] = time.time()
+        result["duration"] = time.monotonic() - start
+        self._health[service.name] = result
+
+    async def check_health(self):
+        await asyncio.gather(*(self._check(s) for s in self._started))
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_interval)
+            await self.check_health()
+
+    def health(self):
+        # Cached results only; never calls into a service
+        services = {name: dict(result) for name, result in self._health.items()}
+        if self.state != "running":
+            status = self.state
+        elif all(r["status"] == "ok" for r in services.values()):
+            status = "ok"
+        else:
+            status = "degraded"
+        return {"status": status, "services": services}
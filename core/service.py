@@ -1,9 +1,21 @@
 # path: uin_ngin/core/service.py
 from abc import ABC, abstractmethod
 
+def periodic(seconds):
+    # Marks a service method to be called every `seconds` by the ServiceRuntime
+    def decorate(fn):
+        fn._periodic_interval = seconds
+        return fn
+    return decorate
+
 class Service(ABC):
     name: str = "service"
+    # Names of services that must be started before this one
+    depends_on: tuple = ()
 
+    # start/stop/health may be plain or async methods. A service may also
+    # define `async def run(self)`, which the runtime keeps running as a task
+    # between start and stop.
     def start(self): pass
     def stop(self): pass
     def health(self) -> dict:
@@ -7,8 +7,126 @@ Extrahiert Canny-Kanten aus Bildern und generiert UIN-Kompaktpakete.
 import cv2
 import numpy as np
 import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from PIL import Image
+from core.utils.edge_format import FILE_SUFFIX as EDGE_MAP_SUFFIX, encode_edge_map
+from uin.utils.parallel import bounded_map
+
+# Version des UIN-Paketformats; fließt in den Cache-Key ein
+UIN_PACKAGE_VERSION = "0.6"
+
+SUPPORTED_FORMATS = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp']
+
+# Speicherformate für das Kantenbild: PNG oder UIN-Edge-Format (core.utils.edge_format)
+EDGE_FORMATS = ['png', 'packbits', 'rle', 'auto']
+
+def _edge_file_name(base_name, edge_format):
+    return f"{base_name}_edges" + (".png" if edge_format == "png" else EDGE_MAP_SUFFIX)
+
+def _decode(data, source_path=None):
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError(f"Konnte Bild nicht laden: {source_path}")
+    return img, cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+def _detail_level(stats):
+    return "high" if stats['edge_density'] > 0.1 else "medium"
+
+def auto_canny_thresholds(gray, sigma=0.33):
+    """
+    Bestimmt Canny-Thresholds aus dem Median der Graustufen.
+    
+    Args:
+        gray: Graustufenbild (uint8)
+        sigma: Relative Spreizung um den Median
+        
+    Returns:
+        (low, high) als ints
+    """
+    median = float(np.median(gray))
+    low = int(max(0, (1.0 - sigma) * median))
+    high = int(min(255, (1.0 + sigma) * median))
+    return low, max(high, low + 1)
+
+def _edge_stats(width, height, edge_pixels, low_threshold, high_threshold):
+    edge_density = edge_pixels / (width * height)
+    return {
+        "original_dimensions": {"width": width, "height": height},
+        "edge_pixel_count": int(edge_pixels),
+        "edge_density": float(edge_density),
+        "edge_percentage": float(edge_density * 100),
+        "thresholds": {"low": low_threshold, "high": high_threshold}
+    }
+
+class ExtractionResult:
+    """
+    Ergebnis einer Canny-Extraktion mit allen Zwischenpuffern.
+    
+    Das Bild wird genau einmal dekodiert; BGR-, Graustufen- und Kantenpuffer
+    sowie die kodierten Artefakte (PNG/JPEG) werden wiederverwendet.
+    """
+
+    def __init__(self, image, gray, edges, stats, source_path=None, source_size=None):
+        self.image = image
+        self.gray = gray
+        self.edges = edges
+        self.stats = stats
+        self.source_path = source_path
+        self.source_size = source_size
+        self._edge_png = None
+        self._edge_maps = {}
+        self._preview_jpg = None
+
+    @classmethod
+    def from_bytes(cls, data, low_threshold=100, high_threshold=200, source_path=None):
+        """
+        Dekodiert ein Bild aus kodierten Bytes und extrahiert die Kanten.
+        
+        Sind low_threshold und high_threshold None, werden sie über
+        auto_canny_thresholds aus dem Median der Graustufen bestimmt.
+        """
+        img, gray = _decode(data, source_path)
+        if low_threshold is None and high_threshold is None:
+            low_threshold, high_threshold = auto_canny_thresholds(gray)
+        
+        # Canny Edge Detection anwenden
+        edges = cv2.Canny(gray, low_threshold, high_threshold)
+        
+        height, width = img.shape[:2]
+        stats = _edge_stats(width, height, cv2.countNonZero(edges), low_threshold, high_threshold)
+        return cls(img, gray, edges, stats, source_path=source_path, source_size=len(data))
+
+    @classmethod
+    def from_path(cls, image_path, low_threshold=100, high_threshold=200):
+        return cls.from_bytes(Path(image_path).read_bytes(), low_threshold, high_threshold, source_path=image_path)
+
+    def edge_png(self):
+        """Kantenbild als PNG-Bytes (wird nur einmal kodiert)."""
+        if self._edge_png is None:
+            self._edge_png = cv2.imencode(".png", self.edges)[1].tobytes()
+        return self._edge_png
+
+    def edge_map(self, encoding="packbits"):
+        """Kantenbild im kompakten UIN-Edge-Format (bitgepackt oder RLE)."""
+        if encoding not in self._edge_maps:
+            thresholds = self.stats["thresholds"]
+            self._edge_maps[encoding] = encode_edge_map(self.edges, thresholds["low"], thresholds["high"], encoding)
+        return self._edge_maps[encoding]
+
+    def edge_bytes(self, edge_format="png"):
+        """Kantenbild im gewählten Speicherformat (siehe EDGE_FORMATS)."""
+        return self.edge_png() if edge_format == "png" else self.edge_map(edge_format)
+
+    def preview_jpg(self):
+        """Vorschau (Original + Kanten nebeneinander) als JPEG-Bytes."""
+        if self._preview_jpg is None:
+            preview = np.hstack([self.image, cv2.cvtColor(self.edges, cv2.COLOR_GRAY2BGR)])
+            self._preview_jpg = cv2.imencode(".jpg", preview)[1].tobytes()
+        return self._preview_jpg
 
 def extract_canny_edges(image_path, low_threshold=100, high_threshold=200):
     """
@@ -23,68 +141,310 @@ def extract_canny_edges(image_path, low_threshold=100, high_threshold=200):
         edges: Numpy-Array mit den Kanten (0=keine Kante, 255=Kante)
         stats: Dictionary mit Statistiken
     """
-    # Bild laden und in Graustufen konvertieren
-    img = cv2.imread(str(image_path))
-    if img is None:
+    result = ExtractionResult.from_path(image_path, low_threshold, high_threshold)
+    return result.edges, result.stats
+
+def sweep_canny_thresholds(image_path, threshold_pairs, include_auto=False):
+    """
+    Wertet mehrere Threshold-Paare auf einem Bild aus.
+    
+    Dekodierung, Graustufenkonvertierung und Sobel-Gradienten werden nur
+    einmal berechnet; pro Paar läuft nur noch NMS und Hysterese
+    (cv2.Canny auf den vorberechneten Gradienten).
+    
+    Args:
+        image_path: Pfad zum Eingabebild
+        threshold_pairs: Iterable von (low, high)
+        include_auto: Zusätzlich das Median-basierte Paar auswerten
+        
+    Returns:
+        Liste von Dictionaries mit "thresholds", "edges", "stats" und "detail_level"
+    """
+    img, gray = _decode(Path(image_path).read_bytes(), image_path)
+    height, width = gray.shape
+    # Gleiche Ableitungen wie cv2.Canny intern (Apertur 3, BORDER_REPLICATE)
+    dx = cv2.Sobel(gray, cv2.CV_16S, 1, 0, ksize=3, borderType=cv2.BORDER_REPLICATE)
+    dy = cv2.Sobel(gray, cv2.CV_16S, 0, 1, ksize=3, borderType=cv2.BORDER_REPLICATE)
+    
+    pairs = list(threshold_pairs)
+    if include_auto:
+        pairs.append(auto_canny_thresholds(gray))
+    
+    results = []
+    for low, high in pairs:
+        edges = cv2.Canny(dx, dy, low, high)
+        stats = _edge_stats(width, height, cv2.countNonZero(edges), low, high)
+        results.append({
+            "thresholds": {"low": low, "high": high},
+            "edges": edges,
+            "stats": stats,
+            "detail_level": _detail_level(stats)
+        })
+    return results
+
+# Pixelzustände des Kantenrasters während der gekachelten Extraktion
+_WEAK = 1
+_EDGE = 2
+
+def _tiles(height, width, tile_size):
+    for y in range(0, height, tile_size):
+        for x in range(0, width, tile_size):
+            yield y, x
+
+def _open_gray_raster(image_path, scratch_dir):
+    """
+    Öffnet die Graustufen-Quelle als (memory-mapped) 2D-Array.
+    
+    .npy-Raster werden direkt gemappt und kachelweise gelesen. Kodierte
+    Formate (PNG/JPEG/TIFF) lassen sich mit OpenCV nicht partiell dekodieren;
+    sie werden einmal als Graustufen (1 Byte/Pixel) dekodiert und auf Platte
+    ausgelagert. Für Bilder > 2^30 Pixel muss OPENCV_IO_MAX_IMAGE_PIXELS
+    gesetzt sein.
+    """
+    path = Path(image_path)
+    if path.suffix.lower() == ".npy":
+        raster = np.load(path, mmap_mode="r")
+        if raster.ndim != 2 or raster.dtype != np.uint8:
+            raise ValueError(f"Erwarte 2D-uint8-Raster: {image_path}")
+        return raster
+    gray = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
         raise ValueError(f"Konnte Bild nicht laden: {image_path}")
+    raster = np.memmap(Path(scratch_dir) / "gray.raw", dtype=np.uint8, mode="w+", shape=gray.shape)
+    raster[:] = gray
+    del gray
+    return raster
+
+def extract_canny_edges_tiled(image_path, edge_raster_path, low_threshold=100, high_threshold=200, tile_size=2048, overlap=16):
+    """
+    Extrahiert Canny-Kanten kachelweise in ein memory-mapped Raster.
     
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    Gradienten und Non-Maximum-Suppression werden pro Kachel mit
+    überlappendem Rand berechnet, die Hysterese wird anschließend über die
+    Kachelgrenzen hinweg bis zum Fixpunkt propagiert. Das Ergebnis ist damit
+    identisch mit cv2.Canny auf dem vollständigen Graustufenbild; der
+    Arbeitsspeicher ist durch die Kachelgröße begrenzt.
     
-    # Canny Edge Detection anwenden
-    edges = cv2.Canny(gray, low_threshold, high_threshold)
+    Args:
+        image_path: Pfad zum Eingabebild oder zu einem 2D-uint8-.npy-Raster
+        edge_raster_path: Zielpfad des Kantenrasters (.npy, memory-mapped)
+        low_threshold: Unterer Threshold für Canny
+        high_threshold: Oberer Threshold für Canny
+        tile_size: Kantenlänge einer Kachel in Pixeln
+        overlap: Überlappung der Kacheln in Pixeln (mindestens 2)
+        
+    Returns:
+        edges: np.memmap mit den Kanten (0=keine Kante, 255=Kante)
+        stats: Dictionary mit Statistiken
+    """
+    if overlap < 2:
+        raise ValueError("overlap muss mindestens 2 Pixel betragen (Sobel + Non-Maximum-Suppression)")
+    edge_raster_path = Path(edge_raster_path)
+    edge_raster_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Statistiken berechnen
-    height, width = img.shape[:2]
-    edge_pixels = np.sum(edges > 0)
-    total_pixels = width * height
-    edge_density = edge_pixels / total_pixels
+    with tempfile.TemporaryDirectory(dir=edge_raster_path.parent) as scratch:
+        gray = _open_gray_raster(image_path, scratch)
+        height, width = gray.shape
+        state = np.lib.format.open_memmap(edge_raster_path, mode="w+", dtype=np.uint8, shape=(height, width))
+        
+        # 1. Kandidaten (>= low) und Saatpunkte (>= high) pro Kachel mit Überlappung
+        for y, x in _tiles(height, width, tile_size):
+            y0, x0 = max(0, y - overlap), max(0, x - overlap)
+            y1, x1 = min(height, y + tile_size + overlap), min(width, x + tile_size + overlap)
+            window = np.ascontiguousarray(gray[y0:y1, x0:x1])
+            weak = cv2.Canny(window, low_threshold, low_threshold)
+            strong = cv2.Canny(window, high_threshold, high_threshold)
+            inner = (slice(y - y0, y - y0 + min(tile_size, height - y)), slice(x - x0, x - x0 + min(tile_size, width - x)))
+            state[y:y + tile_size, x:x + tile_size] = np.where(strong[inner] > 0, _EDGE, np.where(weak[inner] > 0, _WEAK, 0))
+        del gray
     
-    stats = {
-        "original_dimensions": {"width": width, "height": height},
-        "edge_pixel_count": int(edge_pixels),
-        "edge_density": float(edge_density),
-        "edge_percentage": float(edge_density * 100),
-        "thresholds": {"low": low_threshold, "high": high_threshold}
-    }
+    # 2. Hysterese: Kanten entlang schwacher Kandidaten bis zum Fixpunkt propagieren
+    pending = dict.fromkeys(_tiles(height, width, tile_size))
+    while pending:
+        y, x = next(iter(pending))
+        del pending[(y, x)]
+        y0, x0 = max(0, y - 1), max(0, x - 1)
+        y1, x1 = min(height, y + tile_size + 1), min(width, x + tile_size + 1)
+        window = np.array(state[y0:y1, x0:x1])
+        n, labels = cv2.connectedComponents((window > 0).astype(np.uint8), connectivity=8)
+        connected = np.zeros(n, dtype=bool)
+        connected[np.unique(labels[window == _EDGE])] = True
+        connected[0] = False
+        inner = (slice(y - y0, y - y0 + min(tile_size, height - y)), slice(x - x0, x - x0 + min(tile_size, width - x)))
+        promoted = connected[labels[inner]] & (window[inner] == _WEAK)
+        if not promoted.any():
+            continue
+        tile = state[y:y + tile_size, x:x + tile_size]
+        tile[promoted] = _EDGE
+        # Nachbarkacheln sehen nur den 1-Pixel-Rand dieser Kachel
+        ring = promoted.copy()
+        ring[1:-1, 1:-1] = False
+        if ring.any():
+            for dy in (-tile_size, 0, tile_size):
+                for dx in (-tile_size, 0, tile_size):
+                    ny, nx = y + dy, x + dx
+                    if (dy or dx) and 0 <= ny < height and 0 <= nx < width:
+                        pending[(ny, nx)] = None
+    
+    # 3. Raster finalisieren und Statistik inkrementell pro Kachel berechnen
+    edge_pixels = 0
+    for y, x in _tiles(height, width, tile_size):
+        tile = state[y:y + tile_size, x:x + tile_size]
+        is_edge = tile == _EDGE
+        edge_pixels += int(np.count_nonzero(is_edge))
+        tile[:] = np.where(is_edge, 255, 0)
+    state.flush()
     
-    return edges, stats
+    stats = _edge_stats(width, height, edge_pixels, low_threshold, high_threshold)
+    stats["tiling"] = {"tile_size": tile_size, "overlap": overlap}
+    return state, stats
+
+def _write_readme(output_path, base_name, uin_data, edge_path, json_path, json_size, preview_path, stats):
+    """Schreibt die README.md eines UIN-Pakets und liefert ihren Pfad."""
+    readme_content = f"""# UIN Kompaktpaket: {base_name}
+
+## Generiert am: {uin_data['metadata']['extraction_timestamp']}
+
+### Enthaltene Dateien:
+1. `{edge_path.name}` - Extrahierte Canny-Kanten (ControlNet-ready)
+2. `{json_path.name}` - UIN-Attribute im JSON-Format
+3. `{preview_path.name}` - Vorschau (Original + Kanten)
+
+### Nutzung:
+1. **Für KI-Generierung**:
+   - Laden Sie `{edge_path.name}` in ControlNet (Canny-Modell)
+   - Nutzen Sie die Attribute aus `{json_path.name}` für den Prompt
+   - Generieren Sie in ComfyUI/Automatic1111
 
-def create_uin_package(image_path, output_dir, low_thresh=100, high_thresh=200):
+2. **Für Kompression**:
+   - Original: {uin_data['compression_info']['original_size_kb']:.1f} KB
+   - UIN-Paket: {uin_data['compression_info']['edge_image_size_kb'] + json_size/1024:.1f} KB
+   - Kompression: {uin_data['compression_info']['compression_ratio']}
+
+### Statistiken:
+- Kantendichte: {stats['edge_percentage']:.2f}%
+- Kantenpixel: {stats['edge_pixel_count']:,}
+- Thresholds: {stats['thresholds']['low']}/{stats['thresholds']['high']}
+
+---
+*Generiert mit UIN v{UIN_PACKAGE_VERSION} - Universal Image Notation*
+"""
+    
+    readme_path = output_path / "README.md"
+    with open(readme_path, 'w', encoding='utf-8') as f:
+        f.write(readme_content)
+    return readme_path
+
+def _dump_json(uin_data):
+    return json.dumps(uin_data, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _restore_from_cache(entry, image_path, output_path, base_name, edge_format):
+    """Übernimmt ein gecachtes Paket in das Ausgabeverzeichnis."""
+    edge_path = output_path / _edge_file_name(base_name, edge_format)
+    preview_path = output_path / f"{base_name}_preview.jpg"
+    json_path = output_path / f"{base_name}_attributes.uin.json"
+    shutil.copyfile(entry["files"]["edges"], edge_path)
+    shutil.copyfile(entry["files"]["preview"], preview_path)
+    shapes_path = None
+    if "shapes" in entry["files"]:
+        shapes_path = output_path / f"{base_name}_shapes.uin.json"
+        shutil.copyfile(entry["files"]["shapes"], shapes_path)
+    
+    with open(entry["files"]["attributes"], 'r', encoding='utf-8') as f:
+        uin_data = json.load(f)
+    # Gleicher Inhalt kann unter anderem Pfad vorliegen
+    uin_data["metadata"]["source_image"] = str(image_path)
+    uin_data["edge_reference"]["file_name"] = edge_path.name
+    if shapes_path is not None:
+        uin_data["vector_reference"]["file_name"] = shapes_path.name
+    json_bytes = _dump_json(uin_data)
+    json_path.write_bytes(json_bytes)
+    
+    readme_path = _write_readme(output_path, base_name, uin_data, edge_path, json_path, len(json_bytes), preview_path, entry["stats"])
+    result = {
+        "edge_image": str(edge_path),
+        "uin_json": str(json_path),
+        "preview": str(preview_path),
+        "readme": str(readme_path),
+        "stats": entry["stats"],
+        "cache": "hit"
+    }
+    if shapes_path is not None:
+        result["shapes"] = str(shapes_path)
+    return result
+
+def create_uin_package(image_path, output_dir, low_thresh=100, high_thresh=200, cache=None, edge_format="png", vectorize_tolerance=None):
     """
     Erstellt ein komplettes UIN-Paket aus einem Bild.
     
+    Das Bild wird einmal gelesen und dekodiert, alle Artefakte werden im
+    Speicher kodiert und genau einmal geschrieben.
+    
     Args:
         image_path: Pfad zum Eingabebild
         output_dir: Ausgabeverzeichnis
-        low_thresh: Unterer Canny-Threshold
+        low_thresh: Unterer Canny-Threshold (None zusammen mit high_thresh = automatisch)
         high_thresh: Oberer Canny-Threshold
+        cache: Optionaler ExtractionCache; bei einem Treffer entfällt die Extraktion
+        edge_format: Speicherformat des Kantenbilds ("png", "packbits", "rle", "auto")
+        vectorize_tolerance: Wenn gesetzt, zusätzlich Polygone (<name>_shapes.uin.json)
+            mit dieser Vereinfachungstoleranz in Pixeln erzeugen
         
     Returns:
         Dictionary mit Pfaden zu den generierten Dateien
     """
+    if edge_format not in EDGE_FORMATS:
+        raise ValueError(f"Unbekanntes Kantenformat: {edge_format}")
+    
     # Ausgabeverzeichnis erstellen
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     
     # Basisnamen für Dateien
     base_name = Path(image_path).stem
+    source_bytes = Path(image_path).read_bytes()
+    
+    # 0. Cache-Lookup über Bildinhalt + Thresholds + Formatversion
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.key(source_bytes, low_thresh, high_thresh, f"{UIN_PACKAGE_VERSION}/{edge_format}/{vectorize_tolerance}")
+        entry = cache.get(cache_key)
+        if entry is not None:
+            try:
+                return _restore_from_cache(entry, image_path, output_path, base_name, edge_format)
+            except OSError:
+                # Eintrag wurde zwischen get() und Kopie verdrängt (paralleler Worker) – neu berechnen
+                pass
     
-    # 1. Kanten extrahieren
-    edges, stats = extract_canny_edges(image_path, low_thresh, high_thresh)
+    # 1. Kanten extrahieren (einmalige Dekodierung)
+    extraction = ExtractionResult.from_bytes(source_bytes, low_thresh, high_thresh, source_path=image_path)
+    stats = extraction.stats
     
     # 2. Kantenbild speichern
-    edge_path = output_path / f"{base_name}_edges.png"
-    cv2.imwrite(str(edge_path), edges)
+    edge_data = extraction.edge_bytes(edge_format)
+    edge_path = output_path / _edge_file_name(base_name, edge_format)
+    edge_path.write_bytes(edge_data)
     
     # 3. Vorschau-Bild erstellen (Original + Kanten)
-    img_original = cv2.imread(str(image_path))
-    preview = np.hstack([img_original, cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)])
+    preview_jpg = extraction.preview_jpg()
     preview_path = output_path / f"{base_name}_preview.jpg"
-    cv2.imwrite(str(preview_path), preview)
+    preview_path.write_bytes(preview_jpg)
+    
+    # 3b. Optional: Kanten vektorisieren (UINDocument mit Polygonen)
+    shapes_path = None
+    if vectorize_tolerance is not None:
+        from core.utils.vectorize import vectorize_edges
+        from uin.core.serialize import serialize
+        
+        vector_doc = vectorize_edges(extraction.edges, vectorize_tolerance)
+        shapes_bytes = serialize(vector_doc).encode('utf-8')
+        shapes_path = output_path / f"{base_name}_shapes.uin.json"
+        shapes_path.write_bytes(shapes_bytes)
     
     # 4. UIN-JSON mit extrahierten Attributen erstellen
+    source_size = extraction.source_size
     uin_data = {
-        "version": "0.6",
+        "version": UIN_PACKAGE_VERSION,
         "metadata": {
             "source_image": str(image_path),
             "extraction_method": "canny_edge_detection",
@@ -93,7 +453,8 @@ def create_uin_package(image_path, output_dir, low_thresh=100, high_thresh=200):
         },
         "edge_reference": {
             "file_name": edge_path.name,
-            "canny_thresholds": {"low": low_thresh, "high": high_thresh},
+            "format": edge_format if edge_format == "png" else "uin_edge_map",
+            "canny_thresholds": stats["thresholds"],
             "recommended_use": "controlnet_canny_input"
         },
         "canvas": {
@@ -111,67 +472,114 @@ def create_uin_package(image_path, output_dir, low_thresh=100, high_thresh=200):
                 "note": "Passen Sie diese Attribute basierend auf Ihrem Bild an",
                 "position": {"x": 0, "y": 0, "z": 0, "anchor": "center"},
                 "suggested_attributes": {
-                    "detail_level": "high" if stats['edge_density'] > 0.1 else "medium",
+                    "detail_level": _detail_level(stats),
                     "lighting_suggestion": "balanced studio lighting",
                     "style_suggestion": "photorealistic"
                 }
             }
         ],
         "compression_info": {
-            "original_size_kb": Path(image_path).stat().st_size / 1024,
-            "edge_image_size_kb": edge_path.stat().st_size / 1024,
-            "compression_ratio": ">95%" if edge_path.stat().st_size < Path(image_path).stat().st_size * 0.05 else ">90%"
+            "original_size_kb": source_size / 1024,
+            "edge_image_size_kb": len(edge_data) / 1024,
+            "compression_ratio": ">95%" if len(edge_data) < source_size * 0.05 else ">90%"
         }
     }
     
+    if shapes_path is not None:
+        uin_data["vector_reference"] = {
+            "file_name": shapes_path.name,
+            "shape_count": len(vector_doc.shapes),
+            "tolerance": vectorize_tolerance,
+            "size_kb": len(shapes_bytes) / 1024
+        }
+    
     # 5. UIN-JSON speichern
+    json_bytes = _dump_json(uin_data)
     json_path = output_path / f"{base_name}_attributes.uin.json"
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(uin_data, f, indent=2, ensure_ascii=False)
+    json_path.write_bytes(json_bytes)
     
     # 6. README für das Paket erstellen
-    readme_content = f"""# UIN Kompaktpaket: {base_name}
-
-## Generiert am: {uin_data['metadata']['extraction_timestamp']}
-
-### Enthaltene Dateien:
-1. `{edge_path.name}` - Extrahierte Canny-Kanten (ControlNet-ready)
-2. `{json_path.name}` - UIN-Attribute im JSON-Format
-3. `{preview_path.name}` - Vorschau (Original + Kanten)
-
-### Nutzung:
-1. **Für KI-Generierung**:
-   - Laden Sie `{edge_path.name}` in ControlNet (Canny-Modell)
-   - Nutzen Sie die Attribute aus `{json_path.name}` für den Prompt
-   - Generieren Sie in ComfyUI/Automatic1111
-
-2. **Für Kompression**:
-   - Original: {uin_data['compression_info']['original_size_kb']:.1f} KB
-   - UIN-Paket: {uin_data['compression_info']['edge_image_size_kb'] + json_path.stat().st_size/1024:.1f} KB
-   - Kompression: {uin_data['compression_info']['compression_ratio']}
-
-### Statistiken:
-- Kantendichte: {stats['edge_percentage']:.2f}%
-- Kantenpixel: {stats['edge_pixel_count']:,}
-- Thresholds: {low_thresh}/{high_thresh}
-
----
-*Generiert mit UIN v0.6 - Universal Image Notation*
-"""
+    readme_path = _write_readme(output_path, base_name, uin_data, edge_path, json_path, len(json_bytes), preview_path, stats)
     
-    readme_path = output_path / "README.md"
-    with open(readme_path, 'w', encoding='utf-8') as f:
-        f.write(readme_content)
+    # 7. Ergebnis für spätere Läufe cachen (aus den Puffern, nicht von Platte)
+    if cache is not None:
+        artifacts = {"edges": edge_data, "preview": preview_jpg, "attributes": json_bytes}
+        if shapes_path is not None:
+            artifacts["shapes"] = shapes_bytes
+        cache.put(cache_key, artifacts, stats)
     
-    return {
+    result = {
         "edge_image": str(edge_path),
         "uin_json": str(json_path),
         "preview": str(preview_path),
         "readme": str(readme_path),
         "stats": stats
     }
+    if shapes_path is not None:
+        result["shapes"] = str(shapes_path)
+    if cache is not None:
+        result["cache"] = "miss"
+    return result
 
-def batch_process_directory(input_dir, output_base_dir, low_thresh=100, high_thresh=200):
+def iter_image_files(input_dir):
+    """
+    Liefert die unterstützten Bilddateien eines Verzeichnisses als Generator,
+    ohne die komplette Dateiliste im Speicher aufzubauen.
+    """
+    for img_file in Path(input_dir).iterdir():
+        if img_file.suffix.lower() in SUPPORTED_FORMATS:
+            yield img_file
+
+def _process_image(img_file, output_base, package_options):
+    """
+    Verarbeitet ein einzelnes Bild eines Batch-Laufs.
+    
+    Fehler werden nicht geworfen, sondern als Ergebnis-Eintrag mit
+    "error" zurückgegeben, damit sie in der Zusammenfassung landen.
+    """
+    # Einzelausgabeverzeichnis für jedes Bild
+    output_dir = Path(output_base) / img_file.stem
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    try:
+        result = create_uin_package(
+            img_file, 
+            output_dir, 
+            **package_options
+        )
+    except Exception as e:
+        return {"source_image": str(img_file), "error": str(e)}
+    result["output_dir"] = str(output_dir)
+    return result
+
+def _init_worker(cv_threads):
+    """Begrenzt die OpenCV-Threads pro Worker, damit der Pool die CPU nicht überbucht."""
+    cv2.setNumThreads(cv_threads)
+
+def _iter_serial(files, output_base, package_options):
+    for img_file in files:
+        print(f"Verarbeite: {img_file.name}")
+        yield _process_image(img_file, output_base, package_options)
+
+def _iter_parallel(files, output_base, package_options, workers, max_in_flight):
+    """
+    Verteilt die Dateien auf einen Prozess-Pool und liefert die Ergebnisse
+    in Fertigstellungsreihenfolge.
+    
+    Es sind nie mehr als max_in_flight Aufträge gleichzeitig eingereicht,
+    sodass der Speicherbedarf unabhängig von der Verzeichnisgröße bleibt.
+    """
+    def announced():
+        for img_file in files:
+            print(f"Verarbeite: {img_file.name}")
+            yield img_file
+
+    cv_threads = max(1, (os.cpu_count() or 1) // workers)
+    process = partial(_process_image, output_base=output_base, package_options=package_options)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cv_threads,)) as pool:
+        yield from bounded_map(pool, process, announced(), max_in_flight, ordered=False)
+
+def batch_process_directory(input_dir, output_base_dir, low_thresh=100, high_thresh=200, workers=None, max_in_flight=None, cache=None, edge_format="png", vectorize_tolerance=None):
     """
     Verarbeitet alle Bilder in einem Verzeichnis.
     
@@ -180,39 +588,46 @@ def batch_process_directory(input_dir, output_base_dir, low_thresh=100, high_thr
         output_base_dir: Basis-Ausgabeverzeichnis
         low_thresh: Unterer Canny-Threshold
         high_thresh: Oberer Canny-Threshold
+        workers: Anzahl Worker-Prozesse (None/1 = sequentiell im aktuellen Prozess)
+        max_in_flight: Maximal gleichzeitig eingereichte Bilder (default: 2 * workers)
+        cache: Optionaler ExtractionCache; unveränderte Bilder werden übersprungen
+        edge_format: Speicherformat der Kantenbilder (siehe create_uin_package)
+        vectorize_tolerance: Optionale Vektorisierung (siehe create_uin_package)
+        
+    Returns:
+        Dictionary mit der Zusammenfassung (wie processing_summary.json)
     """
     input_path = Path(input_dir)
     output_base = Path(output_base_dir)
+    output_base.mkdir(parents=True, exist_ok=True)
+    
+    files = iter_image_files(input_path)
+    package_options = {"low_thresh": low_thresh, "high_thresh": high_thresh, "cache": cache, "edge_format": edge_format, "vectorize_tolerance": vectorize_tolerance}
     
-    supported_formats = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp']
+    if workers and workers > 1:
+        outcomes = _iter_parallel(files, output_base, package_options, workers, max_in_flight or 2 * workers)
+    else:
+        outcomes = _iter_serial(files, output_base, package_options)
     
     results = []
     
-    for img_file in input_path.iterdir():
-        if img_file.suffix.lower() in supported_formats:
-            print(f"Verarbeite: {img_file.name}")
-            
-            # Einzelausgabeverzeichnis für jedes Bild
-            output_dir = output_base / img_file.stem
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            try:
-                result = create_uin_package(
-                    img_file, 
-                    output_dir, 
-                    low_thresh, 
-                    high_thresh
-                )
-                results.append(result)
-                print(f"  ✓ Paket erstellt in: {output_dir}")
-            except Exception as e:
-                print(f"  ✗ Fehler bei {img_file.name}: {e}")
+    for result in outcomes:
+        if "error" in result:
+            print(f"  ✗ Fehler bei {Path(result['source_image']).name}: {result['error']}")
+        else:
+            print(f"  ✓ Paket erstellt in: {result['output_dir']}")
+        results.append(result)
     
     # Zusammenfassung erstellen
     summary = {
         "total_processed": len(results),
         "successful": len([r for r in results if "edge_image" in r]),
         "failed": len([r for r in results if "edge_image" not in r]),
+        "workers": workers or 1,
+        "cache": {
+            "hits": len([r for r in results if r.get("cache") == "hit"]),
+            "misses": len([r for r in results if r.get("cache") == "miss"])
+        },
         "total_compression_saving": 0,
         "results": results
     }
@@ -223,4 +638,7 @@ def batch_process_directory(input_dir, output_base_dir, low_thresh=100, high_thr
     
     print(f"\nVerarbeitung abgeschlossen!")
     print(f"   Erfolgreich: {summary['successful']}/{summary['total_processed']}")
+    if cache is not None:
+        print(f"   Cache: {summary['cache']['hits']} Treffer, {summary['cache']['misses']} Fehlzugriffe")
     print(f"   Zusammenfassung: {summary_path}")
+    return summary
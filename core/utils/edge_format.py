@@ -0,0 +1,120 @@
+"""
+UIN Edge Format – kompaktes Binärformat für Kantenkarten.
+
+Kantenkarten sind binär (0/255). Statt sie als 8-Bit-PNG zu speichern,
+werden sie bitweise gepackt (np.packbits) oder lauflängenkodiert. Ein
+kleiner Header enthält Abmessungen und Canny-Thresholds.
+
+Layout (little endian):
+    magic     4s   b"UINE"
+    version   B    FORMAT_VERSION
+    encoding  B    ENCODING_PACKBITS | ENCODING_RLE
+    run_width B    Bytes pro Lauflänge (nur RLE, sonst 0)
+    reserved  B
+    width     I
+    height    I
+    low       H
+    high      H
+    payload
+"""
+
+import struct
+import numpy as np
+from pathlib import Path
+
+MAGIC = b"UINE"
+FORMAT_VERSION = 1
+FILE_SUFFIX = ".uine"
+
+ENCODING_PACKBITS = 0
+ENCODING_RLE = 1
+
+_HEADER = struct.Struct("<4sBBBBIIHH")
+_RUN_DTYPES = {1: np.dtype("<u1"), 2: np.dtype("<u2"), 4: np.dtype("<u4")}
+
+def _encode_packbits(flat):
+    return np.packbits(flat).tobytes(), 0
+
+def _encode_rle(flat):
+    # Läufe abwechselnd 0/1, beginnend mit einem (evtl. leeren) 0-Lauf
+    change = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+    bounds = np.concatenate(([0], change, [flat.size]))
+    runs = np.diff(bounds)
+    if flat.size and flat[0]:
+        runs = np.concatenate(([0], runs))
+    longest = int(runs.max()) if runs.size else 0
+    run_width = 1 if longest <= 0xFF else 2 if longest <= 0xFFFF else 4
+    return runs.astype(_RUN_DTYPES[run_width]).tobytes(), run_width
+
+def encode_edge_map(edges, low_threshold=0, high_threshold=0, encoding="packbits"):
+    """
+    Kodiert eine Kantenkarte in das UIN-Edge-Format.
+
+    Args:
+        edges: 2D-Array (Kante = Wert > 0)
+        low_threshold: Unterer Canny-Threshold (Metadaten)
+        high_threshold: Oberer Canny-Threshold (Metadaten)
+        encoding: "packbits", "rle" oder "auto" (kleinere Variante)
+
+    Returns:
+        Kodierte Bytes inklusive Header
+    """
+    height, width = edges.shape
+    flat = (np.asarray(edges) > 0).ravel().astype(np.uint8)
+    if encoding == "packbits":
+        code, (payload, run_width) = ENCODING_PACKBITS, _encode_packbits(flat)
+    elif encoding == "rle":
+        code, (payload, run_width) = ENCODING_RLE, _encode_rle(flat)
+    elif encoding == "auto":
+        packed, rle = _encode_packbits(flat), _encode_rle(flat)
+        code, (payload, run_width) = (ENCODING_RLE, rle) if len(rle[0]) < len(packed[0]) else (ENCODING_PACKBITS, packed)
+    else:
+        raise ValueError(f"Unbekannte Kodierung: {encoding}")
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, code, run_width, 0, width, height, low_threshold, high_threshold)
+    return header + payload
+
+def read_header(data):
+    """Liefert die Header-Felder als Dictionary."""
+    magic, version, code, run_width, _, width, height, low, high = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Keine UIN-Kantenkarte (falsche Signatur)")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Nicht unterstützte Formatversion: {version}")
+    return {
+        "encoding": "rle" if code == ENCODING_RLE else "packbits",
+        "run_width": run_width,
+        "width": width,
+        "height": height,
+        "thresholds": {"low": low, "high": high}
+    }
+
+def decode_edge_map(data, binary=False):
+    """
+    Dekodiert eine Kantenkarte direkt in ein NumPy-Array.
+
+    Args:
+        data: Bytes im UIN-Edge-Format
+        binary: True liefert 0/1 statt 0/255
+
+    Returns:
+        uint8-Array der Form (height, width)
+    """
+    header = read_header(data)
+    width, height = header["width"], header["height"]
+    payload = np.frombuffer(data, dtype=np.uint8, offset=_HEADER.size)
+    if header["encoding"] == "packbits":
+        flat = np.unpackbits(payload, count=width * height)
+    else:
+        runs = payload.view(_RUN_DTYPES[header["run_width"]])
+        values = (np.arange(runs.size) & 1).astype(np.uint8)
+        flat = np.repeat(values, runs)
+    edges = flat.reshape(height, width)
+    return edges if binary else edges * np.uint8(255)
+
+def save_edge_map(path, edges, low_threshold=0, high_threshold=0, encoding="packbits"):
+    data = encode_edge_map(edges, low_threshold, high_threshold, encoding)
+    Path(path).write_bytes(data)
+    return len(data)
+
+def load_edge_map(path, binary=False):
+    return decode_edge_map(Path(path).read_bytes(), binary=binary)
@@ -0,0 +1,136 @@
+"""
+UIN Extraction Cache – inhaltsadressierter Plattencache für UIN-Pakete.
+
+Ein Eintrag wird über den SHA-256 der Bildbytes, die Canny-Thresholds und
+die Paketformat-Version adressiert. Bei einem Treffer werden Kantenbild,
+Vorschau, Attribut-JSON und Statistiken aus dem Cache übernommen, ohne das
+Bild erneut zu dekodieren.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+# Vollständige Verzeichnisscans nur alle RESCAN_EVERY Einträge (andere Prozesse
+# schreiben in dasselbe Verzeichnis) oder wenn das Limit überschritten wird;
+# verdrängt wird bis auf LOW_WATERMARK des Limits, damit nicht jeder weitere
+# Eintrag erneut einen Scan auslöst
+RESCAN_EVERY = 256
+LOW_WATERMARK = 0.9
+
+class ExtractionCache:
+    def __init__(self, cache_dir, max_size_mb=1024):
+        """
+        Args:
+            cache_dir: Verzeichnis des Caches (wird bei Bedarf angelegt)
+            max_size_mb: Größenlimit; älteste Einträge (LRU) werden verdrängt
+        """
+        self.root = Path(cache_dir)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self._total = None
+        self._puts_since_scan = 0
+
+    @staticmethod
+    def key(image_bytes, low_thresh, high_thresh, format_version):
+        h = hashlib.sha256(image_bytes)
+        h.update(f"|{low_thresh}|{high_thresh}|{format_version}".encode("ascii"))
+        return h.hexdigest()
+
+    def _entry_dir(self, key):
+        return self.root / key[:2] / key
+
+    def get(self, key):
+        """
+        Liefert den Eintrag zu key oder None.
+
+        Returns:
+            Dictionary mit "stats" und den Pfaden der gecachten Dateien
+        """
+        entry = self._entry_dir(key)
+        try:
+            with open(entry / "entry.json", 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            # Zugriff vermerken – die mtime des Eintrags ist die LRU-Ordnung
+            os.utime(entry)
+        except (FileNotFoundError, json.JSONDecodeError):
+            # Auch ein zwischenzeitlich von einem anderen Worker verdrängter Eintrag ist ein Fehltreffer
+            return None
+        files = {name: entry / file_name for name, file_name in meta["files"].items()}
+        return {"stats": meta["stats"], "files": files}
+
+    def put(self, key, files, stats):
+        """
+        Legt einen Eintrag an. files bildet Artefaktnamen ("edges",
+        "preview", "attributes", ...) auf Pfade (werden kopiert) oder bytes ab.
+        """
+        entry = self._entry_dir(key)
+        if entry.exists():
+            return
+        tmp = self.root / f"tmp-{uuid.uuid4().hex}"
+        tmp.mkdir()
+        names = {}
+        size = 0
+        for name, src in files.items():
+            target = tmp / (name + (Path(src).suffix if not isinstance(src, bytes) else ""))
+            if isinstance(src, bytes):
+                target.write_bytes(src)
+            else:
+                shutil.copyfile(src, target)
+            names[name] = target.name
+            size += target.stat().st_size
+        with open(tmp / "entry.json", 'w', encoding='utf-8') as f:
+            json.dump({"files": names, "stats": stats}, f)
+        size += (tmp / "entry.json").stat().st_size
+        entry.parent.mkdir(exist_ok=True)
+        try:
+            # Atomar veröffentlichen; parallele Worker mit gleichem Key verlieren das Rennen harmlos
+            os.rename(tmp, entry)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        # Laufende Summe statt Scan pro Eintrag
+        self._puts_since_scan += 1
+        if self._total is None or self._puts_since_scan >= RESCAN_EVERY:
+            self._evict()
+            return
+        self._total += size
+        if self._total > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for shard in self.root.iterdir():
+            if not shard.is_dir() or shard.name.startswith("tmp-"):
+                continue
+            for entry in shard.iterdir():
+                try:
+                    size = sum(f.stat().st_size for f in entry.iterdir())
+                    entries.append((entry.stat().st_mtime, size, entry))
+                except FileNotFoundError:
+                    continue
+                total += size
+        self._puts_since_scan = 0
+        if total > self.max_bytes:
+            target = self.max_bytes * LOW_WATERMARK
+            for _, size, entry in sorted(entries, key=lambda e: e[0]):
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= size
+                if total <= target:
+                    break
+        self._total = total
+
+# Cache des aktuellen Pool-Prozesses (siehe init_worker_cache)
+worker_cache = None
+
+def init_worker_cache(cache_dir, cache_size_mb=1024):
+    """
+    Initializer für Prozess-Pools: legt pro Worker-Prozess einen
+    ExtractionCache an (ohne cache_dir bleibt worker_cache None).
+    """
+    global worker_cache
+    worker_cache = ExtractionCache(cache_dir, cache_size_mb) if cache_dir else None
@@ -0,0 +1,65 @@
+"""
+UIN Edge Vectorization – wandelt Canny-Kantenkarten in UIN-Polygone um.
+
+Konturen werden aus der Kantenkarte verfolgt, per Douglas-Peucker
+(cv2.approxPolyDP) vereinfacht und als Shape(type="polygon") in einem
+UINDocument ausgegeben.
+"""
+
+import cv2
+import numpy as np
+from uin.core.schema import UINDocument, UINMeta, Shape, Color
+
+def trace_contours(edges, tolerance=1.5, min_length=8.0):
+    """
+    Verfolgt und vereinfacht die Konturen einer Kantenkarte.
+    
+    Args:
+        edges: Kantenkarte (Kante = Wert > 0)
+        tolerance: Maximale Abweichung der Vereinfachung in Pixeln
+        min_length: Konturen mit kürzerem Umfang werden verworfen
+        
+    Returns:
+        Liste von (N, 2)-Arrays mit Pixelkoordinaten
+    """
+    mask = (np.asarray(edges) > 0).astype(np.uint8)
+    contours, hierarchy = cv2.findContours(mask, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+    polylines = []
+    for i, contour in enumerate(contours):
+        # Innenkonturen einer 1-Pixel-Kante duplizieren nur die Außenkontur
+        if hierarchy[0][i][3] != -1:
+            continue
+        if cv2.arcLength(contour, True) < min_length:
+            continue
+        polylines.append(cv2.approxPolyDP(contour, tolerance, True).reshape(-1, 2))
+    return polylines
+
+def vectorize_edges(edges, tolerance=1.5, min_length=8.0, color=None):
+    """
+    Erzeugt ein UINDocument mit einem Polygon pro Kontur.
+    
+    Args:
+        edges: Kantenkarte (Kante = Wert > 0)
+        tolerance: Maximale Abweichung der Vereinfachung in Pixeln
+        min_length: Minimaler Konturumfang in Pixeln
+        color: Farbe der Polygone (default: schwarz)
+        
+    Returns:
+        UINDocument mit Shapes vom Typ "polygon" in Pixelkoordinaten
+    """
+    color = color or Color(r=0, g=0, b=0)
+    shapes = []
+    for i, points in enumerate(trace_contours(edges, tolerance, min_length)):
+        x0, y0 = points.min(axis=0)
+        x1, y1 = points.max(axis=0)
+        shapes.append(Shape(
+            id=f"edge_{i + 1}",
+            type="polygon",
+            x=float(x0),
+            y=float(y0),
+            width=float(x1 - x0),
+            height=float(y1 - y0),
+            points=[(float(px), float(py)) for px, py in points],
+            color=color,
+        ))
+    return UINDocument(meta=UINMeta(), shapes=shapes)
@@ -1,23 +1,127 @@
+import glob
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from jsonschema import Draft7Validator
 from pathlib import Path
+from uin.utils.parallel import bounded_map, chunked
 
 def load_schema(path: Path):
     with open(path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+@lru_cache(maxsize=16)
+def _compile(path: str, mtime_ns: int) -> Draft7Validator:
+    return Draft7Validator(load_schema(Path(path)))
+
+def compile_schema(schema_path: Path) -> Draft7Validator:
+    """Kompiliert ein Schema einmal pro Prozess; Änderungen an der Datei invalidieren den Cache."""
+    path = Path(schema_path).resolve()
+    return _compile(str(path), path.stat().st_mtime_ns)
+
 class SchemaValidator:
     def __init__(self, schema_path: Path):
-        self.schema = load_schema(schema_path)
-        self.validator = Draft7Validator(self.schema)
+        self.validator = compile_schema(schema_path)
+        self.schema = self.validator.schema
+
+    def check(self, doc_path: Path, first_error: bool = False) -> dict:
+        """
+        Validiert ein Dokument und liefert ein maschinenlesbares Ergebnis.
+
+        Args:
+            doc_path: Pfad zum UIN-Dokument
+            first_error: Nach dem ersten Fehler abbrechen (kein Sammeln/Sortieren)
+
+        Returns:
+            {"path", "valid", "errors": [{"path": [...], "message"}]}
+        """
+        try:
+            with open(doc_path, 'r', encoding='utf-8') as f:
+                doc = json.load(f)
+        except (OSError, ValueError) as e:
+            return {"path": str(doc_path), "valid": False, "errors": [{"path": [], "message": f"Nicht lesbar: {e}"}]}
+        if first_error:
+            error = next(self.validator.iter_errors(doc), None)
+            errors = [error] if error is not None else []
+        else:
+            errors = sorted(self.validator.iter_errors(doc), key=lambda e: e.path)
+        return {
+            "path": str(doc_path),
+            "valid": not errors,
+            "errors": [{"path": list(e.path), "message": e.message} for e in errors]
+        }
 
     def validate(self, doc_path: Path) -> bool:
-        with open(doc_path, 'r', encoding='utf-8') as f:
-            doc = json.load(f)
-        errors = sorted(self.validator.iter_errors(doc), key=lambda e: e.path)
-        if errors:
-            for e in errors:
-                print(f"[SCHEMA] Fehler: {list(e.path)} -> {e.message}")
+        result = self.check(doc_path)
+        if not result["valid"]:
+            for e in result["errors"]:
+                print(f"[SCHEMA] Fehler: {e['path']} -> {e['message']}")
             return False
         print("[SCHEMA] OK: Dokument ist konform zu v0.8.")
         return True
+
+def iter_documents(target, pattern="*.json"):
+    """
+    Löst eine Datei, ein Verzeichnis (rekursiv nach pattern) oder ein
+    Glob-Muster in einen Strom von Dokumentpfaden auf.
+    """
+    target = str(target)
+    if glob.has_magic(target):
+        for path in glob.iglob(target, recursive=True):
+            if os.path.isfile(path):
+                yield Path(path)
+    elif os.path.isdir(target):
+        yield from (p for p in Path(target).rglob(pattern) if p.is_file())
+    else:
+        yield Path(target)
+
+_worker_validator = None
+
+def _init_worker(schema_path):
+    global _worker_validator
+    _worker_validator = SchemaValidator(schema_path)
+
+def _check_chunk(paths, first_error):
+    return [_worker_validator.check(p, first_error) for p in paths]
+
+def validate_many(schema_path, paths, workers=None, first_error=False, chunk_size=64):
+    """
+    Validiert viele Dokumente gegen ein Schema.
+
+    Das Schema wird pro Prozess genau einmal kompiliert. Mit workers > 1
+    werden Pakete von chunk_size Pfaden auf einen Prozess-Pool verteilt; es
+    sind höchstens 2 * workers Pakete gleichzeitig unterwegs.
+
+    Returns:
+        Generator von Ergebnissen (siehe SchemaValidator.check) in
+        Fertigstellungsreihenfolge
+    """
+    if not workers or workers <= 1:
+        validator = SchemaValidator(schema_path)
+        for p in paths:
+            yield validator.check(p, first_error)
+        return
+
+    check = partial(_check_chunk, first_error=first_error)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(schema_path,)) as pool:
+        for results in bounded_map(pool, check, chunked(paths, chunk_size), 2 * workers, ordered=False):
+            yield from results
+
+def summarize(results, out=None):
+    """
+    Schreibt die Ergebnisse als JSONL (eine Zeile pro Dokument) nach out und
+    hängt eine Abschlusszeile mit Summen an.
+
+    Returns:
+        Dictionary mit den Summen
+    """
+    totals = {"total": 0, "valid": 0, "invalid": 0}
+    for result in results:
+        totals["total"] += 1
+        totals["valid" if result["valid"] else "invalid"] += 1
+        if out is not None:
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    if out is not None:
+        out.write(json.dumps({"summary": totals}) + "\n")
+    return totals
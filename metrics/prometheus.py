@@ -1,3 +1,51 @@
 # path: uin_ngin/metrics/prometheus.py
-def export_prometheus(metrics: dict) -> str:
-    return "\n".join(f"{k} {v}" for k,v in metrics.items())
+import math
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _value(v) -> str:
+    if math.isnan(v):
+        return "NaN"
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    return repr(float(v))
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        f'{k}="' + str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') + '"'
+        for k, v in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def export_prometheus(metrics) -> str:
+    # Text exposition format 0.0.4. Accepts a MetricsRegistry (anything with
+    # collect()) or a plain {name: value} dict, exported as untyped samples.
+    # HELP/TYPE carry the exact sample name, so counters keep their _total.
+    if isinstance(metrics, dict):
+        return "".join(f"{k} {_value(v)}\n" for k, v in metrics.items())
+    lines = []
+    for metric, samples in metrics.collect():
+        name = metric.name
+        if metric.help:
+            lines.append(f"# HELP {name} {_escape_help(metric.help)}")
+        lines.append(f"# TYPE {name} {metric.type}")
+        for labels, value in samples:
+            if metric.type == "histogram":
+                cumulative = 0
+                for bound, count in zip((*metric.buckets, math.inf), value[:-1]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels({**labels, 'le': _value(bound)})} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {_value(value[-1])}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+            else:
+                lines.append(f"{name}{_labels(labels)} {_value(value)}")
+    return "\n".join(lines) + "\n" if lines else ""
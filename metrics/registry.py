@@ -1,10 +1,345 @@
 # path: uin_ngin/metrics/registry.py
+import bisect
+import json
+import math
+import os
+import re
+import threading
+import time
+import uuid
+import weakref
+from pathlib import Path
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NAME_RE = re.compile(r"^[a-zA-Z_:][a-zA-Z0-9_:]*$")
+_LABEL_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, registry, name, help="", labelnames=()):
+        if not _NAME_RE.match(name):
+            raise ValueError(f"Invalid metric name: {name!r}")
+        for label in labelnames:
+            if not _LABEL_RE.match(label) or label.startswith("__"):
+                raise ValueError(f"Invalid label name: {label!r}")
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return (self.name, tuple(str(labels[n]) for n in self.labelnames))
+
+    def labels(self, **labels):
+        return _Child(self, self._key(labels))
+
+
+class _Child:
+    # A metric bound to one label set; the key is computed once
+    __slots__ = ("metric", "key")
+
+    def __init__(self, metric, key):
+        self.metric = metric
+        self.key = key
+
+    def inc(self, amount=1.0):
+        self.metric._inc(self.key, amount)
+
+    def dec(self, amount=1.0):
+        self.metric._inc(self.key, -amount)
+
+    def set(self, value):
+        self.metric._set(self.key, value)
+
+    def observe(self, value):
+        self.metric._observe(self.key, value)
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount=1.0, **labels):
+        self._inc(self._key(labels), amount)
+
+    def _inc(self, key, amount):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        shard = self.registry._shard()
+        shard[key] = shard.get(key, 0.0) + amount
+        self.registry._maybe_flush()
+
+
+class Gauge(_Metric):
+    # Last write wins, across threads and processes: each value carries the
+    # wall-clock time it was set at and collect() keeps the newest.
+    type = "gauge"
+
+    def set(self, value, **labels):
+        self._set(self._key(labels), value)
+
+    def inc(self, amount=1.0, **labels):
+        self._inc(self._key(labels), amount)
+
+    def dec(self, amount=1.0, **labels):
+        self._inc(self._key(labels), -amount)
+
+    def _set(self, key, value):
+        with self.registry._lock:
+            self.registry._gauges[key] = (float(value), time.time())
+        self.registry._maybe_flush()
+
+    def _inc(self, key, amount):
+        with self.registry._lock:
+            value, _ = self.registry._gauges.get(key, (0.0, 0.0))
+            self.registry._gauges[key] = (value + amount, time.time())
+        self.registry._maybe_flush()
+
+
+class Histogram(_Metric):
+    # Fixed buckets; a shard entry is [count per bucket..., +Inf count, sum]
+    type = "histogram"
+
+    def __init__(self, registry, name, help="", labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, help, labelnames)
+        if "le" in self.labelnames:
+            raise ValueError("'le' is reserved for histogram buckets")
+        self.buckets = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+
+    def observe(self, value, **labels):
+        self._observe(self._key(labels), value)
+
+    def _observe(self, key, value):
+        shard = self.registry._shard()
+        state = shard.get(key)
+        if state is None:
+            state = shard[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect.bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+        self.registry._maybe_flush()
+
+    def time(self, **labels):
+        return _Timer(self, self._key(labels))
+
+    def quantile(self, q, **labels):
+        state = self.registry._merged().get(self._key(labels))
+        return histogram_quantile(self.buckets, state[:-1], q) if state else math.nan
+
+
+class _Timer:
+    def __init__(self, histogram, key):
+        self.histogram = histogram
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram._observe(self.key, time.perf_counter() - self.start)
+
+
+def histogram_quantile(buckets, counts, q):
+    # Linear interpolation within the bucket holding the q-th observation,
+    # like PromQL's histogram_quantile
+    total = sum(counts)
+    if not total:
+        return math.nan
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(counts):
+        if seen + count >= rank and count:
+            if i == len(buckets):
+                return buckets[-1] if buckets else math.nan
+            lower = buckets[i - 1] if i else 0.0
+            return lower + (buckets[i] - lower) * (rank - seen) / count
+        seen += count
+    return buckets[-1] if buckets else math.nan
+
+
 class MetricsRegistry:
-    def __init__(self):
-        self.values = {}
+    # Counters and histograms are sharded per thread: every thread updates
+    # its own dict without locking and collect() sums the shards. With
+    # multiprocess_dir set, every process also writes its merged values to
+    # <dir>/<pid>-<id>.json (at most every flush_interval seconds and on
+    # flush()), and collect() in any process adds up all files found there.
+    def __init__(self, multiprocess_dir=None, flush_interval=1.0):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards = []
+        self._gauges = {}
+        self._pid = os.getpid()
+        self._file_id = uuid.uuid4().hex[:8]
+        self.multiprocess_dir = Path(multiprocess_dir) if multiprocess_dir else None
+        if self.multiprocess_dir:
+            self.multiprocess_dir.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self._next_flush = 0.0
+        self._flush_lock = threading.Lock()
+        _REGISTRIES.add(self)
+
+    def _get_or_create(self, cls, name, help, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(self, name, help, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered as {metric.type} {metric.labelnames}")
+            return metric
+
+    def counter(self, name, help="", labelnames=()):
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name, help="", labelnames=()):
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(self, name, help="", labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
 
     def record(self, key, value):
-        self.values[key] = value
+        self.gauge(key).set(value)
+
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None or self._pid != os.getpid():
+            self._fork_reset()
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def _fork_reset(self):
+        # A forked child must not re-report the parent's values. Runs in the
+        # child right after fork (see _after_fork); _shard() checks again for
+        # platforms without os.register_at_fork.
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._file_id = uuid.uuid4().hex[:8]
+            self._lock = threading.Lock()
+            self._flush_lock = threading.Lock()
+            self._shards = []
+            self._gauges = {}
+            self._local = threading.local()
+            self._next_flush = 0.0
+
+    def _local_values(self):
+        merged = {}
+        with self._lock:
+            shards = list(self._shards)
+            gauges = dict(self._gauges)
+        for shard in shards:
+            for key, value in list(shard.items()):
+                _merge(merged, key, value)
+        return merged, gauges
+
+    def _maybe_flush(self):
+        # Called on the hot path: a thread that finds a flush in progress
+        # skips it instead of waiting, and errors never reach the caller
+        if self.multiprocess_dir is None or time.monotonic() < self._next_flush:
+            return
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            if time.monotonic() >= self._next_flush:
+                self._write()
+        except OSError:
+            pass
+        finally:
+            self._flush_lock.release()
+
+    def flush(self):
+        if self.multiprocess_dir is None:
+            return
+        with self._flush_lock:
+            self._write()
+
+    def _write(self):
+        self._next_flush = time.monotonic() + self.flush_interval
+        values, gauges = self._local_values()
+        payload = {
+            "values": [[name, list(labels), value] for (name, labels), value in values.items()],
+            "gauges": [[name, list(labels), value, ts] for (name, labels), (value, ts) in gauges.items()],
+        }
+        path = self.multiprocess_dir / f"{os.getpid()}-{self._file_id}.json"
+        tmp = path.with_name(f"{path.stem}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(payload))
+        os.replace(tmp, path)
+
+    def _merged(self):
+        merged, gauges = self._local_values()
+        if self.multiprocess_dir is not None:
+            own = f"{os.getpid()}-{self._file_id}.json"
+            for path in self.multiprocess_dir.glob("*.json"):
+                if path.name == own:
+                    continue
+                try:
+                    payload = json.loads(path.read_text())
+                except (OSError, ValueError):
+                    continue
+                for name, labels, value in payload["values"]:
+                    _merge(merged, (name, tuple(labels)), value)
+                for name, labels, value, ts in payload["gauges"]:
+                    key = (name, tuple(labels))
+                    if key not in gauges or gauges[key][1] < ts:
+                        gauges[key] = (value, ts)
+        for key, (value, _) in gauges.items():
+            merged[key] = value
+        return merged
+
+    def collect(self):
+        # [(metric, [(label dict, value or histogram state)])] sorted by name
+        merged = self._merged()
+        by_name = {}
+        for (name, labels), value in merged.items():
+            by_name.setdefault(name, []).append((labels, value))
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        families = []
+        for metric in metrics:
+            samples = sorted(by_name.get(metric.name, []))
+            families.append((metric, [(dict(zip(metric.labelnames, labels)), value) for labels, value in samples]))
+        return families
 
     def export(self):
-        return self.values
+        # Flat JSON view: counters/gauges as values, histograms as count/sum
+        out = {}
+        for metric, samples in self.collect():
+            for labels, value in samples:
+                key = metric.name + ("{" + ",".join(f"{k}={v}" for k, v in labels.items()) + "}" if labels else "")
+                if metric.type == "histogram":
+                    out[key] = {"count": sum(value[:-1]), "sum": value[-1]}
+                else:
+                    out[key] = value
+        return out
+
+
+def _merge(merged, key, value):
+    current = merged.get(key)
+    if current is None:
+        merged[key] = list(value) if isinstance(value, list) else value
+    elif isinstance(value, list):
+        for i, v in enumerate(value):
+            current[i] += v
+    else:
+        merged[key] = current + value
+
+
+_REGISTRIES = weakref.WeakSet()
+
+
+def _after_fork():
+    for registry in list(_REGISTRIES):
+        registry._fork_reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+REGISTRY = MetricsRegistry(os.environ.get("UIN_METRICS_DIR"))
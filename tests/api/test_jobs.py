@@ -0,0 +1,84 @@
+# path: tests/api/test_jobs.py
+import asyncio
+import json
+import cv2
+import numpy as np
+from fastapi.testclient import TestClient
+from uin_ngin.api.jobs import JobQueue, QueueFull
+from uin_ngin.api.server import app
+
+def _png():
+    image = (np.random.default_rng(0).random((64, 64)) * 255).astype(np.uint8)
+    return cv2.imencode(".png", image)[1].tobytes()
+
+def test_queue_rejects_when_full(tmp_path):
+    async def scenario():
+        queue = JobQueue(tmp_path, workers=1, max_queue=1)
+        # Not started: nothing is consumed, so the second submit overflows
+        queue.queue = asyncio.Queue(maxsize=1)
+        await queue.submit(_png(), "a.png")
+        try:
+            await queue.submit(_png(), "b.png")
+        except QueueFull as e:
+            return e.retry_after
+    assert asyncio.run(scenario()) >= 1
+
+def test_full_queue_is_healthy_but_saturated(tmp_path):
+    async def scenario():
+        queue = JobQueue(tmp_path, workers=1, max_queue=1)
+        await queue.start()
+        try:
+            for task in queue._tasks:
+                task.cancel()
+            await queue.submit(_png(), "a.png")
+            return await queue.health()
+        finally:
+            await queue.stop()
+    health = asyncio.run(scenario())
+    assert health["status"] == "ok" and health["saturated"] and health["queued"] == 1
+
+def test_submit_poll_and_fetch():
+    with TestClient(app) as client:
+        health = client.get("/health")
+        assert health.status_code == 200 and health.json()["services"]["extract_jobs"]["status"] == "ok"
+        resp = client.post("/jobs/extract?filename=a.png&edge_format=packbits", content=_png())
+        assert resp.status_code == 202
+        job_id = resp.json()["id"]
+        with client.stream("GET", f"/jobs/{job_id}/events") as events:
+            states = [line for line in events.iter_lines() if line.startswith("data:")]
+        assert '"status": "done"' in states[-1]
+        status = client.get(f"/jobs/{job_id}").json()
+        assert "a_edges.uine" in status["artifacts"]
+        artifact = client.get(f"/jobs/{job_id}/artifacts/a_edges.uine")
+        assert artifact.status_code == 200 and artifact.content[:4] == b"UINE"
+        assert client.get(f"/jobs/{job_id}/artifacts/other.txt").status_code == 404
+
+def test_submit_rejects_bad_requests():
+    with TestClient(app) as client:
+        assert client.post("/jobs/extract?filename=..", content=_png()).status_code == 422
+        assert client.post("/jobs/extract?filename=", content=_png()).status_code == 422
+        resp = client.post("/jobs/extract", content=_png(), headers={"Content-Length": "abc"})
+        assert resp.status_code == 400
+
+def test_full_queue_rejects_before_reading_the_upload(monkeypatch):
+    import uin_ngin.api.server as server
+
+    with TestClient(app) as client:
+        full = asyncio.Queue(maxsize=1)
+        full.put_nowait(None)
+        monkeypatch.setattr(server.jobs, "queue", full)
+        # An oversized body would be refused with 413 if it were read first
+        monkeypatch.setattr(server, "max_upload_bytes", 16)
+        resp = client.post("/jobs/extract?filename=a.png", content=_png())
+        assert resp.status_code == 429 and int(resp.headers["Retry-After"]) >= 1
+
+def test_pipeline_steps_reach_the_api_export():
+    from uin.pipeline.commands import run_command
+    from uin.pipeline.context import PipelineContext
+    from uin.pipeline.hooks import RegistryHook
+
+    raw = json.dumps({"meta": {}, "shapes": []})
+    run_command("normalize", raw, ctx=PipelineContext(hooks=[RegistryHook()]))
+    with TestClient(app) as client:
+        text = client.get("/metrics").text
+    assert 'uin_pipeline_step_seconds_count{step="normalize"}' in text
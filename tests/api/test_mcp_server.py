@@ -0,0 +1,53 @@
+# path: tests/api/test_mcp_server.py
+import asyncio
+import cv2
+import numpy as np
+from api.mcp_server import ExtractionExecutor
+
+def _image(path):
+    image = (np.random.default_rng(0).random((64, 64)) * 255).astype(np.uint8)
+    cv2.imwrite(str(path), image)
+    return path
+
+def test_burst_shares_one_run_and_caches(tmp_path):
+    image = _image(tmp_path / "a.png")
+    out = tmp_path / "out"
+
+    async def scenario():
+        executor = ExtractionExecutor(max_workers=2, max_concurrent=2)
+        events = []
+
+        async def progress(done, total, message):
+            events.append(message)
+
+        try:
+            burst = await asyncio.gather(*(
+                executor.extract(image, out, low_thresh=50, high_thresh=150) for _ in range(10)
+            ))
+            again = await executor.extract(image, out, progress=progress, low_thresh=50, high_thresh=150)
+            other = await executor.extract(image, out, low_thresh=10, high_thresh=20)
+        finally:
+            executor.shutdown()
+        return executor.stats, burst, again, other, events
+
+    stats, burst, again, other, events = asyncio.run(scenario())
+    assert stats["runs"] == 2
+    assert sorted(r["source"] for r in burst).count("run") == 1
+    assert again["source"] == "cache" and events == ["cache"]
+    assert other["source"] == "run"
+    assert again["stats"] == burst[0]["stats"]
+
+def test_overwritten_artifacts_invalidate_cache(tmp_path):
+    image = _image(tmp_path / "a.png")
+    out = tmp_path / "out"
+
+    async def scenario():
+        executor = ExtractionExecutor(max_workers=1)
+        try:
+            await executor.extract(image, out, low_thresh=50, high_thresh=150)
+            await executor.extract(image, out, low_thresh=10, high_thresh=20)
+            return await executor.extract(image, out, low_thresh=50, high_thresh=150)
+        finally:
+            executor.shutdown()
+
+    assert asyncio.run(scenario())["source"] == "run"
@@ -0,0 +1,14 @@
+# path: tests/cli/test_constants.py
+# The CLIs duplicate these constants to avoid heavy imports at startup
+import cli.main
+import uin.cli
+from core.utils.edge_extraction import EDGE_FORMATS
+from uin.pipeline.commands import COMMANDS
+
+
+def test_cli_edge_formats_match_extraction():
+    assert list(cli.main.EDGE_FORMATS) == list(EDGE_FORMATS)
+
+
+def test_uin_cli_commands_match_pipeline():
+    assert tuple(uin.cli.COMMANDS) == tuple(COMMANDS)
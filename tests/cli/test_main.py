@@ -0,0 +1,27 @@
+# path: tests/cli/test_main.py
+import subprocess
+import sys
+
+
+def _extract(*args):
+    return subprocess.run([sys.executable, "-m", "cli.main", "extract", "image.png", *args], capture_output=True, text=True)
+
+
+def test_tile_size_rejects_options_it_cannot_honour():
+    for extra in (["--auto"], ["--sweep", "50:150"], ["--edge-format", "rle"], ["--vectorize", "1.5"], ["--cache-dir", "cache"]):
+        p = _extract("--tile-size", "512", *extra)
+        assert p.returncode == 2, extra
+        assert "--tile-size" in p.stderr and extra[0] in p.stderr
+
+
+def test_malformed_sweep_items_are_usage_errors():
+    for sweep in ("100", "a:b", "1:2:3", "200:100", "50:150,x"):
+        p = _extract("--sweep", sweep)
+        assert p.returncode == 2, sweep
+        assert "Threshold-Paar" in p.stderr and "Traceback" not in p.stderr
+
+
+def test_sweep_items_parse_pairs_and_auto():
+    from cli.main import _sweep_items
+
+    assert _sweep_items(" 50:150, auto,100:200 ") == [(50, 150), "auto", (100, 200)]
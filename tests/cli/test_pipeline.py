@@ -30,3 +30,88 @@ def test_cli_normalize(tmp_path):
     assert p.returncode == 0
     out = json.loads(p.stdout)
     assert out["shapes"][0]["id"] == "x"
+
+
+def test_cli_ndjson_stream(tmp_path):
+    shape = {"id": "x", "type": "rect", "x": 0, "y": 0, "width": 1, "height": 1,
+             "color": {"r": 0, "g": 0, "b": 0, "a": 1.0}}
+    lines = [
+        json.dumps({"meta": {}, "shapes": [shape]}),
+        json.dumps({"meta": {}, "shapes": [shape, shape]}),
+        "not json",
+        json.dumps({"meta": {}, "shapes": [dict(shape, id="y")]}),
+    ]
+
+    for jobs in ("1", "2"):
+        p = subprocess.run(
+            [sys.executable, "-m", "uin.cli", "normalize", "--ndjson", "-j", jobs],
+            input="\n".join(lines) + "\n",
+            text=True,
+            capture_output=True,
+        )
+
+        assert p.returncode == 0
+        out = [json.loads(line) for line in p.stdout.splitlines()]
+        assert len(out) == 4
+        assert out[0]["shapes"][0]["id"] == "x"
+        assert out[1]["line"] == 2 and out[1]["type"] == "NormalizationError"
+        assert out[2]["line"] == 3
+        assert out[3]["shapes"][0]["id"] == "y"
+
+
+def test_step_metrics_and_profile():
+    from metrics.registry import MetricsRegistry
+    from metrics.prometheus import export_prometheus
+    from uin.pipeline.commands import run_command
+    from uin.pipeline.context import PipelineContext
+    from uin.pipeline.hooks import RegistryHook
+
+    shape = {"id": "x", "type": "rect", "x": 0, "y": 0, "width": 1, "height": 1,
+             "color": {"r": 0, "g": 0, "b": 0, "a": 1.0}}
+    raw = json.dumps({"meta": {}, "shapes": [shape]})
+    registry = MetricsRegistry()
+    ctx = PipelineContext(hooks=[RegistryHook(registry)], trace_memory=True)
+    result = run_command("normalize", raw, ctx=ctx)
+
+    steps = ctx.metrics["steps"]
+    assert list(steps) == ["import", "normalize", "export"]
+    assert steps["import"]["bytes_in"] == len(raw)
+    assert steps["export"]["bytes_out"] == len(result)
+    assert all(r["shapes"] == 1 and r["peak_bytes"] > 0 for r in steps.values())
+    text = export_prometheus(registry)
+    assert 'uin_pipeline_step_seconds_count{step="normalize"} 1' in text
+    assert f'uin_pipeline_bytes_total{{step="import",direction="in"}} {float(len(raw))}' in text
+
+    p = subprocess.run(
+        [sys.executable, "-m", "uin.cli", "validate", "--profile"],
+        input=raw,
+        text=True,
+        capture_output=True,
+    )
+    assert p.returncode == 0
+    assert json.loads(p.stdout) == json.loads(raw)
+    assert "validate" in p.stderr and "total" in p.stderr
+
+
+def test_step_sizes_count_utf8_bytes_of_text_streams():
+    import io
+    from uin.pipeline.context import PipelineContext
+    from uin.pipeline.steps import step_export, step_import_stream
+
+    shape = {"id": "größe-✓", "type": "rect", "x": 0, "y": 0, "width": 1, "height": 1,
+             "color": {"r": 0, "g": 0, "b": 0, "a": 1.0}}
+    raw = json.dumps({"meta": {"title": "Übersicht"}, "shapes": [shape]}, ensure_ascii=False)
+    ctx = step_import_stream(PipelineContext(), io.StringIO(raw))
+    out = io.StringIO()
+    step_export(ctx, out)
+
+    steps = ctx.metrics["steps"]
+    assert steps["import"]["bytes_in"] == len(raw.encode("utf-8"))
+    assert steps["export"]["bytes_out"] == len(out.getvalue().encode("utf-8"))
+
+
+def test_text_writes_report_encoded_size():
+    import io
+    from uin.core.serialize import _write
+
+    assert _write(io.StringIO(), "Übersicht ✓", binary=False) == len("Übersicht ✓".encode("utf-8"))
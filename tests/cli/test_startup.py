@@ -0,0 +1,21 @@
+# path: tests/cli/test_startup.py
+import os
+import pytest
+from benchmark.startup import run_startup_benchmark
+
+
+def test_startup_avoids_heavy_imports():
+    results = run_startup_benchmark(budget_scale=5.0)
+    for name, r in results.items():
+        assert r["returncode"] == 0, name
+        assert r["forbidden_loaded"] == [], name
+
+
+# Wall-clock budgets are flaky on loaded CI machines; they run only on request
+# (UIN_TIMING_TESTS=1) and are enforced in releases by `python -m benchmark.startup`.
+@pytest.mark.timing
+@pytest.mark.skipif(not os.environ.get("UIN_TIMING_TESTS"), reason="set UIN_TIMING_TESTS=1 to check startup budgets")
+def test_startup_budgets():
+    results = run_startup_benchmark(budget_scale=5.0)
+    for name, r in results.items():
+        assert r["ok"], name
@@ -0,0 +1,9 @@
+# path: tests/conftest.py
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _plugin_cache(tmp_path, monkeypatch):
+    # PluginManager.discover() writes its plugin index to ~/.cache/uin by
+    # default; tests must neither touch the real home nor reuse its state
+    monkeypatch.setenv("UIN_PLUGIN_CACHE", str(tmp_path / "plugin-cache"))
@@ -0,0 +1,46 @@
+# path: tests/core/test_columnar.py
+import pytest
+from uin.core.schema import UINDocument, Shape, Color
+from uin.core.serialize import serialize
+from uin.core.columnar import ColumnarDocument, normalize, validate
+from uin.core.errors import ValidationError, NormalizationError
+
+
+def _doc():
+    return UINDocument(
+        meta={},
+        shapes=[
+            Shape(id="a", type="rect", x=0, y=0, width=10, height=5, color=Color(r=1, g=2, b=3)),
+            Shape(id="b", type="circle", x=1, y=2, radius=3, color=Color(r=4, g=5, b=6, a=0.5)),
+            Shape(id="c", type="polygon", x=0, y=0, points=[(0, 0), (2, 0), (1, 2)], color=Color(r=0, g=0, b=0)),
+        ],
+    )
+
+
+def test_columnar_roundtrip():
+    doc = _doc()
+    cdoc = ColumnarDocument.from_document(doc)
+    validate(normalize(cdoc))
+    assert serialize(cdoc.to_document()) == serialize(doc)
+
+
+def test_columnar_vectorized_checks():
+    data = _doc().model_dump(mode="json")
+    data["shapes"][1]["id"] = "a"
+    with pytest.raises(NormalizationError):
+        normalize(ColumnarDocument.from_dict(data))
+
+    data = _doc().model_dump(mode="json")
+    data["shapes"][2]["color"]["a"] = 1.5
+    with pytest.raises(ValidationError, match="index 2"):
+        validate(ColumnarDocument.from_dict(data))
+
+
+def test_to_document_rejects_invalid_type_codes():
+    for code in (-1, 99):
+        cdoc = ColumnarDocument.from_document(_doc())
+        cdoc.types[1] = code
+        with pytest.raises(ValueError, match="index 1"):
+            cdoc.to_document()
+        with pytest.raises(ValidationError, match="index 1"):
+            validate(cdoc)
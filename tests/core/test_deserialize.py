@@ -0,0 +1,54 @@
+# path: tests/core/test_deserialize.py
+import io
+import json
+import pytest
+from uin.core.schema import UINDocument, Shape, Color
+from uin.core.serialize import serialize
+from uin.core.deserialize import iter_shapes, load_document
+from uin.core.errors import ValidationError
+
+
+def _doc(n):
+    return UINDocument(
+        meta={"compatibility": "compatible"},
+        shapes=[
+            Shape(id=f"s{i}", type="rect", x=i, y=0.5, width=1e-3, height=12345678901, color=Color(r=i % 256, g=1, b=2))
+            for i in range(n)
+        ],
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_incremental_import_matches_model_validate(chunk_size):
+    doc = _doc(300)
+    raw = serialize(doc).replace('"id": "s1"', '"id": "s\\u00fc1"').encode("utf-8")
+
+    loaded = load_document(io.BytesIO(raw), chunk_size=chunk_size)
+    assert serialize(loaded) == serialize(UINDocument.model_validate(json.loads(raw)))
+
+
+def test_incremental_import_fails_fast_with_index():
+    data = _doc(5).model_dump(mode="json")
+    data["shapes"][3]["color"]["r"] = 999
+    stream = io.BytesIO(json.dumps(data).encode("utf-8"))
+
+    seen = []
+    with pytest.raises(ValidationError, match="index 3"):
+        for shape in iter_shapes(stream, chunk_size=16):
+            seen.append(shape.id)
+    assert seen == ["s0", "s1", "s2"]
+
+
+def test_incremental_import_rejects_malformed_json():
+    with pytest.raises(ValidationError, match="Malformed JSON"):
+        load_document(io.BytesIO(b'{"meta": {}, "shapes": [{"id": '))
+    with pytest.raises(ValidationError, match="no shapes"):
+        load_document(io.StringIO('{"meta": {}}'))
+    assert load_document(io.StringIO('{"shapes": [], "meta": {}}')).shapes == []
+
+
+def test_numbers_split_at_every_chunk_boundary():
+    raw = b'{"meta": {}, "version": 1.5, "extra": [-2.5e3, 7], "shapes": [{"id": "a", "type": "rect", "x": 10.25, "y": -3, "width": 1e2, "height": 2, "color": {"r": 1, "g": 2, "b": 3}}]}'
+    expected = serialize(UINDocument.model_validate(json.loads(raw)))
+    for chunk_size in range(1, len(raw) + 1):
+        assert serialize(load_document(io.BytesIO(raw), chunk_size=chunk_size)) == expected, chunk_size
@@ -0,0 +1,39 @@
+# path: tests/core/test_raster.py
+import io
+import numpy as np
+from PIL import Image
+from uin.core.schema import UINDocument, Shape, Color
+from uin.core.raster import render, render_many
+from uin.plugins.sample_plugins.png_exporter import PNGExporter
+
+
+def _doc():
+    return UINDocument(meta={}, shapes=[
+        Shape(id="r", type="rect", x=0, y=0, width=5, height=10, color=Color(r=255, g=0, b=0)),
+        Shape(id="c", type="circle", x=5, y=5, radius=3, color=Color(r=0, g=0, b=255, a=0.5)),
+        Shape(id="p", type="polygon", x=6, y=0, points=[(6, 0), (10, 0), (10, 4)], color=Color(r=0, g=255, b=0)),
+    ])
+
+
+def test_fills_and_compositing():
+    img = render(_doc(), 10, viewport=(0, 0, 10, 10))
+    assert img.shape == (10, 10, 4)
+    # Opaque rect, then half-transparent blue circle over it and over nothing
+    assert img[5, 0].tolist() == [255, 0, 0, 255]
+    assert img[5, 3].tolist() == [128, 0, 128, 255]
+    assert img[5, 6].tolist() == [0, 0, 255, 128]
+    # Triangle below the diagonal from (6, 0) to (10, 4)
+    assert img[0, 9].tolist() == [0, 255, 0, 255]
+    assert img[3, 8, 3] == 0
+    # y_up flips rows
+    assert np.array_equal(render(_doc(), 10, viewport=(0, 0, 10, 10), y_up=True), img[::-1])
+
+
+def test_png_exporter_and_batch():
+    doc = _doc()
+    png = PNGExporter(width=40, viewport=(0, 0, 10, 10)).export(doc)
+    decoded = np.array(Image.open(io.BytesIO(png)))
+    assert np.array_equal(decoded, render(doc, 40, viewport=(0, 0, 10, 10)))
+    serial = render_many([doc, doc], 16)
+    parallel = render_many([doc, doc], 16, workers=2)
+    assert all(np.array_equal(a, b) for a, b in zip(serial, parallel))
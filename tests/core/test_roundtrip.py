@@ -23,3 +23,44 @@ def test_roundtrip_deterministic():
     s1 = serialize(normalize(doc))
     s2 = serialize(normalize(doc))
     assert s1 == s2
+
+
+def test_streaming_serializer_matches_serialize():
+    import io
+    from uin.core.serialize import serialize_to
+    from uin.plugins.sample_plugins.simple_exporter import SimpleJSONExporter
+
+    doc = UINDocument(
+        meta={"compatibility": "lossy"},
+        shapes=[
+            Shape(id=f"s{i}", type="polygon", x=i, y=-i, points=[(0, 0), (i, 1.5)], color=Color(r=i % 256, g=0, b=255, a=0.25))
+            for i in range(2000)
+        ] + [Shape(id="ü", type="circle", x=0.1, y=0, radius=2, color=Color(r=0, g=0, b=0))],
+    )
+
+    text = io.StringIO()
+    serialize_to(doc, text)
+    assert text.getvalue() == serialize(doc)
+
+    binary = io.BytesIO()
+    SimpleJSONExporter().export_to(doc, binary)
+    assert binary.getvalue() == SimpleJSONExporter().export(doc)
+
+    empty = UINDocument(meta={}, shapes=[])
+    out = io.StringIO()
+    serialize_to(empty, out)
+    assert out.getvalue() == serialize(empty)
+
+
+def test_canonical_bytes_without_polygons_are_stable():
+    # Canonical output of a rect/circle document from before polygon support
+    baseline = (
+        '{"meta": {"compatibility": "strict", "schema": "' + UINDocument(meta={}, shapes=[]).meta.schema + '"}, '
+        '"shapes": [{"color": {"a": 1.0, "b": 0, "g": 0, "r": 0}, "height": 10.0, "id": "a", "radius": null, '
+        '"type": "rect", "width": 10.0, "x": 0.0, "y": 0.0}, '
+        '{"color": {"a": 0.5, "b": 3, "g": 2, "r": 1}, "height": null, "id": "c", "radius": 2.0, '
+        '"type": "circle", "width": null, "x": 1.0, "y": 1.0}]}'
+    )
+    doc = UINDocument.model_validate_json(baseline)
+    assert serialize(doc) == baseline
+    assert serialize(UINDocument.model_validate_json(serialize(doc))) == baseline
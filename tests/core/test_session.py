@@ -0,0 +1,68 @@
+# path: tests/core/test_session.py
+import pytest
+from uin.core.schema import UINDocument, Shape, Color
+from uin.core.serialize import serialize
+from uin.core.session import DocumentSession, document_digest
+from uin.core.errors import ValidationError, NormalizationError
+from uin.pipeline.context import PipelineContext
+from uin.pipeline.steps import step_import, step_open_session, step_patch, step_export
+
+
+def _doc(n=600):
+    return UINDocument(meta={}, shapes=[
+        Shape(id=f"s{i}", type="rect", x=i, y=0, width=1, height=1, color=Color(r=i % 256, g=0, b=0))
+        for i in range(n)
+    ])
+
+
+def _circle(sid):
+    return {"id": sid, "type": "circle", "x": 1, "y": 2, "radius": 3, "color": {"r": 1, "g": 2, "b": 3}}
+
+
+def test_patches_match_full_recompute():
+    session = DocumentSession(_doc())
+    session.apply([
+        {"op": "update", "id": "s10", "changes": {"x": -5, "color": {"r": 9, "g": 9, "b": 9}}},
+        {"op": "remove", "id": "s300"},
+        {"op": "add", "shape": _circle("new")},
+    ])
+    doc = session.to_document()
+    assert [s.id for s in doc.shapes][-1] == "new"
+    assert doc.shapes[10].x == -5
+    assert "s300" not in session
+    assert session.serialize() == serialize(doc)
+    assert session.digest() == document_digest(doc)
+    assert session.digest() == DocumentSession(doc).digest()
+
+
+def test_failed_patch_is_rolled_back():
+    session = DocumentSession(_doc())
+    before = (session.serialize(), session.digest())
+    with pytest.raises(NormalizationError):
+        session.apply([
+            {"op": "remove", "id": "s5"},
+            {"op": "update", "id": "s6", "changes": {"x": 100}},
+            {"op": "add", "shape": _circle("s7")},
+        ])
+    assert (session.serialize(), session.digest()) == before
+    with pytest.raises(ValidationError):
+        session.apply([{"op": "update", "id": "s1", "changes": {"color": {"r": 999, "g": 0, "b": 0}}}])
+    with pytest.raises(ValidationError):
+        session.apply([{"op": "remove", "id": "missing"}])
+    assert (session.serialize(), session.digest()) == before
+
+
+def test_pipeline_session_steps():
+    ctx = step_open_session(PipelineContext(_doc(3)))
+    step_patch(ctx, [{"op": "update", "id": "s0", "changes": {"y": 7}}])
+    assert ctx.doc.shapes[0].y == 7
+    assert step_export(ctx) == serialize(ctx.doc)
+
+
+def test_reimport_after_session_replaces_it():
+    ctx = step_import(PipelineContext(), serialize(_doc(2)))
+    step_open_session(ctx)
+    step_patch(ctx, [{"op": "remove", "id": "s0"}])
+    step_import(ctx, serialize(_doc(5)))
+    assert ctx.session is None
+    assert step_export(ctx) == serialize(_doc(5))
@@ -0,0 +1,66 @@
+# path: tests/core/test_spatial.py
+import random
+from uin.core.schema import UINDocument, Shape, Color
+from uin.core.spatial import SpatialIndex, shape_bbox, bbox_intersects, bbox_overlaps, bbox_distance
+from uin.plugins.sample_plugins.overlap_analyzer import OverlapAnalyzer
+
+
+def _random_shapes(n, seed=0):
+    rng = random.Random(seed)
+    black = Color(r=0, g=0, b=0)
+    shapes = []
+    for i in range(n):
+        x, y = rng.uniform(0, 100), rng.uniform(0, 100)
+        kind = i % 3
+        if kind == 0:
+            shapes.append(Shape(id=f"s{i}", type="rect", x=x, y=y, width=rng.uniform(0, 8), height=rng.uniform(0, 8), color=black))
+        elif kind == 1:
+            shapes.append(Shape(id=f"s{i}", type="circle", x=x, y=y, radius=rng.uniform(0, 4), color=black))
+        else:
+            pts = [(x + rng.uniform(-3, 3), y + rng.uniform(-3, 3)) for _ in range(4)]
+            shapes.append(Shape(id=f"s{i}", type="polygon", x=x, y=y, points=pts, color=black))
+    # One shape spanning the whole scene exercises the oversized list
+    shapes.append(Shape(id="background", type="rect", x=-10, y=-10, width=120, height=120, color=black))
+    return shapes
+
+
+def test_index_matches_brute_force():
+    shapes = _random_shapes(300)
+    boxes = {s.id: shape_bbox(s) for s in shapes}
+    index = SpatialIndex.from_shapes(shapes)
+
+    query = (20, 30, 45, 50)
+    assert sorted(index.query(query)) == sorted(sid for sid, b in boxes.items() if bbox_intersects(b, query))
+
+    expected = sorted((a, b) for a in boxes for b in boxes if a < b and bbox_overlaps(boxes[a], boxes[b]))
+    assert sorted(index.overlaps()) == expected
+
+    for x, y in [(50, 50), (-40, 200), (99, 1)]:
+        brute = sorted(bbox_distance(b, x, y) for b in boxes.values())[:5]
+        assert [d for d, _ in index.nearest(x, y, k=5)] == brute
+
+
+def test_incremental_insert_remove():
+    shapes = _random_shapes(60, seed=1)
+    index = SpatialIndex.from_shapes(shapes)
+    for s in shapes[::2]:
+        index.remove(s.id)
+    rebuilt = SpatialIndex(index.cell_size)
+    for s in shapes[1::2]:
+        rebuilt.insert(s)
+    assert len(index) == len(rebuilt)
+    assert sorted(index.overlaps()) == sorted(rebuilt.overlaps())
+    assert sorted(index.query((0, 0, 50, 50))) == sorted(rebuilt.query((0, 0, 50, 50)))
+
+
+def test_overlap_analyzer_refines_circles():
+    black = Color(r=0, g=0, b=0)
+    doc = UINDocument(meta={}, shapes=[
+        Shape(id="a", type="circle", x=0, y=0, radius=1, color=black),
+        # bboxes overlap in the corner, circles do not
+        Shape(id="b", type="circle", x=1.8, y=1.8, radius=1, color=black),
+        Shape(id="c", type="rect", x=0.5, y=-0.5, width=1, height=1, color=black),
+    ])
+    result = OverlapAnalyzer().analyze(doc)
+    assert result["overlaps"] == [["a", "c"]]
+    assert result["occluded"] == ["a"]
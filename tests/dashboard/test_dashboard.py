@@ -14,3 +14,29 @@ def test_record_metric():
     assert resp.status_code == 200
     resp2 = client.get("/metrics")
     assert "test_metric" in resp2.json()
+
+def test_metric_range():
+    client.post("/record/range_metric?value=2")
+    client.post("/record/range_metric?value=4")
+    resp = client.get("/metrics/range/range_metric?resolution=1m")
+    assert resp.status_code == 200
+    points = resp.json()["points"]
+    assert sum(p["count"] for p in points) == 2 and max(p["max"] for p in points) == 4
+    assert "range_metric" in client.get("/metrics/series").json()["series"]
+    assert client.get("/metrics/range/nope").status_code == 404
+    assert client.get("/metrics/range/range_metric?resolution=5m").status_code == 400
+
+def test_record_rejects_non_finite():
+    assert client.post("/record/bad_metric?value=nan").status_code == 422
+    assert "bad_metric" not in client.get("/metrics").json()
+
+def test_record_requires_numeric_value():
+    assert client.post("/record/x").status_code == 422
+    assert client.post("/record/x", content=b"not json").status_code == 422
+    assert client.post("/record/x", json={"value": 1}).status_code == 422
+    assert client.post("/record/x", json="abc").status_code == 422
+
+def test_range_rejects_infinite_bounds():
+    client.post("/record/bounded_metric?value=1")
+    assert client.get("/metrics/range/bounded_metric?start=-inf").status_code == 422
+    assert client.get("/metrics/range/bounded_metric?end=inf").status_code == 422
@@ -0,0 +1,72 @@
+# path: tests/dashboard/test_timeseries.py
+import asyncio
+import math
+import threading
+import pytest
+from uin.dashboard.timeseries import TimeSeriesStore
+
+class Clock:
+    now = 10_000.0
+    def __call__(self):
+        return self.now
+
+def test_rollups_and_retention():
+    clock = Clock()
+    store = TimeSeriesStore(levels=((1, 60), (60, 10)), clock=clock)
+    for i in range(180):
+        store.record("lat", i, ts=clock.now - 179 + i)
+    fine = store.query("lat", clock.now - 300, clock.now, step=1)
+    # Only the last 60 seconds survive at 1 s resolution
+    assert len(fine["points"]) == 60 and fine["points"][0]["t"] == clock.now - 59
+    coarse = store.query("lat", clock.now - 300, clock.now, step=60)
+    assert sum(p["count"] for p in coarse["points"]) == 180
+    assert coarse["points"][-1]["max"] == 179
+    # Automatic resolution falls back to the level that covers the range
+    assert store.query("lat", clock.now - 300, clock.now)["step"] == 60
+    assert store.query("missing") is None
+
+def test_max_series_is_enforced():
+    store = TimeSeriesStore(max_series=2)
+    assert store.record("a", 1) and store.record("b", 1)
+    assert not store.record("c", 1)
+    assert store.names() == ["a", "b"] and store.dropped == 1
+
+def test_stream_pushes_points_from_other_threads():
+    store = TimeSeriesStore()
+    store.record("a", 1.0)
+
+    async def scenario():
+        stream = store.stream(["a"])
+        snapshot = await stream.__anext__()
+        worker = threading.Thread(target=lambda: (store.record("b", 2.0), store.record("a", 3.0)))
+        worker.start()
+        pushed = await asyncio.wait_for(stream.__anext__(), 1)
+        worker.join()
+        await stream.aclose()
+        return snapshot, pushed
+
+    snapshot, pushed = asyncio.run(scenario())
+    assert snapshot["value"] == 1.0 and pushed["name"] == "a" and pushed["value"] == 3.0
+    assert not store._subscribers
+
+def test_series_memory_is_allocated_lazily():
+    store = TimeSeriesStore()
+    store.record("once", 1.0, ts=1_000_000.0)
+    assert sum(len(level.pages) for level in store.series["once"]) == 3
+
+def test_non_finite_values_are_rejected():
+    store = TimeSeriesStore()
+    for bad in (math.nan, math.inf, -math.inf):
+        with pytest.raises(ValueError):
+            store.record("x", bad)
+    assert store.names() == []
+
+def test_monitor_applies_the_series_cap():
+    from metrics.registry import MetricsRegistry
+    from uin.dashboard.monitor import DashboardMonitor
+    registry = MetricsRegistry()
+    monitor = DashboardMonitor(registry, TimeSeriesStore(max_series=2))
+    assert all(monitor.record_metric(name, 1) for name in ("a", "b", "a"))
+    assert not monitor.record_metric("c", 1)
+    assert list(monitor.get_metrics()) == ["a", "b"]
+    assert set(registry.export()) == {"uin_dashboard_metric{name=a}", "uin_dashboard_metric{name=b}"}
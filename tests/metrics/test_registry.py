@@ -0,0 +1,101 @@
+# path: tests/metrics/test_registry.py
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from metrics.registry import MetricsRegistry
+from metrics.prometheus import export_prometheus
+
+
+def test_threaded_updates_and_exposition():
+    registry = MetricsRegistry()
+    requests = registry.counter("uin_requests_total", "Handled requests", ("stage",))
+    latency = registry.histogram("uin_stage_seconds", "Stage latency", ("stage",), buckets=(0.1, 1.0))
+    registry.gauge("uin_queue_depth", 'Queue "depth"').set(3)
+
+    def work():
+        for i in range(1000):
+            requests.inc(stage="import")
+            latency.observe(0.05 if i % 2 else 0.5, stage="import")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    text = export_prometheus(registry)
+    assert '# HELP uin_queue_depth Queue "depth"' in text
+    assert "# HELP uin_requests_total Handled requests" in text
+    assert "# TYPE uin_requests_total counter" in text
+    assert 'uin_requests_total{stage="import"} 8000.0' in text
+    assert "# TYPE uin_stage_seconds histogram" in text
+    assert 'uin_stage_seconds_bucket{stage="import",le="0.1"} 4000' in text
+    assert 'uin_stage_seconds_bucket{stage="import",le="+Inf"} 8000' in text
+    assert 'uin_stage_seconds_count{stage="import"} 8000' in text
+    assert "uin_queue_depth 3.0" in text
+    assert 0.1 < latency.quantile(0.75, stage="import") <= 1.0
+
+
+def _worker(path):
+    registry = MetricsRegistry(path)
+    counter = registry.counter("uin_jobs_total", "Jobs", ("kind",))
+    for _ in range(50):
+        counter.inc(kind="extract")
+    registry.flush()
+
+
+def test_values_are_merged_across_processes(tmp_path):
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        list(pool.map(_worker, [tmp_path] * 4))
+    registry = MetricsRegistry(tmp_path)
+    registry.counter("uin_jobs_total", "Jobs", ("kind",)).inc(kind="extract")
+    assert registry.export() == {"uin_jobs_total{kind=extract}": 201.0}
+
+
+def test_concurrent_flushes_never_raise(tmp_path):
+    registry = MetricsRegistry(tmp_path, flush_interval=0)
+    counter = registry.counter("uin_hits_total")
+    errors = []
+
+    def work():
+        try:
+            for _ in range(2000):
+                counter.inc()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    registry.flush()
+    assert errors == []
+    assert registry.export() == {"uin_hits_total": 16000.0}
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_setting_only_a_gauge_does_not_rereport_parent(tmp_path):
+    registry = MetricsRegistry(tmp_path)
+    jobs = registry.counter("uin_jobs_total")
+    depth = registry.gauge("uin_queue_depth")
+    jobs.inc(5)
+    registry.flush()
+
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            depth.set(1)
+            registry.flush()
+            code = 0
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+    assert registry.export() == {"uin_jobs_total": 5.0, "uin_queue_depth": 1.0}
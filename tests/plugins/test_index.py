@@ -0,0 +1,94 @@
+# path: tests/plugins/test_index.py
+import os
+import sys
+from uin.plugins.index import PluginIndex, scan_source
+from uin.plugins.manager import PluginManager
+
+PLUGIN = '''
+from abc import abstractmethod
+from uin.plugins.interfaces import Analyzer
+import uin.plugins.interfaces as interfaces
+
+class CountAnalyzer(Analyzer):
+    def analyze(self, doc):
+        return {"count": len(doc.shapes)}
+
+class BaseThing(interfaces.Exporter):
+    pass
+
+class BaselineAnalyzer(Analyzer):
+    def analyze(self, doc):
+        return {}
+
+class _PartialExporter(interfaces.Exporter):
+    def export(self, doc):
+        return b""
+
+class StreamingBase(Analyzer):
+    @abstractmethod
+    def analyze_chunk(self, docs):
+        pass
+
+    def analyze(self, doc):
+        return self.analyze_chunk([doc])[0]
+
+class DerivedCount(CountAnalyzer):
+    pass
+
+class Unrelated:
+    pass
+'''
+
+def _package(tmp_path, monkeypatch, name):
+    pkg = tmp_path / name
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "count.py").write_text(PLUGIN)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return pkg
+
+def test_scan_source():
+    found = {(p["name"], p["kind"]) for p in scan_source(PLUGIN)}
+    assert found == {
+        ("CountAnalyzer", "analyzer"),
+        ("DerivedCount", "analyzer"),
+        ("BaselineAnalyzer", "analyzer"),
+        ("_PartialExporter", "exporter"),
+    }
+
+def test_discovery_imports_on_first_use(tmp_path, monkeypatch):
+    _package(tmp_path, monkeypatch, "lazy_plugins_a")
+    pm = PluginManager()
+    pm.discover("lazy_plugins_a", entry_points=False)
+    assert "CountAnalyzer" in pm.analyzers and "DerivedCount" in pm.analyzers
+    assert "lazy_plugins_a.count" not in sys.modules
+    assert pm.get_analyzer("CountAnalyzer")().analyze(type("D", (), {"shapes": [1, 2]})()) == {"count": 2}
+    assert "lazy_plugins_a.count" in sys.modules
+
+def test_index_is_cached_and_invalidated(tmp_path, monkeypatch):
+    pkg = _package(tmp_path, monkeypatch, "lazy_plugins_b")
+    assert PluginIndex("lazy_plugins_b").refresh().rescanned == ["lazy_plugins_b.count"]
+    assert PluginIndex("lazy_plugins_b").refresh().rescanned == []
+
+    (pkg / "count.py").write_text(PLUGIN.replace("DerivedCount", "RenamedCount"))
+    st = (pkg / "count.py").stat()
+    os.utime(pkg / "count.py", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    (pkg / "extra.py").write_text("from uin.plugins.interfaces import Importer\nclass ExtraImporter(Importer):\n    def import_data(self, source): pass\n")
+    index = PluginIndex("lazy_plugins_b").refresh()
+    assert sorted(index.rescanned) == ["lazy_plugins_b.count", "lazy_plugins_b.extra"]
+    names = {p["name"] for p in index.plugins()}
+    assert "RenamedCount" in names and "DerivedCount" not in names and "ExtraImporter" in names
+
+
+def test_tests_never_write_the_home_cache(tmp_path):
+    from uin.plugins.index import _default_cache_path
+    assert _default_cache_path(tmp_path).is_relative_to(tmp_path)
+
+
+def test_lazy_and_eager_discovery_agree(tmp_path, monkeypatch):
+    _package(tmp_path, monkeypatch, "lazy_plugins_c")
+    lazy, eager = PluginManager(), PluginManager()
+    lazy.discover("lazy_plugins_c", entry_points=False)
+    eager.discover("lazy_plugins_c", lazy=False)
+    for kind in ("importers", "exporters", "analyzers"):
+        assert sorted(getattr(lazy, kind)) == sorted(getattr(eager, kind))
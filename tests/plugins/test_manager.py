@@ -20,3 +20,30 @@ def test_plugin_discovery():
     raw = exporter.export(doc)
     imported_doc = importer_cls().import_data(raw)
     assert imported_doc.shapes[0].id == "x"
+
+def _doc(i):
+    return UINDocument(
+        meta={},
+        shapes=[
+            Shape(id=f"a{i}", type="rect", x=0, y=0, width=10, height=10, color=Color(r=0, g=0, b=0)),
+            Shape(id=f"b{i}", type="rect", x=5 + i, y=5, width=10, height=10, color=Color(r=0, g=0, b=0)),
+        ],
+    )
+
+def test_stream_adapters():
+    pm = PluginManager()
+    pm.discover()
+    docs = [_doc(i) for i in range(3)]
+    raw = list(pm.get_exporter("SimpleJSONExporter")().export_stream(docs))
+    back = list(pm.get_importer("SimpleJSONImporter")().import_stream(raw))
+    assert [d.shapes[1].id for d in back] == ["b0", "b1", "b2"]
+
+def test_run_analyzers_merges_in_order():
+    pm = PluginManager()
+    pm.discover()
+    docs = [_doc(i) for i in range(12)]
+    serial = list(pm.run_analyzers(["OverlapAnalyzer"], docs, chunk_size=5))
+    parallel = list(pm.run_analyzers(["OverlapAnalyzer"], iter(docs), workers=2, chunk_size=5,
+                                     options={"OverlapAnalyzer": {"cell_size": 4.0}}))
+    assert serial == parallel
+    assert [r["OverlapAnalyzer"]["overlap_count"] for r in serial] == [1] * 5 + [0] * 7
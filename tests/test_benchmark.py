@@ -1,6 +1,28 @@
 # path: tests/test_benchmark.py
 from uin_ngin.benchmark.runner import run_benchmark
+from uin_ngin.benchmark.suite import BenchmarkSuite, compare, load_baseline, save_baseline
 
 def test_benchmark():
     r = run_benchmark(lambda: sum(range(1000)))
     assert r["duration"] >= 0
+
+def test_suite_statistics_and_baseline(tmp_path):
+    calls = []
+    suite = BenchmarkSuite(warmup=2, repeat=5, track_memory=True)
+    suite.add("sum", lambda n: calls.append(sum(range(n))), setup=lambda: 10000, items=10000)
+    results = suite.run_all()
+    r = results["sum"]
+    # 2 Aufwärmläufe + 5 Messungen + 1 Speicherlauf
+    assert len(calls) == 8
+    assert r["runs"] == 5
+    assert r["min"] <= r["median"] <= r["p95"]
+    assert r["duration"] == r["median"]
+    assert r["items_per_s"] > 0
+    assert r["peak_memory_bytes"] >= 0
+
+    save_baseline(tmp_path / "baseline.json", results)
+    baseline = load_baseline(tmp_path / "baseline.json")
+    assert compare(results, baseline, tolerance=0.1) == []
+    slower = {"sum": dict(r, median=r["median"] * 2)}
+    regressions = compare(slower, baseline, tolerance=0.1)
+    assert [(x["name"], x["metric"]) for x in regressions] == [("sum", "median")]
@@ -0,0 +1,158 @@
+# path: tests/utils/test_edge_extraction.py
+import json
+import cv2
+import numpy as np
+from core.utils.edge_extraction import (
+    batch_process_directory,
+    create_uin_package,
+    extract_canny_edges,
+    extract_canny_edges_tiled,
+    sweep_canny_thresholds,
+)
+from core.utils.edge_format import load_edge_map
+from core.utils.extraction_cache import ExtractionCache
+
+
+def _write_image(path, seed=0):
+    rng = np.random.default_rng(seed)
+    img = np.zeros((64, 96, 3), dtype=np.uint8)
+    cv2.rectangle(img, (10, 10), (50, 40), (255, 255, 255), -1)
+    img += rng.integers(0, 20, img.shape, dtype=np.uint8)
+    cv2.imwrite(str(path), img)
+
+
+def test_batch_parallel_matches_serial(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(4):
+        _write_image(src / f"img{i}.png", seed=i)
+    (src / "broken.png").write_bytes(b"not an image")
+
+    serial = batch_process_directory(src, tmp_path / "serial")
+    parallel = batch_process_directory(src, tmp_path / "parallel", workers=2, max_in_flight=2)
+
+    assert serial["successful"] == parallel["successful"] == 4
+    assert serial["failed"] == parallel["failed"] == 1
+    by_name = lambda s: {r["uin_json"].split("/")[-1]: r["stats"] for r in s["results"] if "stats" in r}
+    assert by_name(serial) == by_name(parallel)
+
+    on_disk = json.loads((tmp_path / "parallel" / "processing_summary.json").read_text())
+    assert on_disk["total_processed"] == 5
+
+
+def test_batch_cache_skips_unchanged_images(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(3):
+        _write_image(src / f"img{i}.png", seed=i)
+    cache = ExtractionCache(tmp_path / "cache")
+
+    first = batch_process_directory(src, tmp_path / "run1", cache=cache)
+    _write_image(src / "img0.png", seed=42)
+    second = batch_process_directory(src, tmp_path / "run2", cache=cache)
+
+    assert first["cache"] == {"hits": 0, "misses": 3}
+    assert second["cache"] == {"hits": 2, "misses": 1}
+    restored = json.loads((tmp_path / "run2" / "img1" / "img1_attributes.uin.json").read_text())
+    assert restored["metadata"]["source_image"] == str(src / "img1.png")
+    assert (tmp_path / "run2" / "img1" / "img1_edges.png").exists()
+
+
+def test_create_uin_package_single_pass(tmp_path):
+    src = tmp_path / "scan.png"
+    _write_image(src)
+
+    result = create_uin_package(src, tmp_path / "out")
+    data = json.loads(open(result["uin_json"], encoding="utf-8").read())
+
+    edges = cv2.imread(result["edge_image"], cv2.IMREAD_GRAYSCALE)
+    expected = cv2.Canny(cv2.cvtColor(cv2.imread(str(src)), cv2.COLOR_BGR2GRAY), 100, 200)
+    assert np.array_equal(edges, expected)
+    assert data["compression_info"]["edge_image_size_kb"] * 1024 == (tmp_path / "out" / "scan_edges.png").stat().st_size
+    assert data["compression_info"]["original_size_kb"] * 1024 == src.stat().st_size
+
+
+def test_tiled_extraction_matches_untiled(tmp_path):
+    rng = np.random.default_rng(7)
+    gray = cv2.GaussianBlur(rng.integers(0, 256, (230, 310), dtype=np.uint8), (0, 0), 1.5)
+    src = tmp_path / "large.png"
+    cv2.imwrite(str(src), gray)
+
+    edges, stats = extract_canny_edges_tiled(src, tmp_path / "edges.npy", 30, 90, tile_size=40, overlap=4)
+
+    expected = cv2.Canny(gray, 30, 90)
+    assert np.array_equal(np.load(tmp_path / "edges.npy"), expected)
+    assert stats["edge_pixel_count"] == np.count_nonzero(expected)
+
+
+def test_sweep_matches_individual_extractions(tmp_path):
+    src = tmp_path / "sweep.png"
+    _write_image(src)
+
+    results = sweep_canny_thresholds(src, [(20, 60), (100, 200)], include_auto=True)
+
+    assert len(results) == 3
+    for r in results:
+        edges, stats = extract_canny_edges(src, r["thresholds"]["low"], r["thresholds"]["high"])
+        assert np.array_equal(r["edges"], edges)
+        assert r["stats"] == stats
+
+
+def test_package_with_compact_edge_map(tmp_path):
+    src = tmp_path / "mask.png"
+    _write_image(src)
+
+    result = create_uin_package(src, tmp_path / "out", edge_format="rle")
+    data = json.loads(open(result["uin_json"], encoding="utf-8").read())
+
+    edges, _ = extract_canny_edges(src)
+    assert result["edge_image"].endswith("_edges.uine")
+    assert np.array_equal(load_edge_map(result["edge_image"]), edges)
+    assert data["compression_info"]["edge_image_size_kb"] * 1024 == (tmp_path / "out" / "mask_edges.uine").stat().st_size
+
+
+def test_cache_scans_only_when_over_limit(tmp_path, monkeypatch):
+    cache = ExtractionCache(tmp_path / "cache", max_size_mb=50 / 1024)
+    scans = []
+    evict = cache._evict
+    monkeypatch.setattr(cache, "_evict", lambda: (scans.append(1), evict()))
+    for i in range(200):
+        cache.put(f"{i:064x}", {"edges": bytes(1024)}, {})
+    # First put initialises the running total, later scans only on overflow
+    assert len(scans) < 50
+    assert cache._total <= 50 * 1024
+    assert cache.get(f"{199:064x}") is not None and cache.get(f"{0:064x}") is None
+
+
+def test_evicted_cache_entry_is_recomputed(tmp_path, monkeypatch):
+    import shutil
+    image = tmp_path / "img.png"
+    _write_image(image)
+    cache = ExtractionCache(tmp_path / "cache")
+    create_uin_package(image, tmp_path / "run1", cache=cache)
+
+    get = cache.get
+    def get_then_evict(key):
+        entry = get(key)
+        shutil.rmtree(entry["files"]["edges"].parent)
+        return entry
+    monkeypatch.setattr(cache, "get", get_then_evict)
+    result = create_uin_package(image, tmp_path / "run2", cache=cache)
+    assert result.get("cache") != "hit"
+    assert (tmp_path / "run2" / "img_edges.png").exists()
+
+
+def test_entry_evicted_during_get_is_a_miss(tmp_path, monkeypatch):
+    import os
+    import shutil
+    from core.utils import extraction_cache
+    cache = ExtractionCache(tmp_path / "cache")
+    key = f"{1:064x}"
+    cache.put(key, {"edges": b"x"}, {})
+    utime = os.utime
+
+    def evicted_by_other_worker(path, *args, **kwargs):
+        shutil.rmtree(path)
+        return utime(path, *args, **kwargs)
+    monkeypatch.setattr(extraction_cache.os, "utime", evicted_by_other_worker)
+    assert cache.get(key) is None
@@ -0,0 +1,31 @@
+# path: tests/utils/test_parallel.py
+import time
+from concurrent.futures import ThreadPoolExecutor
+from uin.utils.parallel import bounded_map, chunked
+
+
+def _slow_square(n):
+    time.sleep(0.01 * (5 - n % 5))
+    return n * n
+
+
+def test_chunked():
+    assert list(chunked(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunked([], 3)) == []
+
+
+def test_bounded_map_order_and_bound():
+    consumed = []
+
+    def items():
+        for i in range(20):
+            consumed.append(i)
+            yield i
+
+    with ThreadPoolExecutor(4) as pool:
+        results = bounded_map(pool, _slow_square, items(), max_in_flight=3)
+        assert next(results) == 0
+        # Only max_in_flight items are pulled before the first result
+        assert len(consumed) <= 4
+        assert list(results) == [i * i for i in range(1, 20)]
+        assert sorted(bounded_map(pool, _slow_square, range(20), 3, ordered=False)) == [i * i for i in range(20)]
@@ -0,0 +1,31 @@
+# path: tests/utils/test_vectorize.py
+import cv2
+import numpy as np
+from core.utils.vectorize import vectorize_edges
+from uin.plugins.manager import PluginManager
+
+
+def _rect_image():
+    img = np.zeros((64, 96), dtype=np.uint8)
+    cv2.rectangle(img, (10, 10), (50, 40), 255, -1)
+    return img
+
+
+def test_vectorize_rectangle_outline():
+    doc = vectorize_edges(cv2.Canny(_rect_image(), 100, 200), tolerance=1.5)
+
+    assert len(doc.shapes) == 1
+    shape = doc.shapes[0]
+    assert shape.type == "polygon"
+    assert 4 <= len(shape.points) <= 8
+    assert abs(shape.x - 10) <= 1 and abs(shape.y - 10) <= 1
+    assert abs(shape.width - 40) <= 2 and abs(shape.height - 30) <= 2
+
+
+def test_vectorizer_importer_plugin():
+    pm = PluginManager()
+    pm.discover()
+    importer = pm.get_importer("EdgeVectorizerImporter")()
+
+    doc = importer.import_data(cv2.imencode(".png", _rect_image())[1].tobytes())
+    assert [s.type for s in doc.shapes] == ["polygon"]
@@ -0,0 +1,46 @@
+# path: tests/validation/test_schema_validator.py
+import io
+import json
+from core.validation.schema_validator import SchemaValidator, iter_documents, validate_many, summarize
+
+SCHEMA = {
+    "type": "object",
+    "required": ["meta", "shapes"],
+    "properties": {"shapes": {"type": "array", "items": {"type": "object", "required": ["id"]}}},
+}
+
+
+def _write_tree(tmp_path, n=10):
+    schema = tmp_path / "schema.json"
+    schema.write_text(json.dumps(SCHEMA))
+    docs = tmp_path / "out"
+    for i in range(n):
+        d = docs / f"img{i}"
+        d.mkdir(parents=True)
+        doc = {"meta": {}, "shapes": [{"id": "a"}]} if i % 3 else {"shapes": [{}, {}]}
+        (d / f"img{i}_attributes.uin.json").write_text(json.dumps(doc))
+    return schema, docs
+
+
+def test_first_error_stops_early(tmp_path):
+    schema, docs = _write_tree(tmp_path, 1)
+    doc = next(iter_documents(docs, "*_attributes.uin.json"))
+    validator = SchemaValidator(schema)
+    assert len(validator.check(doc)["errors"]) == 3
+    assert len(validator.check(doc, first_error=True)["errors"]) == 1
+
+
+def test_parallel_matches_serial(tmp_path):
+    schema, docs = _write_tree(tmp_path)
+    paths = list(iter_documents(str(docs / "**" / "*_attributes.uin.json")))
+    assert len(paths) == 10
+    serial = sorted((r["path"], r["valid"]) for r in validate_many(schema, paths))
+    parallel = sorted((r["path"], r["valid"]) for r in validate_many(schema, paths, workers=2, chunk_size=3))
+    assert serial == parallel
+
+    out = io.StringIO()
+    totals = summarize(validate_many(schema, paths, workers=2), out)
+    assert totals == {"total": 10, "valid": 6, "invalid": 4}
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 11
+    assert json.loads(lines[-1]) == {"summary": totals}
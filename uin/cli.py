@@ -1,40 +1,61 @@
 # path: uin/cli.py
 import argparse
-from uin.utils.io import read_stdin, write_stdout
-from uin.pipeline.context import PipelineContext
-from uin.pipeline.steps import (
-    step_import,
-    step_normalize,
-    step_validate,
-    step_export,
-)
+import sys
+from uin.utils.io import read_stdin, write_stdout, iter_stdin_lines, write_line
+
+# Kept in sync with uin.pipeline.commands.COMMANDS; the pipeline (and pydantic)
+# is imported only after argument parsing.
+COMMANDS = ("import", "normalize", "validate", "export")
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(prog="uin")
     parser.add_argument(
         "command",
-        choices=["import", "normalize", "validate", "export"],
+        choices=COMMANDS,
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="read one document per line and write one result per line",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes for --ndjson (output order is preserved)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print wall/CPU time, sizes and shape counts per step to stderr",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="with --profile, also sample peak memory per step (tracemalloc, slow)",
     )
     args = parser.parse_args()
+    if args.profile and args.ndjson:
+        parser.error("--profile is not supported with --ndjson")
 
-    raw = read_stdin()
-    ctx = PipelineContext()
+    from uin.pipeline.commands import run_command, run_ndjson, format_profile
+    from uin.pipeline.context import PipelineContext
 
-    if args.command == "import":
-        ctx = step_import(ctx, raw)
-        write_stdout(raw)
+    if args.ndjson:
+        for result in run_ndjson(args.command, iter_stdin_lines(), workers=args.jobs):
+            write_line(result)
+        return
 
-    elif args.command == "normalize":
-        ctx = step_import(ctx, raw)
-        ctx = step_normalize(ctx)
-        write_stdout(step_export(ctx))
+    ctx = PipelineContext(trace_memory=args.profile and args.trace_memory)
+    result = run_command(args.command, read_stdin(), out=sys.stdout, ctx=ctx)
+    if result is not None:
+        write_stdout(result)
+    if args.profile:
+        sys.stdout.flush()
+        sys.stderr.write(format_profile(ctx) + "\n")
 
-    elif args.command == "validate":
-        ctx = step_import(ctx, raw)
-        step_validate(ctx)
-        write_stdout(raw)
 
-    elif args.command == "export":
-        ctx = step_import(ctx, raw)
-        write_stdout(step_export(ctx))
+if __name__ == "__main__":
+    main()
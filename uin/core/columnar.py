@@ -0,0 +1,176 @@
+# path: uin/core/columnar.py
+import numpy as np
+from uin.core.schema import UINDocument, UINMeta, Shape, Color
+from uin.core.errors import ValidationError, NormalizationError
+
+SHAPE_TYPES = ("rect", "circle", "polygon")
+TYPE_CODES = {name: code for code, name in enumerate(SHAPE_TYPES)}
+
+
+class ColumnarDocument:
+    # Array-backed UINDocument: ids as a fixed-width unicode array, shape
+    # types as int8 codes, one float64 column per geometry field (NaN for
+    # unset optional fields), RGBA as an (n, 4) float array and polygon points
+    # as a flat (m, 2) array indexed by point_offsets (length n + 1).
+    # The constructor takes the arrays as-is (no copies).
+    def __init__(
+        self,
+        meta: UINMeta,
+        ids: np.ndarray,
+        types: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+        width: np.ndarray,
+        height: np.ndarray,
+        radius: np.ndarray,
+        rgba: np.ndarray,
+        point_offsets: np.ndarray | None = None,
+        points: np.ndarray | None = None,
+    ):
+        n = len(ids)
+        self.meta = meta
+        self.ids = ids
+        self.types = types
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.radius = radius
+        self.rgba = rgba
+        self.point_offsets = point_offsets if point_offsets is not None else np.zeros(n + 1, dtype=np.int64)
+        self.points = points if points is not None else np.empty((0, 2), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def _from_columns(cls, meta: UINMeta, ids, types, x, y, width, height, radius, rgba, points) -> "ColumnarDocument":
+        n = len(ids)
+
+        def floats(values):
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+        codes = np.array([TYPE_CODES.get(t, -1) for t in types], dtype=np.int8)
+        lengths = np.fromiter((len(p) if p else 0 for p in points), dtype=np.int64, count=n)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        flat = [pt for p in points if p for pt in p]
+        return cls(
+            meta,
+            np.array(ids, dtype=np.str_),
+            codes,
+            floats(x),
+            floats(y),
+            floats(width),
+            floats(height),
+            floats(radius),
+            np.array(rgba, dtype=np.float64).reshape(n, 4),
+            offsets,
+            np.array(flat, dtype=np.float64).reshape(-1, 2),
+        )
+
+    @classmethod
+    def from_document(cls, doc: UINDocument) -> "ColumnarDocument":
+        shapes = doc.shapes
+        return cls._from_columns(
+            doc.meta,
+            [s.id for s in shapes],
+            [s.type for s in shapes],
+            [s.x for s in shapes],
+            [s.y for s in shapes],
+            [s.width for s in shapes],
+            [s.height for s in shapes],
+            [s.radius for s in shapes],
+            [(s.color.r, s.color.g, s.color.b, s.color.a) for s in shapes],
+            [s.points for s in shapes],
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnarDocument":
+        # Builds columns straight from parsed JSON, skipping per-shape pydantic
+        # models; validate() performs the range checks on the columns.
+        shapes = data.get("shapes")
+        if not isinstance(shapes, list):
+            raise ValidationError("UIN document has no shapes list")
+        try:
+            colors = [s["color"] for s in shapes]
+            return cls._from_columns(
+                UINMeta.model_validate(data.get("meta", {})),
+                [s["id"] for s in shapes],
+                [s["type"] for s in shapes],
+                [s["x"] for s in shapes],
+                [s["y"] for s in shapes],
+                [s.get("width") for s in shapes],
+                [s.get("height") for s in shapes],
+                [s.get("radius") for s in shapes],
+                [(c["r"], c["g"], c["b"], c.get("a", 1.0)) for c in colors],
+                [s.get("points") for s in shapes],
+            )
+        except (KeyError, TypeError, AttributeError) as e:
+            for i, s in enumerate(shapes):
+                if not isinstance(s, dict) or not {"id", "type", "x", "y", "color"} <= s.keys():
+                    raise ValidationError(f"Invalid shape at index {i}") from e
+            raise ValidationError(f"Invalid shape data: {e}") from e
+        except ValueError as e:
+            raise ValidationError(f"Invalid shape data: {e}") from e
+
+    def to_document(self) -> UINDocument:
+        # Shapes are built with model_construct, so pydantic validation is
+        # skipped. Type codes are checked here regardless: a negative code
+        # would otherwise index SHAPE_TYPES from the end.
+        bad_type = np.flatnonzero((self.types < 0) | (self.types >= len(SHAPE_TYPES)))
+        if bad_type.size:
+            raise ValueError(f"Invalid shape type code {self.types[bad_type[0]]} at index {bad_type[0]}")
+        type_names = [SHAPE_TYPES[code] for code in self.types.tolist()]
+        width, height, radius = (
+            np.where(np.isnan(col), None, col).tolist() for col in (self.width, self.height, self.radius)
+        )
+        rgb = self.rgba[:, :3].astype(np.int64).tolist()
+        alpha = self.rgba[:, 3].tolist()
+        offsets = self.point_offsets.tolist()
+        points = self.points.tolist()
+        shapes = [
+            Shape.model_construct(
+                id=sid,
+                type=type_names[i],
+                x=x,
+                y=y,
+                width=width[i],
+                height=height[i],
+                radius=radius[i],
+                points=[tuple(p) for p in points[offsets[i]:offsets[i + 1]]] if offsets[i + 1] > offsets[i] else None,
+                color=Color.model_construct(r=rgb[i][0], g=rgb[i][1], b=rgb[i][2], a=alpha[i]),
+            )
+            for i, (sid, x, y) in enumerate(zip(self.ids.tolist(), self.x.tolist(), self.y.tolist()))
+        ]
+        return UINDocument.model_construct(meta=self.meta, shapes=shapes)
+
+    def check_ranges(self) -> None:
+        bad_type = np.flatnonzero((self.types < 0) | (self.types >= len(SHAPE_TYPES)))
+        if bad_type.size:
+            raise ValidationError(f"Invalid shape type at index {bad_type[0]}")
+        bad_xy = np.flatnonzero(np.isnan(self.x) | np.isnan(self.y))
+        if bad_xy.size:
+            raise ValidationError(f"Missing x/y at index {bad_xy[0]}")
+        rgb = self.rgba[:, :3]
+        bad_rgb = np.flatnonzero(((rgb < 0) | (rgb > 255) | (rgb != np.floor(rgb))).any(axis=1))
+        if bad_rgb.size:
+            raise ValidationError(f"Color channel out of range 0-255 at index {bad_rgb[0]}")
+        alpha = self.rgba[:, 3]
+        bad_alpha = np.flatnonzero((alpha < 0) | (alpha > 1) | np.isnan(alpha))
+        if bad_alpha.size:
+            raise ValidationError(f"Alpha out of range 0-1 at index {bad_alpha[0]}")
+
+
+def normalize(doc: ColumnarDocument) -> ColumnarDocument:
+    ids = np.sort(doc.ids)
+    dupes = np.flatnonzero(ids[1:] == ids[:-1])
+    if dupes.size:
+        raise NormalizationError(f"Duplicate shape id: {ids[dupes[0]]}")
+    return doc
+
+
+def validate(doc: ColumnarDocument) -> None:
+    if not len(doc):
+        raise ValidationError("UIN document contains no shapes")
+    doc.check_ranges()
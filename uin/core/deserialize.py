@@ -0,0 +1,159 @@
+# path: uin/core/deserialize.py
+import codecs
+import json
+from typing import IO, Iterator
+from pydantic import ValidationError as PydanticValidationError
+from uin.core.schema import UINDocument, UINMeta, Shape
+from uin.core.errors import ValidationError
+
+READ_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+class _StreamReader:
+    # Incremental JSON tokenizer over a byte or text stream. Only the
+    # structural characters of the top-level object and the shapes array are
+    # handled here; every member value is decoded with json's raw_decode, so
+    # at most one value (e.g. one shape) is buffered at a time.
+    def __init__(self, stream: IO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.consumed = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if isinstance(chunk, bytes):
+            text = self.decoder.decode(chunk, final=not chunk)
+        else:
+            text = chunk
+        if not chunk:
+            self.eof = True
+        self.consumed += self.pos
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+        return bool(text) or not self.eof
+
+    def offset(self) -> int:
+        return self.consumed + self.pos
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        ch = self.peek()
+        if not ch or ch not in chars:
+            found = repr(ch) if ch else "end of input"
+            raise ValidationError(f"Malformed JSON at offset {self.offset()}: expected {chars!r}, found {found}")
+        self.pos += 1
+        return ch
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self.json.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise ValidationError(f"Malformed JSON at offset {self.consumed + e.pos}: {e.msg}") from e
+            # A number may be cut at the buffer end ("1." of "1.5"); it is
+            # complete only once a structural character follows it
+            if isinstance(obj, (int, float)) and not isinstance(obj, bool) and not self.eof:
+                nxt = end
+                while nxt < len(self.buf) and self.buf[nxt] in _WHITESPACE:
+                    nxt += 1
+                if (nxt == len(self.buf) or self.buf[nxt] not in ",}]") and self._fill():
+                    continue
+            self.pos = end
+            return obj
+
+
+def _iter_members(reader: _StreamReader) -> Iterator[tuple[str, _StreamReader]]:
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+    else:
+        while True:
+            key = reader.value()
+            if not isinstance(key, str):
+                raise ValidationError(f"Malformed JSON at offset {reader.offset()}: expected object key")
+            reader.expect(":")
+            yield key, reader
+            if reader.expect(",}") == "}":
+                break
+    if reader.peek():
+        raise ValidationError(f"Malformed JSON at offset {reader.offset()}: extra data")
+
+
+def _iter_array(reader: _StreamReader) -> Iterator:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        if reader.expect(",]") == "]":
+            return
+
+
+def _validate_shape(index: int, obj) -> Shape:
+    try:
+        return Shape.model_validate(obj)
+    except PydanticValidationError as e:
+        raise ValidationError(f"Invalid shape at index {index}: {e}") from e
+
+
+def iter_document(stream: IO, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[tuple[str, object]]:
+    # Yields ("meta", UINMeta), ("shapes", None) and ("shape", Shape) events in
+    # document order; each shape is validated as soon as it has been parsed.
+    for key, reader in _iter_members(_StreamReader(stream, chunk_size)):
+        if key == "shapes":
+            yield "shapes", None
+            for index, obj in enumerate(_iter_array(reader)):
+                yield "shape", _validate_shape(index, obj)
+        elif key == "meta":
+            try:
+                meta = UINMeta.model_validate(reader.value())
+            except PydanticValidationError as e:
+                raise ValidationError(f"Invalid meta: {e}") from e
+            yield "meta", meta
+        else:
+            reader.value()
+
+
+def iter_shapes(stream: IO, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Shape]:
+    for kind, item in iter_document(stream, chunk_size):
+        if kind == "shape":
+            yield item
+
+
+def load_document(stream: IO, chunk_size: int = READ_CHUNK_SIZE) -> UINDocument:
+    meta = None
+    shapes = None
+    for kind, item in iter_document(stream, chunk_size):
+        if kind == "meta":
+            meta = item
+        elif kind == "shapes":
+            shapes = []
+        else:
+            shapes.append(item)
+    if meta is None:
+        raise ValidationError("UIN document has no meta")
+    if shapes is None:
+        raise ValidationError("UIN document has no shapes")
+    # Parts are already validated; skip a second full validation pass
+    return UINDocument.model_construct(meta=meta, shapes=shapes)
@@ -1,6 +1,6 @@
 # path: uin/core/schema.py
 from pydantic import BaseModel, Field
-from typing import List, Literal
+from typing import List, Literal, Tuple
 from uin.core.version import SCHEMA_VERSION
 
 
@@ -24,6 +24,7 @@ class Shape(BaseModel):
     width: float | None = None
     height: float | None = None
     radius: float | None = None
+    points: List[Tuple[float, float]] | None = None
     color: Color
 
 
@@ -1,7 +1,74 @@
 # path: uin/core/serialize.py
 import json
-from uin.core.schema import UINDocument
+from typing import IO, Iterator
+from uin.core.schema import UINDocument, Shape
+
+STREAM_BUFFER_SIZE = 64 * 1024
+
+
+def shape_data(shape: Shape) -> dict:
+    # "points" only exists for polygons; leaving the null out otherwise keeps
+    # the canonical output of documents without polygons unchanged
+    data = shape.model_dump(mode="json")
+    if data["points"] is None:
+        del data["points"]
+    return data
+
+
+def document_data(doc: UINDocument) -> dict:
+    data = doc.model_dump(mode="json")
+    for shape in data["shapes"]:
+        if shape["points"] is None:
+            del shape["points"]
+    return data
 
 
 def serialize(doc: UINDocument) -> str:
-    return json.dumps(doc.model_dump(mode="json"), sort_keys=True)
+    return json.dumps(document_data(doc), sort_keys=True)
+
+
+def iter_serialize(doc: UINDocument) -> Iterator[str]:
+    # Emits exactly the bytes of serialize(), one shape at a time, so only a
+    # single shape is ever materialized as a dict.
+    yield "{"
+    for i, name in enumerate(sorted(type(doc).model_fields)):
+        if i:
+            yield ", "
+        yield json.dumps(name) + ": "
+        if name == "shapes":
+            yield "["
+            for j, shape in enumerate(doc.shapes):
+                if j:
+                    yield ", "
+                yield json.dumps(shape_data(shape), sort_keys=True)
+            yield "]"
+        else:
+            yield json.dumps(doc.model_dump(mode="json", include={name})[name], sort_keys=True)
+    yield "}"
+
+
+def serialize_to(doc: UINDocument, out: IO, binary: bool = False) -> int:
+    # Writes serialize(doc) to a text stream (or UTF-8 to a binary stream when
+    # binary=True) in ~STREAM_BUFFER_SIZE chunks; returns the UTF-8 size in
+    # bytes either way.
+    buffer: list[str] = []
+    buffered = 0
+    written = 0
+    for chunk in iter_serialize(doc):
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= STREAM_BUFFER_SIZE:
+            written += _write(out, "".join(buffer), binary)
+            buffer, buffered = [], 0
+    if buffer:
+        written += _write(out, "".join(buffer), binary)
+    return written
+
+
+def _write(out: IO, data: str, binary: bool) -> int:
+    payload = data.encode("utf-8") if binary else data
+    out.write(payload)
+    # A text chunk's len() counts characters; only non-ASCII text needs encoding
+    if binary or data.isascii():
+        return len(payload)
+    return len(data.encode("utf-8"))
@@ -0,0 +1,206 @@
+# path: uin/core/session.py
+import hashlib
+import json
+from typing import IO, Iterable, Iterator
+from pydantic import ValidationError as PydanticValidationError
+from uin.core.schema import UINDocument, Shape
+from uin.core.normalize import normalize
+from uin.core.validate import validate
+from uin.core.serialize import _write, shape_data
+from uin.core.errors import ValidationError, NormalizationError
+
+# Shapes per cached serialization block: an edit re-joins one block, a full
+# serialization joins n / BLOCK_SIZE block strings.
+BLOCK_SIZE = 256
+
+
+def _fragment(model) -> str:
+    data = shape_data(model) if isinstance(model, Shape) else model.model_dump(mode="json")
+    return json.dumps(data, sort_keys=True)
+
+
+def _hash(fragment: str) -> bytes:
+    return hashlib.sha256(fragment.encode("utf-8")).digest()
+
+
+def document_digest(doc: UINDocument) -> str:
+    # sha256 over the meta hash followed by every shape hash in document
+    # order; equal to DocumentSession.digest() for the same content.
+    h = hashlib.sha256(_hash(_fragment(doc.meta)))
+    for shape in doc.shapes:
+        h.update(_hash(_fragment(shape)))
+    return h.hexdigest()
+
+
+class DocumentSession:
+    # Editable view of a document for frequent small edits. Each shape keeps
+    # its canonical JSON fragment and content hash; shapes live in an
+    # insertion-ordered id index split into blocks whose joined text is
+    # cached, so a patch only re-validates, re-serializes and re-hashes the
+    # shapes it touches. New shapes are appended; updates keep the position.
+    def __init__(self, doc: UINDocument):
+        normalize(doc)
+        validate(doc)
+        self.meta = doc.meta
+        self._meta_fragment = _fragment(doc.meta)
+        self._shapes: dict[str, Shape] = {}
+        self._fragments: dict[str, str] = {}
+        self._hashes: dict[str, bytes] = {}
+        self._blocks: list[dict[str, None]] = []
+        self._block_of: dict[str, int] = {}
+        self._block_text: list[str | None] = []
+        self._block_hashes: list[bytes | None] = []
+        self._digest: str | None = None
+        for shape in doc.shapes:
+            self._insert(shape)
+
+    def __len__(self) -> int:
+        return len(self._shapes)
+
+    def __contains__(self, shape_id: str) -> bool:
+        return shape_id in self._shapes
+
+    def get(self, shape_id: str) -> Shape:
+        return self._shapes[shape_id]
+
+    def shape_hash(self, shape_id: str) -> str:
+        return self._hashes[shape_id].hex()
+
+    def _insert(self, shape: Shape) -> None:
+        if not self._blocks or len(self._blocks[-1]) >= BLOCK_SIZE:
+            self._blocks.append({})
+            self._block_text.append(None)
+            self._block_hashes.append(None)
+        block = len(self._blocks) - 1
+        self._blocks[block][shape.id] = None
+        self._block_of[shape.id] = block
+        self._set(shape)
+
+    def _set(self, shape: Shape) -> None:
+        fragment = _fragment(shape)
+        self._shapes[shape.id] = shape
+        self._fragments[shape.id] = fragment
+        self._hashes[shape.id] = _hash(fragment)
+        block = self._block_of[shape.id]
+        self._block_text[block] = None
+        self._block_hashes[block] = None
+        self._digest = None
+
+    def _delete(self, shape_id: str) -> Shape:
+        block = self._block_of.pop(shape_id)
+        del self._blocks[block][shape_id]
+        self._block_text[block] = None
+        self._block_hashes[block] = None
+        self._digest = None
+        del self._fragments[shape_id]
+        del self._hashes[shape_id]
+        return self._shapes.pop(shape_id)
+
+    @staticmethod
+    def _validate_shape(data) -> Shape:
+        if isinstance(data, Shape):
+            data = data.model_dump()
+        try:
+            return Shape.model_validate(data)
+        except PydanticValidationError as e:
+            raise ValidationError(f"Invalid shape: {e}") from e
+
+    def add(self, shape: Shape | dict) -> None:
+        shape = self._validate_shape(shape)
+        if shape.id in self._shapes:
+            raise NormalizationError(f"Duplicate shape id: {shape.id}")
+        self._insert(shape)
+
+    def update(self, shape_id: str, changes: dict) -> None:
+        # Shallow merge: a nested field such as color is replaced as a whole
+        if shape_id not in self._shapes:
+            raise ValidationError(f"Unknown shape id: {shape_id}")
+        shape = self._validate_shape({**self._shapes[shape_id].model_dump(), **changes})
+        if shape.id != shape_id:
+            raise ValidationError(f"Shape id cannot change: {shape_id} -> {shape.id}")
+        self._set(shape)
+
+    def remove(self, shape_id: str) -> Shape:
+        if shape_id not in self._shapes:
+            raise ValidationError(f"Unknown shape id: {shape_id}")
+        if len(self._shapes) == 1:
+            raise ValidationError("UIN document contains no shapes")
+        return self._delete(shape_id)
+
+    def apply(self, ops: Iterable[dict]) -> None:
+        # Applies {"op": "add", "shape": {...}}, {"op": "update", "id": ...,
+        # "changes": {...}} and {"op": "remove", "id": ...} in order. The patch
+        # is atomic: if any op fails, the ops already applied are undone.
+        undo = []
+        try:
+            for op in ops:
+                kind = op.get("op")
+                if kind == "add":
+                    self.add(op["shape"])
+                    undo.append(("remove", op["shape"]["id"] if isinstance(op["shape"], dict) else op["shape"].id))
+                elif kind == "update":
+                    before = self._shapes.get(op["id"])
+                    self.update(op["id"], op["changes"])
+                    undo.append(("restore", before))
+                elif kind == "remove":
+                    block = self._block_of.get(op["id"])
+                    undo.append(("reinsert", (block, list(self._blocks[block]) if block is not None else None, self.remove(op["id"]))))
+                else:
+                    raise ValidationError(f"Unknown patch op: {kind!r}")
+        except KeyError as e:
+            self._undo(undo)
+            raise ValidationError(f"Patch op is missing {e}") from e
+        except Exception:
+            self._undo(undo)
+            raise
+
+    def _undo(self, undo: list) -> None:
+        for kind, item in reversed(undo):
+            if kind == "remove":
+                self._delete(item)
+            elif kind == "restore":
+                self._set(item)
+            else:
+                block, order, shape = item
+                # Put the shape back at its old position within its block
+                self._blocks[block] = {sid: None for sid in order}
+                self._block_of[shape.id] = block
+                self._set(shape)
+
+    def _iter_blocks(self) -> Iterator[str]:
+        for i, block in enumerate(self._blocks):
+            if not block:
+                continue
+            text = self._block_text[i]
+            if text is None:
+                fragments = self._fragments
+                text = self._block_text[i] = ", ".join(fragments[sid] for sid in block)
+            yield text
+
+    def iter_serialize(self) -> Iterator[str]:
+        # Same bytes as uin.core.serialize.serialize(self.to_document())
+        yield '{"meta": ' + self._meta_fragment + ', "shapes": ['
+        for i, text in enumerate(self._iter_blocks()):
+            yield ", " + text if i else text
+        yield "]}"
+
+    def serialize(self) -> str:
+        return "".join(self.iter_serialize())
+
+    def serialize_to(self, out: IO, binary: bool = False) -> int:
+        return sum(_write(out, chunk, binary) for chunk in self.iter_serialize())
+
+    def digest(self) -> str:
+        if self._digest is None:
+            h = hashlib.sha256(_hash(self._meta_fragment))
+            for i, block in enumerate(self._blocks):
+                if self._block_hashes[i] is None:
+                    hashes = self._hashes
+                    self._block_hashes[i] = b"".join(hashes[sid] for sid in block)
+                h.update(self._block_hashes[i])
+            self._digest = h.hexdigest()
+        return self._digest
+
+    def to_document(self) -> UINDocument:
+        shapes = [self._shapes[sid] for block in self._blocks for sid in block]
+        return UINDocument.model_construct(meta=self.meta, shapes=shapes)
@@ -0,0 +1,225 @@
+# path: uin/core/spatial.py
+import heapq
+import math
+from typing import Iterable
+from uin.core.schema import UINDocument, Shape
+
+BBox = tuple[float, float, float, float]
+
+# Shapes covering more grid cells than this are kept in a separate list that
+# is scanned linearly, so one huge background shape cannot flood the grid.
+MAX_CELLS_PER_SHAPE = 64
+
+
+def shape_bbox(shape: Shape) -> BBox:
+    if shape.type == "circle":
+        r = abs(shape.radius or 0.0)
+        return (shape.x - r, shape.y - r, shape.x + r, shape.y + r)
+    if shape.type == "polygon" and shape.points:
+        xs = [p[0] for p in shape.points]
+        ys = [p[1] for p in shape.points]
+        return (min(xs), min(ys), max(xs), max(ys))
+    x2 = shape.x + (shape.width or 0.0)
+    y2 = shape.y + (shape.height or 0.0)
+    return (min(shape.x, x2), min(shape.y, y2), max(shape.x, x2), max(shape.y, y2))
+
+
+def bbox_intersects(a: BBox, b: BBox) -> bool:
+    # Closed boxes: touching edges count
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def bbox_overlaps(a: BBox, b: BBox) -> bool:
+    # Intersection with positive area: touching edges do not count
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def bbox_distance(box: BBox, x: float, y: float) -> float:
+    dx = max(box[0] - x, 0.0, x - box[2])
+    dy = max(box[1] - y, 0.0, y - box[3])
+    return math.hypot(dx, dy)
+
+
+def shapes_overlap(a: Shape, b: Shape) -> bool:
+    # Exact for rect/circle pairs; polygons are approximated by their bbox
+    box_a, box_b = shape_bbox(a), shape_bbox(b)
+    if not bbox_overlaps(box_a, box_b):
+        return False
+    if a.type == "circle" and b.type == "circle":
+        return math.hypot(a.x - b.x, a.y - b.y) < abs(a.radius or 0.0) + abs(b.radius or 0.0)
+    if a.type == "circle" and b.type == "rect":
+        return bbox_distance(box_b, a.x, a.y) < abs(a.radius or 0.0)
+    if a.type == "rect" and b.type == "circle":
+        return bbox_distance(box_a, b.x, b.y) < abs(b.radius or 0.0)
+    return True
+
+
+def _auto_cell_size(boxes: list[BBox]) -> float:
+    # Median shape extent: most shapes then cover one to four cells
+    extents = sorted(max(b[2] - b[0], b[3] - b[1]) for b in boxes)
+    if extents and extents[len(extents) // 2] > 0:
+        return extents[len(extents) // 2]
+    if boxes:
+        width = max(b[2] for b in boxes) - min(b[0] for b in boxes)
+        height = max(b[3] for b in boxes) - min(b[1] for b in boxes)
+        side = math.sqrt(width * height / len(boxes))
+        if side > 0:
+            return side
+    return 1.0
+
+
+class SpatialIndex:
+    # Uniform grid over shape bounding boxes. Each cell holds the ids of the
+    # shapes whose bbox touches it; boxes are kept per id so insert/remove are
+    # incremental and inserting an existing id replaces its box.
+    def __init__(self, cell_size: float = 1.0):
+        if not cell_size > 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = float(cell_size)
+        self._boxes: dict[str, BBox] = {}
+        self._cells: dict[tuple[int, int], set[str]] = {}
+        self._oversized: set[str] = set()
+        # Occupied cell range; only grows, which keeps nearest() correct
+        self._extent: list[int] | None = None
+
+    @classmethod
+    def from_shapes(cls, shapes: Iterable[Shape], cell_size: float | None = None) -> "SpatialIndex":
+        boxes = [(s.id, shape_bbox(s)) for s in shapes]
+        index = cls(cell_size or _auto_cell_size([b for _, b in boxes]))
+        for sid, box in boxes:
+            index.insert_bbox(sid, box)
+        return index
+
+    @classmethod
+    def from_document(cls, doc: UINDocument, cell_size: float | None = None) -> "SpatialIndex":
+        return cls.from_shapes(doc.shapes, cell_size)
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def __contains__(self, shape_id: str) -> bool:
+        return shape_id in self._boxes
+
+    def bbox(self, shape_id: str) -> BBox:
+        return self._boxes[shape_id]
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def _cell_range(self, box: BBox) -> tuple[int, int, int, int]:
+        i0, j0 = self._cell(box[0], box[1])
+        i1, j1 = self._cell(box[2], box[3])
+        return i0, j0, i1, j1
+
+    def insert(self, shape: Shape) -> None:
+        self.insert_bbox(shape.id, shape_bbox(shape))
+
+    def insert_bbox(self, shape_id: str, box: BBox) -> None:
+        if shape_id in self._boxes:
+            self.remove(shape_id)
+        self._boxes[shape_id] = box
+        i0, j0, i1, j1 = self._cell_range(box)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > MAX_CELLS_PER_SHAPE:
+            self._oversized.add(shape_id)
+            return
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                self._cells.setdefault((i, j), set()).add(shape_id)
+        if self._extent is None:
+            self._extent = [i0, j0, i1, j1]
+        else:
+            e = self._extent
+            self._extent = [min(e[0], i0), min(e[1], j0), max(e[2], i1), max(e[3], j1)]
+
+    def remove(self, shape_id: str) -> None:
+        box = self._boxes.pop(shape_id)
+        if shape_id in self._oversized:
+            self._oversized.discard(shape_id)
+            return
+        i0, j0, i1, j1 = self._cell_range(box)
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                cell = self._cells[(i, j)]
+                cell.discard(shape_id)
+                if not cell:
+                    del self._cells[(i, j)]
+
+    def query(self, box: BBox) -> list[str]:
+        # Ids of all shapes whose bbox intersects box (touching counts)
+        i0, j0, i1, j1 = self._cell_range(box)
+        candidates = set(self._oversized)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(self._cells):
+            # Query larger than the occupied grid: walk the occupied cells
+            for (i, j), ids in self._cells.items():
+                if i0 <= i <= i1 and j0 <= j <= j1:
+                    candidates |= ids
+        else:
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    ids = self._cells.get((i, j))
+                    if ids:
+                        candidates |= ids
+        boxes = self._boxes
+        return [sid for sid in candidates if bbox_intersects(boxes[sid], box)]
+
+    def nearest(self, x: float, y: float, k: int = 1) -> list[tuple[float, str]]:
+        # k nearest shapes by bbox distance (0 inside a bbox), closest first.
+        # Rings of cells are searched outwards until every shape not yet seen
+        # is provably farther away than the current k-th candidate.
+        if k <= 0 or not self._boxes:
+            return []
+        boxes = self._boxes
+        seen = set(self._oversized)
+        found = [(bbox_distance(boxes[sid], x, y), sid) for sid in self._oversized]
+        if self._extent is not None:
+            ci, cj = self._cell(x, y)
+            e = self._extent
+            r = max(e[0] - ci, ci - e[2], e[1] - cj, cj - e[3], 0)
+            r_max = max(ci - e[0], e[2] - ci, cj - e[1], e[3] - cj)
+            while r <= r_max and len(seen) < len(boxes):
+                if 8 * r > len(self._cells):
+                    # Rings outgrew the sparse grid: finish with a linear scan
+                    found.extend((bbox_distance(b, x, y), sid) for sid, b in boxes.items() if sid not in seen)
+                    break
+                for cell in self._ring(ci, cj, r):
+                    for sid in self._cells.get(cell, ()):
+                        if sid not in seen:
+                            seen.add(sid)
+                            found.append((bbox_distance(boxes[sid], x, y), sid))
+                if len(found) >= k and heapq.nsmallest(k, found)[-1][0] <= r * self.cell_size:
+                    break
+                r += 1
+        return heapq.nsmallest(k, found)
+
+    @staticmethod
+    def _ring(ci: int, cj: int, r: int) -> Iterable[tuple[int, int]]:
+        if r == 0:
+            return [(ci, cj)]
+        cells = [(ci + d, cj - r) for d in range(-r, r + 1)]
+        cells += [(ci + d, cj + r) for d in range(-r, r + 1)]
+        cells += [(ci - r, cj + d) for d in range(-r + 1, r)]
+        cells += [(ci + r, cj + d) for d in range(-r + 1, r)]
+        return cells
+
+    def overlaps(self) -> list[tuple[str, str]]:
+        # All pairs (a, b), a < b, whose bboxes overlap with positive area.
+        # A pair sharing several cells is reported only from the cell holding
+        # the lower-left corner of the intersection, so no dedup set is needed.
+        boxes = self._boxes
+        pairs = []
+        for cell, ids in self._cells.items():
+            if len(ids) < 2:
+                continue
+            members = sorted(ids)
+            for n, a in enumerate(members):
+                box_a = boxes[a]
+                for b in members[n + 1:]:
+                    box_b = boxes[b]
+                    if bbox_overlaps(box_a, box_b) and self._cell(max(box_a[0], box_b[0]), max(box_a[1], box_b[1])) == cell:
+                        pairs.append((a, b))
+        oversized = sorted(self._oversized)
+        for a in oversized:
+            for b in self.query(boxes[a]):
+                if (b not in self._oversized or b > a) and bbox_overlaps(boxes[a], boxes[b]):
+                    pairs.append((a, b) if a < b else (b, a))
+        return pairs
@@ -1,15 +1,44 @@
 # path: uin/dashboard/monitor.py
-from uin.core.schema import UINDocument
+import re
+from metrics.registry import REGISTRY, MetricsRegistry
+from uin.dashboard.timeseries import TimeSeriesStore
+
+_INVALID = re.compile(r"[^a-zA-Z0-9_:]")
+
 
 class DashboardMonitor:
-    def __init__(self):
+    def __init__(self, registry: MetricsRegistry | None = None, store: TimeSeriesStore | None = None):
+        self.registry = registry or REGISTRY
+        self.store = store or TimeSeriesStore()
         self.metrics = {}
+        self._gauge = self.registry.gauge("uin_dashboard_metric", "Last value recorded via the dashboard", ("name",))
 
-    def record_metric(self, name: str, value):
+    def record_metric(self, name: str, value) -> bool:
+        # The store rejects non-finite values before anything is recorded and
+        # drops new series beyond its max_series; the same cap bounds the
+        # latest-value dict and the gauge's label set
+        if not self.store.record(name, value):
+            return False
         self.metrics[name] = value
+        self._gauge.labels(name=_INVALID.sub("_", name)).set(value)
+        return True
 
     def get_metrics(self):
         return self.metrics
 
+    def percentiles(self, quantiles=(0.5, 0.95, 0.99)):
+        # {histogram{labels}: {"p50": ..., ...}} for every histogram in the registry
+        out = {}
+        for metric, samples in self.registry.collect():
+            if metric.type != "histogram":
+                continue
+            for labels, _ in samples:
+                key = metric.name + ("{" + ",".join(f"{k}={v}" for k, v in labels.items()) + "}" if labels else "")
+                out[key] = {f"p{round(q * 100)}": metric.quantile(q, **labels) for q in quantiles}
+        return out
+
     def summary(self):
-        return "\n".join(f"{k}: {v}" for k,v in self.metrics.items())
+        lines = [f"{k}: {v}" for k, v in self.metrics.items()]
+        for key, qs in self.percentiles().items():
+            lines.append(f"{key}: " + " ".join(f"{q}={v:.4g}" for q, v in qs.items()))
+        return "\n".join(lines)
@@ -1,6 +1,10 @@
 # path: uin/dashboard/routes.py
-from fastapi import FastAPI
+import json
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from metrics.prometheus import export_prometheus, CONTENT_TYPE
 from uin.dashboard.monitor import DashboardMonitor
+from uin.dashboard.timeseries import RESOLUTIONS
 
 app = FastAPI()
 monitor = DashboardMonitor()
@@ -9,11 +13,56 @@ monitor = DashboardMonitor()
 def get_metrics():
     return monitor.get_metrics()
 
+@app.get("/metrics/prometheus")
+def get_metrics_prometheus():
+    return Response(export_prometheus(monitor.registry), media_type=CONTENT_TYPE)
+
+@app.get("/metrics/series")
+def list_series():
+    return {"series": monitor.store.names()}
+
+@app.get("/metrics/range/{metric_name}")
+def metric_range(metric_name: str, start: float | None = None, end: float | None = None,
+                 resolution: str | None = None, max_points: int = 1000):
+    # start/end are unix timestamps; resolution is 1s, 1m or 1h (default: finest that fits)
+    if resolution is not None and resolution not in RESOLUTIONS:
+        raise HTTPException(400, f"resolution must be one of {', '.join(RESOLUTIONS)}")
+    try:
+        result = monitor.store.query(metric_name, start, end, RESOLUTIONS.get(resolution), max_points)
+    except ValueError as e:
+        raise HTTPException(422, str(e))
+    if result is None:
+        raise HTTPException(404, f"Unknown metric: {metric_name}")
+    return result
+
+@app.get("/metrics/stream")
+async def metric_stream(name: list[str] | None = Query(None)):
+    # Server-sent events: latest values first, then one "point" event per
+    # recorded value; comments keep idle connections alive
+    async def stream():
+        async for point in monitor.store.stream(name):
+            yield ": keepalive\n\n" if point is None else f"event: point\ndata: {json.dumps(point)}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 @app.post("/record/{metric_name}")
-def record_metric(metric_name: str, value: float):
-    monitor.record_metric(metric_name, value)
-    return {"status": "ok"}
+async def record_metric(metric_name: str, request: Request, value: float | None = None):
+    # The value comes from the query string or, if absent, the JSON body
+    if value is None:
+        try:
+            body = await request.json()
+            if isinstance(body, bool):
+                raise TypeError(body)
+            value = float(body)
+        except (ValueError, TypeError):
+            raise HTTPException(422, "value required as query parameter or JSON number")
+    try:
+        recorded = monitor.record_metric(metric_name, value)
+    except ValueError as e:
+        raise HTTPException(422, str(e))
+    # New series beyond the store's max_series are dropped, not stored
+    return {"status": "ok" if recorded else "dropped"}
 
 @app.get("/summary")
 def summary():
-    return {"summary": monitor.summary()}
+    return {"summary": monitor.summary(), "percentiles": monitor.percentiles()}
@@ -0,0 +1,180 @@
+# path: uin/dashboard/timeseries.py
+import asyncio
+import math
+import threading
+import time
+from array import array
+
+# (bucket width in seconds, number of buckets): 1 h of 1 s points,
+# 1 day of 1 min points, 30 days of 1 h points
+DEFAULT_LEVELS = ((1, 3600), (60, 1440), (3600, 720))
+RESOLUTIONS = {"1s": 1, "1m": 60, "1h": 3600}
+
+# Buckets are allocated in pages of PAGE slots on first write. A bucket is
+# 6 doubles (48 bytes), so a series costs about 9 KB after its first point
+# and at most 5760 * 48 B = 276 KB once every level is full (DEFAULT_LEVELS).
+PAGE = 64
+_START, _COUNT, _SUM, _MIN, _MAX, _LAST = (f * PAGE for f in range(6))
+
+_NAN = math.nan
+_EMPTY_PAGE = array("d", [_NAN] * PAGE + [0.0] * (5 * PAGE))
+
+
+class _Level:
+    # Ring of aggregated buckets. A slot is addressed by bucket index modulo
+    # capacity and is valid only if its stored start matches, so stale slots
+    # never need explicit eviction.
+    def __init__(self, step, capacity):
+        self.step = step
+        self.capacity = capacity
+        self.pages = {}
+
+    def _slot(self, bucket_index, create):
+        i = bucket_index % self.capacity
+        page = self.pages.get(i // PAGE)
+        if page is None and create:
+            page = self.pages[i // PAGE] = _EMPTY_PAGE[:]
+        return page, i % PAGE
+
+    def add(self, ts, value):
+        b = int(ts // self.step)
+        page, j = self._slot(b, True)
+        if page[_START + j] != b * self.step:
+            page[_START + j] = b * self.step
+            page[_COUNT + j] = 1
+            page[_SUM + j] = page[_MIN + j] = page[_MAX + j] = page[_LAST + j] = value
+            return
+        page[_COUNT + j] += 1
+        page[_SUM + j] += value
+        if value < page[_MIN + j]:
+            page[_MIN + j] = value
+        if value > page[_MAX + j]:
+            page[_MAX + j] = value
+        page[_LAST + j] = value
+
+    def query(self, start, end):
+        first = int(max(start, end - self.step * (self.capacity - 1)) // self.step)
+        points = []
+        for b in range(first, int(end // self.step) + 1):
+            page, j = self._slot(b, False)
+            if page is not None and page[_START + j] == b * self.step:
+                points.append({
+                    "t": page[_START + j],
+                    "avg": page[_SUM + j] / page[_COUNT + j],
+                    "min": page[_MIN + j],
+                    "max": page[_MAX + j],
+                    "last": page[_LAST + j],
+                    "count": int(page[_COUNT + j]),
+                })
+        return points
+
+
+def _offer(queue, item):
+    # Slow subscribers lose points instead of growing memory without bound
+    try:
+        queue.put_nowait(item)
+    except asyncio.QueueFull:
+        pass
+
+
+class TimeSeriesStore:
+    # Per-metric ring buffers with rollups at every level. Memory is bounded
+    # by max_series * sum(capacities) buckets (see PAGE for the per-series
+    # cost); new series beyond max_series are dropped. Subscribers get every
+    # new point pushed onto an asyncio queue.
+    def __init__(self, levels=DEFAULT_LEVELS, max_series=256, clock=time.time):
+        self.levels = tuple(sorted(levels))
+        self.max_series = max_series
+        self.clock = clock
+        self.series = {}
+        self.latest = {}
+        self.dropped = 0
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def record(self, name, value, ts=None):
+        ts = self.clock() if ts is None else ts
+        value = float(value)
+        if not math.isfinite(value) or not math.isfinite(ts):
+            raise ValueError(f"Metric values must be finite, got {value} at {ts}")
+        with self._lock:
+            levels = self.series.get(name)
+            if levels is None:
+                if len(self.series) >= self.max_series:
+                    self.dropped += 1
+                    return False
+                levels = self.series[name] = [_Level(step, capacity) for step, capacity in self.levels]
+            for level in levels:
+                level.add(ts, value)
+            self.latest[name] = (ts, value)
+            subscribers = list(self._subscribers)
+        point = {"name": name, "t": ts, "value": value}
+        for loop, queue, names in subscribers:
+            if names is None or name in names:
+                # record() may run in a worker thread; queues belong to their loop
+                loop.call_soon_threadsafe(_offer, queue, point)
+        return True
+
+    def names(self):
+        with self._lock:
+            return sorted(self.series)
+
+    def resolution_for(self, start, end, max_points=1000):
+        # Finest level that still covers `start` and stays within max_points
+        now = self.clock()
+        for step, capacity in self.levels:
+            if now - start <= step * capacity and (end - start) / step <= max_points:
+                return step
+        return self.levels[-1][0]
+
+    def query(self, name, start=None, end=None, step=None, max_points=1000):
+        # Points in [start, end] from the level `step` (seconds), or from the
+        # finest suitable level when step is None. Unknown metric -> None,
+        # non-finite bounds -> ValueError.
+        end = self.clock() if end is None else end
+        start = end - 3600 if start is None else start
+        if not math.isfinite(start) or not math.isfinite(end):
+            raise ValueError(f"Range bounds must be finite, got {start} to {end}")
+        step = step or self.resolution_for(start, end, max_points)
+        with self._lock:
+            levels = self.series.get(name)
+            if levels is None:
+                return None
+            level = next((lv for lv in levels if lv.step == step), None)
+            if level is None:
+                raise ValueError(f"Unknown resolution: {step}s")
+            return {"name": name, "step": step, "points": level.query(start, end)}
+
+    def subscribe(self, names=None, maxsize=1000):
+        # Must be called from the event loop that will consume the queue
+        queue = asyncio.Queue(maxsize=maxsize)
+        token = (asyncio.get_running_loop(), queue, frozenset(names) if names else None)
+        with self._lock:
+            self._subscribers.add(token)
+        return token
+
+    def unsubscribe(self, token):
+        with self._lock:
+            self._subscribers.discard(token)
+
+    async def stream(self, names=None, heartbeat=15.0):
+        # Yields the latest value of every requested metric, then every new
+        # point as it is recorded; None every `heartbeat` seconds of silence.
+        token = self.subscribe(names)
+        try:
+            with self._lock:
+                snapshot = [
+                    {"name": n, "t": t, "value": v}
+                    for n, (t, v) in sorted(self.latest.items())
+                    if not names or n in names
+                ]
+            for point in snapshot:
+                yield point
+            queue = token[1]
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            self.unsubscribe(token)
@@ -1,20 +1,25 @@
 # path: uin/dashboard/ui.py
 from uin.core.schema import UINDocument
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+from uin.core.spatial import SpatialIndex, shape_bbox, bbox_intersects
+from uin.core.raster import render
 
-def render_document(doc: UINDocument, figsize=(6,6)):
+def render_document(doc: UINDocument, figsize=(6,6), viewport=(0, 0, 10, 10), index: SpatialIndex | None = None, dpi=100):
+    # Only shapes whose bbox touches the viewport are rasterized; pass a
+    # prebuilt index to avoid the linear bbox scan when rendering the same
+    # doc often. The image is drawn with one imshow instead of one patch per
+    # shape; matplotlib is only needed for this interactive view.
+    import matplotlib.pyplot as plt
+
+    if index is not None:
+        visible = set(index.query(viewport))
+        shapes = [s for s in doc.shapes if s.id in visible]
+    else:
+        shapes = [s for s in doc.shapes if bbox_intersects(shape_bbox(s), viewport)]
+    visible_doc = UINDocument.model_construct(meta=doc.meta, shapes=shapes)
+    image = render(visible_doc, int(figsize[0] * dpi), viewport=viewport, y_up=True)
     fig, ax = plt.subplots(figsize=figsize)
-    for shape in doc.shapes:
-        color = shape.color
-        c = (color.r/255, color.g/255, color.b/255, color.a)
-        if shape.type == "rect":
-            rect = patches.Rectangle((shape.x, shape.y), shape.width, shape.height, color=c)
-            ax.add_patch(rect)
-        elif shape.type == "circle":
-            circ = patches.Circle((shape.x, shape.y), shape.radius, color=c)
-            ax.add_patch(circ)
-    ax.set_xlim(0,10)
-    ax.set_ylim(0,10)
+    ax.imshow(image, extent=(viewport[0], viewport[2], viewport[1], viewport[3]))
+    ax.set_xlim(viewport[0], viewport[2])
+    ax.set_ylim(viewport[1], viewport[3])
     ax.set_aspect('equal')
     plt.show()
@@ -0,0 +1,110 @@
+# path: uin/pipeline/commands.py
+import functools
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, TextIO
+from uin.pipeline.context import PipelineContext
+from uin.pipeline.steps import (
+    step_import,
+    step_normalize,
+    step_validate,
+    step_export,
+)
+from uin.utils.parallel import bounded_map
+
+COMMANDS = ("import", "normalize", "validate", "export")
+
+
+def run_command(
+    command: str,
+    raw: str,
+    out: TextIO | None = None,
+    ctx: PipelineContext | None = None,
+) -> str | None:
+    # With out given, normalize/export stream the document into it and
+    # return None; import/validate always return the raw input. Pass a ctx
+    # to read the per-step measurements from ctx.metrics afterwards.
+    ctx = ctx if ctx is not None else PipelineContext()
+
+    if command == "import":
+        step_import(ctx, raw)
+        return raw
+
+    elif command == "normalize":
+        ctx = step_import(ctx, raw)
+        ctx = step_normalize(ctx)
+        return step_export(ctx, out)
+
+    elif command == "validate":
+        ctx = step_import(ctx, raw)
+        step_validate(ctx)
+        return raw
+
+    elif command == "export":
+        ctx = step_import(ctx, raw)
+        return step_export(ctx, out)
+
+    raise ValueError(f"Unknown command: {command}")
+
+
+def format_profile(ctx: PipelineContext) -> str:
+    steps = ctx.metrics.get("steps", {})
+    memory = any("peak_bytes" in r for r in steps.values())
+    header = f"{'step':<12} {'wall ms':>9} {'cpu ms':>9} {'in bytes':>11} {'out bytes':>11} {'shapes':>8}"
+    lines = [header + (f" {'peak KiB':>10}" if memory else "")]
+    total_wall = sum(r["wall_s"] for r in steps.values())
+    for step, r in steps.items():
+        line = (
+            f"{step:<12} {r['wall_s'] * 1000:>9.2f} {r['cpu_s'] * 1000:>9.2f}"
+            f" {r['bytes_in'] if r['bytes_in'] is not None else '-':>11}"
+            f" {r['bytes_out'] if r['bytes_out'] is not None else '-':>11}"
+            f" {r['shapes'] if r['shapes'] is not None else '-':>8}"
+        )
+        if memory:
+            line += f" {r.get('peak_bytes', 0) / 1024:>10.1f}"
+        lines.append(line)
+    lines.append(f"{'total':<12} {total_wall * 1000:>9.2f}")
+    return "\n".join(lines)
+
+
+def run_line(command: str, lineno: int, line: str) -> str:
+    try:
+        return run_command(command, line).strip()
+    except Exception as e:
+        return json.dumps({"line": lineno, "error": str(e), "type": type(e).__name__})
+
+
+def _run_chunk(command: str, chunk: list[tuple[int, str]]) -> list[str]:
+    return [run_line(command, lineno, line) for lineno, line in chunk]
+
+
+def _chunks(lines: Iterable[str], size: int) -> Iterator[list[tuple[int, str]]]:
+    chunk = []
+    for lineno, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        chunk.append((lineno, line))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_ndjson(
+    command: str,
+    lines: Iterable[str],
+    workers: int = 1,
+    chunk_size: int = 64,
+) -> Iterator[str]:
+    # Results keep input order; a failing line yields an error object
+    # instead of aborting the stream. At most 2 * workers chunks are in flight.
+    if workers <= 1:
+        for chunk in _chunks(lines, 1):
+            yield from _run_chunk(command, chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        run = functools.partial(_run_chunk, command)
+        for results in bounded_map(pool, run, _chunks(lines, chunk_size), 2 * workers):
+            yield from results
@@ -1,8 +1,88 @@
 # path: uin/pipeline/context.py
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator
 from uin.core.schema import UINDocument
+from uin.core.session import DocumentSession
+from uin.pipeline.hooks import StepHook
+
+
+def text_size(data: str | bytes) -> int:
+    # UTF-8 size without encoding ASCII text (the common case)
+    if isinstance(data, bytes) or data.isascii():
+        return len(data)
+    return len(data.encode("utf-8"))
 
 
 class PipelineContext:
-    def __init__(self, doc: UINDocument | None = None):
-        self.doc = doc
+    def __init__(
+        self,
+        doc: UINDocument | None = None,
+        hooks: list[StepHook] | None = None,
+        trace_memory: bool = False,
+    ):
+        self._doc = doc
         self.metrics: dict = {}
+        self.session: DocumentSession | None = None
+        self.hooks: list[StepHook] = list(hooks or [])
+        self.trace_memory = trace_memory
+
+    @property
+    def doc(self) -> UINDocument | None:
+        # After a patch the document is rebuilt from the session on demand
+        if self._doc is None and self.session is not None:
+            self._doc = self.session.to_document()
+        return self._doc
+
+    @doc.setter
+    def doc(self, doc: UINDocument | None) -> None:
+        # None only invalidates the cached document (see step_patch); a
+        # different document replaces the session's state, so the session
+        # is dropped and later steps work on the new document
+        if doc is not None and doc is not self._doc:
+            self.session = None
+        self._doc = doc
+
+    @contextmanager
+    def measure(self, step: str, bytes_in: int | None = None) -> Iterator[dict]:
+        # Records wall/CPU time, sizes and the shape count of ctx.doc after
+        # the step into metrics["steps"][step] (summed over repeated runs)
+        # and passes the single run to every hook. The step may set
+        # record["bytes_out"]. With trace_memory, tracemalloc's peak is
+        # sampled as well (tracing slows the step down considerably).
+        record = {"bytes_in": bytes_in, "bytes_out": None}
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield record
+        finally:
+            record["wall_s"] = time.perf_counter() - wall
+            record["cpu_s"] = time.thread_time() - cpu
+            if self.trace_memory:
+                record["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+                if tracing:
+                    tracemalloc.stop()
+            if self._doc is not None:
+                record["shapes"] = len(self._doc.shapes)
+            else:
+                record["shapes"] = len(self.session) if self.session is not None else None
+        self._record(step, record)
+
+    def _record(self, step: str, record: dict) -> None:
+        total = self.metrics.setdefault("steps", {}).get(step)
+        if total is None:
+            self.metrics["steps"][step] = dict(record, calls=1)
+        else:
+            total["calls"] += 1
+            for key, value in record.items():
+                if key == "shapes" or key == "peak_bytes":
+                    total[key] = value if total.get(key) is None or value is None else max(total[key], value)
+                elif value is not None:
+                    total[key] = value + (total.get(key) or 0)
+        for hook in self.hooks:
+            hook.on_step(step, record)
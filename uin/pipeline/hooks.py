@@ -0,0 +1,36 @@
+# path: uin/pipeline/hooks.py
+from abc import ABC, abstractmethod
+
+
+class StepHook(ABC):
+    # Receives every step measurement recorded by PipelineContext.measure:
+    # {"wall_s", "cpu_s", "bytes_in", "bytes_out", "shapes"[, "peak_bytes"]};
+    # sizes and counts are None when a step has no such value.
+    @abstractmethod
+    def on_step(self, step: str, record: dict) -> None:
+        pass
+
+
+class RegistryHook(StepHook):
+    def __init__(self, registry=None):
+        # The metrics package is only imported when a hook is created
+        from metrics.registry import REGISTRY
+
+        registry = registry or REGISTRY
+        self.seconds = registry.histogram("uin_pipeline_step_seconds", "Wall time per pipeline step", ("step",))
+        self.cpu = registry.counter("uin_pipeline_step_cpu_seconds_total", "CPU time per pipeline step", ("step",))
+        self.bytes = registry.counter("uin_pipeline_bytes_total", "Bytes read and written by pipeline steps", ("step", "direction"))
+        self.shapes = registry.counter("uin_pipeline_shapes_total", "Shapes processed by pipeline steps", ("step",))
+        self.peak = registry.gauge("uin_pipeline_step_peak_bytes", "Peak traced memory of the last step run", ("step",))
+
+    def on_step(self, step: str, record: dict) -> None:
+        self.seconds.observe(record["wall_s"], step=step)
+        self.cpu.inc(record["cpu_s"], step=step)
+        if record["bytes_in"] is not None:
+            self.bytes.inc(record["bytes_in"], step=step, direction="in")
+        if record["bytes_out"] is not None:
+            self.bytes.inc(record["bytes_out"], step=step, direction="out")
+        if record["shapes"] is not None:
+            self.shapes.inc(record["shapes"], step=step)
+        if "peak_bytes" in record:
+            self.peak.set(record["peak_bytes"], step=step)
@@ -1,28 +1,82 @@
 # path: uin/pipeline/steps.py
 import json
-from uin.pipeline.context import PipelineContext
+from typing import IO, TextIO
+from uin.pipeline.context import PipelineContext, text_size
 from uin.core.schema import UINDocument
 from uin.core.normalize import normalize
 from uin.core.validate import validate
-from uin.core.serialize import serialize
+from uin.core.serialize import serialize, serialize_to
+from uin.core.deserialize import load_document
+from uin.core.session import DocumentSession
 from uin.core.errors import ValidationError
 
 
+class _CountingReader:
+    # Counts the UTF-8 bytes read through it; tell() on a text stream is an
+    # opaque cookie, not a byte offset
+    def __init__(self, stream: IO):
+        self.stream = stream
+        self.size = 0
+
+    def read(self, size: int = -1):
+        chunk = self.stream.read(size)
+        self.size += text_size(chunk)
+        return chunk
+
+
 def step_import(ctx: PipelineContext, raw: str) -> PipelineContext:
-    data = json.loads(raw)
-    ctx.doc = UINDocument.model_validate(data)
+    with ctx.measure("import", bytes_in=text_size(raw)):
+        data = json.loads(raw)
+        ctx.doc = UINDocument.model_validate(data)
+    return ctx
+
+
+def step_import_stream(ctx: PipelineContext, stream: IO) -> PipelineContext:
+    reader = _CountingReader(stream)
+    with ctx.measure("import") as record:
+        ctx.doc = load_document(reader)
+        record["bytes_in"] = reader.size
     return ctx
 
 
 def step_normalize(ctx: PipelineContext) -> PipelineContext:
-    ctx.doc = normalize(ctx.doc)
+    with ctx.measure("normalize"):
+        ctx.doc = normalize(ctx.doc)
     return ctx
 
 
 def step_validate(ctx: PipelineContext) -> PipelineContext:
-    validate(ctx.doc)
+    with ctx.measure("validate"):
+        validate(ctx.doc)
+    return ctx
+
+
+def step_open_session(ctx: PipelineContext) -> PipelineContext:
+    with ctx.measure("open_session"):
+        ctx.session = DocumentSession(ctx.doc)
+    return ctx
+
+
+def step_patch(ctx: PipelineContext, ops: list[dict]) -> PipelineContext:
+    # Only the patched shapes are re-validated and re-serialized; ctx.doc is
+    # rebuilt lazily the next time it is accessed
+    with ctx.measure("patch"):
+        ctx.session.apply(ops)
+        ctx.doc = None
     return ctx
 
 
-def step_export(ctx: PipelineContext) -> str:
-    return serialize(ctx.doc)
+def step_export(ctx: PipelineContext, out: TextIO | None = None) -> str | None:
+    with ctx.measure("export") as record:
+        if ctx.session is not None:
+            if out is not None:
+                record["bytes_out"] = ctx.session.serialize_to(out)
+                return None
+            result = ctx.session.serialize()
+        elif out is not None:
+            record["bytes_out"] = serialize_to(ctx.doc, out)
+            return None
+        else:
+            result = serialize(ctx.doc)
+        record["bytes_out"] = text_size(result)
+    return result
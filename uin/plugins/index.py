@@ -0,0 +1,190 @@
+# path: uin/plugins/index.py
+import ast
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+from collections.abc import MutableMapping
+from importlib.metadata import entry_points
+from pathlib import Path
+from uin.plugins.interfaces import Importer, Exporter, Analyzer
+
+INDEX_VERSION = 2
+KINDS = ("importer", "exporter", "analyzer")
+BASES = {"Importer": "importer", "Exporter": "exporter", "Analyzer": "analyzer"}
+# Installed distributions can publish plugins under these entry point groups
+ENTRY_POINT_GROUPS = {"uin.importers": "importer", "uin.exporters": "exporter", "uin.analyzers": "analyzer"}
+
+
+def _base_name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _abstract_names(node, inherited):
+    # Abstract methods left on a class: those of its bases minus everything
+    # the body defines, plus methods decorated with @abstractmethod
+    defined, declared = set(), set()
+    for item in node.body:
+        if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            defined.add(item.name)
+            if any(_base_name(d) == "abstractmethod" for d in item.decorator_list):
+                declared.add(item.name)
+        elif isinstance(item, (ast.Assign, ast.AnnAssign)):
+            targets = item.targets if isinstance(item, ast.Assign) else [item.target]
+            defined.update(t.id for t in targets if isinstance(t, ast.Name))
+    return (inherited - defined) | declared
+
+
+def scan_source(source):
+    # Plugin classes in one module, found without importing it: subclasses of
+    # Importer/Exporter/Analyzer and of plugin classes defined earlier in the
+    # same module. Classes with abstract methods left are skipped, the same
+    # rule discover(lazy=False) applies via inspect.isabstract.
+    known = {cls.__name__: ({BASES[cls.__name__]}, set(cls.__abstractmethods__)) for cls in (Importer, Exporter, Analyzer)}
+    found = []
+    for node in ast.parse(source).body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        bases = [known[b] for b in map(_base_name, node.bases) if b in known]
+        if not bases:
+            continue
+        kinds = set().union(*(k for k, _ in bases))
+        abstract = _abstract_names(node, set().union(*(names for _, names in bases)))
+        known[node.name] = (kinds, abstract)
+        if abstract:
+            continue
+        found.extend({"name": node.name, "kind": kind} for kind in sorted(kinds))
+    return found
+
+
+def _default_cache_path(package_dir):
+    root = Path(os.environ.get("UIN_PLUGIN_CACHE") or Path.home() / ".cache" / "uin")
+    key = hashlib.sha1(str(package_dir).encode()).hexdigest()[:16]
+    return root / f"plugins-{key}.json"
+
+
+class PluginIndex:
+    # Manifest of {module: {"mtime_ns", "size", "plugins"}} for one plugin
+    # package. Only files whose mtime or size changed are parsed again; the
+    # manifest is cached as JSON and rewritten when something changed.
+    def __init__(self, package_name, cache_path=None):
+        self.package_name = package_name
+        spec = importlib.util.find_spec(package_name)
+        if spec is None or not spec.submodule_search_locations:
+            raise ModuleNotFoundError(f"Plugin package not found: {package_name}")
+        self.package_dirs = [Path(p) for p in spec.submodule_search_locations]
+        self.cache_path = Path(cache_path) if cache_path else _default_cache_path(self.package_dirs[0])
+        self.modules = {}
+        self.rescanned = []
+
+    def _load_cache(self):
+        try:
+            data = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != INDEX_VERSION or data.get("package") != self.package_name:
+            return {}
+        return data.get("modules", {})
+
+    def _save_cache(self):
+        payload = {"version": INDEX_VERSION, "package": self.package_name, "modules": self.modules}
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(payload, sort_keys=True))
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            # A read-only home only costs a rescan next time
+            pass
+
+    def refresh(self):
+        cached = self._load_cache()
+        modules = {}
+        self.rescanned = []
+        for package_dir in self.package_dirs:
+            for path in sorted(package_dir.glob("*.py")):
+                if path.name == "__init__.py":
+                    continue
+                module = f"{self.package_name}.{path.stem}"
+                st = path.stat()
+                entry = cached.get(module)
+                if entry is None or entry["mtime_ns"] != st.st_mtime_ns or entry["size"] != st.st_size:
+                    entry = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "plugins": scan_source(path.read_bytes())}
+                    self.rescanned.append(module)
+                modules[module] = entry
+        self.modules = modules
+        if self.rescanned or modules.keys() != cached.keys():
+            self._save_cache()
+        return self
+
+    def plugins(self):
+        for module, entry in self.modules.items():
+            for plugin in entry["plugins"]:
+                yield dict(plugin, module=module)
+
+
+class LazyPlugins(MutableMapping):
+    # name -> plugin class. Entries from the index hold only "module:attr"
+    # and are imported on first access; `name in mapping`, iteration and
+    # len() never import anything.
+    def __init__(self, base):
+        self.base = base
+        self._refs = {}
+        self._loaded = {}
+
+    def add_reference(self, name, target):
+        if name not in self._loaded:
+            self._refs[name] = target
+
+    def _load(self, name):
+        module_name, _, attr = self._refs[name].partition(":")
+        cls = getattr(importlib.import_module(module_name), attr)
+        if not (isinstance(cls, type) and issubclass(cls, self.base)):
+            raise TypeError(f"{self._refs[name]} is not a {self.base.__name__}")
+        return cls
+
+    def __getitem__(self, name):
+        cls = self._loaded.get(name)
+        if cls is None:
+            if name not in self._refs:
+                raise KeyError(name)
+            cls = self._loaded[name] = self._load(name)
+        return cls
+
+    def __setitem__(self, name, cls):
+        self._loaded[name] = cls
+        self._refs.pop(name, None)
+
+    def __delitem__(self, name):
+        if name not in self._loaded and name not in self._refs:
+            raise KeyError(name)
+        self._loaded.pop(name, None)
+        self._refs.pop(name, None)
+
+    def __iter__(self):
+        yield from self._loaded
+        yield from (name for name in self._refs if name not in self._loaded)
+
+    def __len__(self):
+        return len(self._loaded.keys() | self._refs.keys())
+
+    def __contains__(self, name):
+        return name in self._loaded or name in self._refs
+
+    def is_loaded(self, name):
+        return name in self._loaded
+
+    def __repr__(self):
+        return f"LazyPlugins({sorted(self)!r})"
+
+
+def iter_entry_points():
+    # (name, kind, "module:attr") for plugins published by installed packages
+    for group, kind in ENTRY_POINT_GROUPS.items():
+        for ep in entry_points(group=group):
+            yield ep.name, kind, ep.value
@@ -1,5 +1,6 @@
 # path: uin/plugins/interfaces.py
 from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, Sequence
 from uin.core.schema import UINDocument
 
 
@@ -8,14 +9,27 @@ class Importer(ABC):
     def import_data(self, source: bytes) -> UINDocument:
         pass
 
+    def import_stream(self, sources: Iterable[bytes]) -> Iterator[UINDocument]:
+        # Default adapter; override to share setup across payloads
+        for source in sources:
+            yield self.import_data(source)
+
 
 class Exporter(ABC):
     @abstractmethod
     def export(self, doc: UINDocument) -> bytes:
         pass
 
+    def export_stream(self, docs: Iterable[UINDocument]) -> Iterator[bytes]:
+        for doc in docs:
+            yield self.export(doc)
+
 
 class Analyzer(ABC):
     @abstractmethod
     def analyze(self, doc: UINDocument) -> dict:
         pass
+
+    def analyze_batch(self, docs: Sequence[UINDocument]) -> list[dict]:
+        # One result per document, in input order
+        return [self.analyze(doc) for doc in docs]
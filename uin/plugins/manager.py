@@ -1,29 +1,70 @@
 # path: uin/plugins/manager.py
 import importlib
+import inspect
 import pkgutil
-from pathlib import Path
-from typing import Type
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Type
+from uin.core.schema import UINDocument
 from uin.plugins.interfaces import Importer, Exporter, Analyzer
+from uin.plugins.index import LazyPlugins, PluginIndex, iter_entry_points
+from uin.utils.parallel import bounded_map, chunked
+
+
+_worker_analyzers = None
+
+
+def _init_worker(specs):
+    global _worker_analyzers
+    _worker_analyzers = [(name, cls(**kwargs)) for name, cls, kwargs in specs]
+
+
+def _analyze_chunk(docs, analyzers=None):
+    # Every analyzer sees the whole chunk through analyze_batch; results are
+    # merged per document as {analyzer name: result}
+    analyzers = analyzers if analyzers is not None else _worker_analyzers
+    merged = [{} for _ in docs]
+    for name, analyzer in analyzers:
+        results = analyzer.analyze_batch(docs)
+        if len(results) != len(docs):
+            raise ValueError(f"{name}.analyze_batch returned {len(results)} results for {len(docs)} documents")
+        for out, result in zip(merged, results):
+            out[name] = result
+    return merged
 
 
 class PluginManager:
     def __init__(self):
-        self.importers: dict[str, Type[Importer]] = {}
-        self.exporters: dict[str, Type[Exporter]] = {}
-        self.analyzers: dict[str, Type[Analyzer]] = {}
-
-    def discover(self, package_name="uin.plugins.sample_plugins"):
-        package = importlib.import_module(package_name)
-        for _, modname, ispkg in pkgutil.iter_modules(package.__path__):
-            if ispkg:
-                continue
-            module = importlib.import_module(f"{package_name}.{modname}")
-            self._register_from_module(module)
+        self.importers: LazyPlugins = LazyPlugins(Importer)
+        self.exporters: LazyPlugins = LazyPlugins(Exporter)
+        self.analyzers: LazyPlugins = LazyPlugins(Analyzer)
+
+    def _registry(self, kind) -> LazyPlugins:
+        return {"importer": self.importers, "exporter": self.exporters, "analyzer": self.analyzers}[kind]
+
+    def discover(self, package_name="uin.plugins.sample_plugins", lazy=True, entry_points=True):
+        # Lazy discovery reads the plugin index (AST scan, cached and
+        # invalidated per file by mtime/size) and imports nothing; plugins
+        # are imported by get_*(). lazy=False imports every module as before,
+        # for plugins the static scan cannot see (e.g. generated classes).
+        if not lazy:
+            package = importlib.import_module(package_name)
+            for _, modname, ispkg in pkgutil.iter_modules(package.__path__):
+                if ispkg:
+                    continue
+                module = importlib.import_module(f"{package_name}.{modname}")
+                self._register_from_module(module)
+            return
+        for plugin in PluginIndex(package_name).refresh().plugins():
+            self._registry(plugin["kind"]).add_reference(plugin["name"], f"{plugin['module']}:{plugin['name']}")
+        if entry_points:
+            for name, kind, target in iter_entry_points():
+                self._registry(kind).add_reference(name, target)
 
     def _register_from_module(self, module):
         for attr in dir(module):
             cls = getattr(module, attr)
-            if isinstance(cls, type):
+            # Abstract intermediate classes are skipped, as in the index scan
+            if isinstance(cls, type) and not inspect.isabstract(cls):
                 if issubclass(cls, Importer) and cls is not Importer:
                     self.importers[cls.__name__] = cls
                 if issubclass(cls, Exporter) and cls is not Exporter:
@@ -39,3 +80,29 @@ class PluginManager:
 
     def get_analyzer(self, name) -> Type[Analyzer]:
         return self.analyzers[name]
+
+    def run_analyzers(
+        self,
+        names: Iterable[str],
+        docs: Iterable[UINDocument],
+        workers: int = 1,
+        chunk_size: int = 16,
+        options: dict[str, dict] | None = None,
+    ) -> Iterator[dict]:
+        # Yields {analyzer name: result} per document, in input order.
+        # Documents are sent to the pool in chunks and each worker runs all
+        # analyzers on its chunk, so a document is pickled once, not once per
+        # analyzer. Analyzers are instantiated once per worker with
+        # options[name] as keyword arguments. At most 2 * workers chunks are
+        # in flight, so docs may be an unbounded stream.
+        options = options or {}
+        specs = [(name, self.get_analyzer(name), options.get(name, {})) for name in names]
+        if workers <= 1:
+            analyzers = [(name, cls(**kwargs)) for name, cls, kwargs in specs]
+            for chunk in chunked(docs, chunk_size):
+                yield from _analyze_chunk(chunk, analyzers)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(specs,)) as pool:
+            for results in bounded_map(pool, _analyze_chunk, chunked(docs, chunk_size), 2 * workers):
+                yield from results
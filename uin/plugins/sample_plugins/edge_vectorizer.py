@@ -0,0 +1,23 @@
+# path: uin/plugins/sample_plugins/edge_vectorizer.py
+from uin.plugins.interfaces import Importer
+from uin.core.schema import UINDocument
+
+
+class EdgeVectorizerImporter(Importer):
+    def __init__(self, low_threshold=100, high_threshold=200, tolerance=1.5, min_length=8.0):
+        self.low_threshold = low_threshold
+        self.high_threshold = high_threshold
+        self.tolerance = tolerance
+        self.min_length = min_length
+
+    def import_data(self, source: bytes) -> UINDocument:
+        # OpenCV is only imported on use so discover() stays lightweight
+        from core.utils.edge_format import MAGIC, decode_edge_map
+        from core.utils.edge_extraction import ExtractionResult
+        from core.utils.vectorize import vectorize_edges
+
+        if source[:len(MAGIC)] == MAGIC:
+            edges = decode_edge_map(source)
+        else:
+            edges = ExtractionResult.from_bytes(source, self.low_threshold, self.high_threshold).edges
+        return vectorize_edges(edges, self.tolerance, self.min_length)
@@ -0,0 +1,29 @@
+# path: uin/plugins/sample_plugins/overlap_analyzer.py
+from uin.plugins.interfaces import Analyzer
+from uin.core.schema import UINDocument
+from uin.core.spatial import SpatialIndex, shapes_overlap
+
+
+class OverlapAnalyzer(Analyzer):
+    def __init__(self, cell_size: float | None = None):
+        self.cell_size = cell_size
+
+    def analyze(self, doc: UINDocument) -> dict:
+        # Candidate pairs come from the grid index; rect/circle pairs are then
+        # checked exactly. A shape counts as occluded when a shape drawn after
+        # it (later in doc.shapes) overlaps it.
+        index = SpatialIndex.from_document(doc, self.cell_size)
+        by_id = {s.id: (n, s) for n, s in enumerate(doc.shapes)}
+        overlaps = []
+        occluded = set()
+        for a, b in index.overlaps():
+            (na, sa), (nb, sb) = by_id[a], by_id[b]
+            if not shapes_overlap(sa, sb):
+                continue
+            overlaps.append([a, b])
+            occluded.add(a if na < nb else b)
+        return {
+            "overlap_count": len(overlaps),
+            "overlaps": overlaps,
+            "occluded": [s.id for s in doc.shapes if s.id in occluded],
+        }
@@ -0,0 +1,18 @@
+# path: uin/plugins/sample_plugins/png_exporter.py
+from uin.plugins.interfaces import Exporter
+from uin.core.schema import UINDocument
+
+
+class PNGExporter(Exporter):
+    def __init__(self, width=256, height=None, viewport=None, y_up=False, background=(0, 0, 0, 0)):
+        self.width = width
+        self.height = height
+        self.viewport = viewport
+        self.y_up = y_up
+        self.background = background
+
+    def export(self, doc: UINDocument) -> bytes:
+        # NumPy is only imported on use so discover() stays lightweight
+        from uin.core.raster import render, encode_png
+
+        return encode_png(render(doc, self.width, self.height, self.viewport, self.y_up, self.background))
@@ -1,9 +1,13 @@
 # path: uin/plugins/sample_plugins/simple_exporter.py
+from typing import BinaryIO
 from uin.plugins.interfaces import Exporter
-from uin.core.serialize import serialize
+from uin.core.serialize import serialize, serialize_to
 from uin.core.schema import UINDocument
 
 
 class SimpleJSONExporter(Exporter):
     def export(self, doc: UINDocument) -> bytes:
         return serialize(doc).encode("utf-8")
+
+    def export_to(self, doc: UINDocument, fp: BinaryIO) -> int:
+        return serialize_to(doc, fp, binary=True)
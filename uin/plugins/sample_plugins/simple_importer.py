@@ -1,6 +1,8 @@
 # path: uin/plugins/sample_plugins/simple_importer.py
+from typing import BinaryIO
 from uin.plugins.interfaces import Importer
 from uin.core.schema import UINDocument
+from uin.core.deserialize import load_document
 import json
 
 
@@ -8,3 +10,6 @@ class SimpleJSONImporter(Importer):
     def import_data(self, source: bytes) -> UINDocument:
         data = json.loads(source.decode("utf-8"))
         return UINDocument.model_validate(data)
+
+    def import_from(self, fp: BinaryIO) -> UINDocument:
+        return load_document(fp)
@@ -1,5 +1,6 @@
 # path: uin/utils/io.py
 import sys
+from typing import Iterator
 
 
 def read_stdin() -> str:
@@ -8,3 +9,12 @@ def read_stdin() -> str:
 
 def write_stdout(data: str) -> None:
     sys.stdout.write(data)
+
+
+def iter_stdin_lines() -> Iterator[str]:
+    return iter(sys.stdin)
+
+
+def write_line(data: str) -> None:
+    sys.stdout.write(data + "\n")
+    sys.stdout.flush()
@@ -0,0 +1,52 @@
+# path: uin/utils/parallel.py
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def bounded_map(
+    pool: Executor,
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    max_in_flight: int,
+    ordered: bool = True,
+) -> Iterator[R]:
+    # Like pool.map, but consumes `items` lazily with at most max_in_flight
+    # calls submitted at a time, so memory stays flat for unbounded inputs.
+    # Results come in input order, or in completion order with ordered=False.
+    max_in_flight = max(1, max_in_flight)
+    if ordered:
+        in_flight: deque = deque()
+        for item in items:
+            if len(in_flight) >= max_in_flight:
+                yield in_flight.popleft().result()
+            in_flight.append(pool.submit(fn, item))
+        while in_flight:
+            yield in_flight.popleft().result()
+        return
+
+    pending = set()
+    for item in items:
+        if len(pending) >= max_in_flight:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+        pending.add(pool.submit(fn, item))
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()